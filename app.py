@@ -1,42 +1,42 @@
+import os
+import tempfile
 import streamlit as st
-import pandas as pd
-from services.harvest_api import HarvestAPI
+from services.local_search import search_profiles_local_first
 from services.profile_service import get_or_refresh_profile
-from services.bulk_service import fetch_profiles_from_urls
+from services.bulk_service import iter_csv_urls
+from services.export_service import export_profiles, EXPORT_FORMATS
+from services.job_queue import create_bulk_job, get_job_status, get_job_results
 from config.config import get_env
-from services.summarizer import summarize_profile
-from utils.helpers import safe_parse_jsonish
+from services.summarizer import stream_profile_summary
+from services.summary_worker import get_summary_pool
+from utils.helpers import extract_profile_link
 
 st.set_page_config(page_title="LinkedIn Profile Scraper", layout="wide")
 st.title("🔍 LinkedIn Profile Scraper")
 
 # --- Helper Functions ---
-def render_skills(skills_data):
-    skills = safe_parse_jsonish(skills_data)
+# Profiles come from the services already in the strict schema of
+# services.profile_schema (legacy rows are normalized on read), so these
+# render plain lists of dicts without re-parsing.
+def render_skills(skills):
     if not skills:
         st.write("No skills data available.")
         return
     for skill in skills:
-        skill_name = skill.get("name") if isinstance(skill, dict) else skill
-        endorsements = skill.get("endorsements", 0) if isinstance(skill, dict) else 0
-        passed = " ✅" if isinstance(skill, dict) and skill.get("passed_assessment") else ""
-        st.write(f"- {skill_name} ({endorsements} endorsements){passed}")
+        passed = " ✅" if skill["passed_assessment"] else ""
+        st.write(f"- {skill['name']} ({skill['endorsements']} endorsements){passed}")
 
-def render_experiences(experiences_data):
-    experiences = safe_parse_jsonish(experiences_data)
+def render_experiences(experiences):
     if not experiences:
         st.write("No experiences data available.")
         return
     for exp in experiences:
-        if not isinstance(exp, dict):
-            st.write(exp)
-            continue
-        role = exp.get("title", "N/A")
-        company = exp.get("company", "N/A")
-        duration = exp.get("duration", "N/A")
-        location = exp.get("location", "N/A")
-        start = exp.get("start_date", "N/A")
-        end = exp.get("end_date") or "Present"
+        role = exp["title"] or "N/A"
+        company = exp["company"] or "N/A"
+        duration = exp["duration"] or "N/A"
+        location = exp["location"] or "N/A"
+        start = exp["start_date"] or "N/A"
+        end = exp["end_date"] or "Present"
         st.markdown(f"""
         **{role}** @ {company}  
         📅 {start} → {end}  ({duration})  
@@ -44,25 +44,47 @@ def render_experiences(experiences_data):
         """)
         st.markdown("---")
 
-def render_certificates(certificates_data):
-    certificates = safe_parse_jsonish(certificates_data)
+def render_certificates(certificates):
     if not certificates:
         st.write("No certificates data available.")
         return
     for cert in certificates:
-        if not isinstance(cert, dict):
-            st.write(cert)
-            continue
-        title = cert.get("title", "N/A")
-        issuer = cert.get("issuer", "N/A")
-        date_issued = cert.get("date_issued", "N/A")
-        cert_link = cert.get("cert_link")
+        title = cert["title"] or "N/A"
+        issuer = cert["issuer"] or "N/A"
+        date_issued = cert["date_issued"] or "N/A"
+        cert_link = cert["cert_link"]
         if cert_link:
             st.markdown(f"- **[{title}]({cert_link})** — *{issuer}* ({date_issued})")
         else:
             st.markdown(f"- **{title}** — *{issuer}* ({date_issued})")
 
-def display_profile(data):
+SUMMARY_POLL_SECONDS = 5
+RESULTS_PAGE_SIZE = 20
+
+@st.fragment(run_every=SUMMARY_POLL_SECONDS)
+def render_pending_summary(data):
+    # Re-runs on its own every few seconds until the background job finishes
+    status, value = get_summary_pool().status(data)
+    if status == "done":
+        st.write(value)
+    elif status == "failed":
+        st.warning(f"⚠️ Summarization failed: {value}")
+    else:
+        if status is None:
+            get_summary_pool().enqueue(data)
+        st.info("⏳ Summary is being generated in the background...")
+
+def render_summary(data, background=False):
+    if not background:
+        st.write_stream(stream_profile_summary(data))
+        return
+    status, value = get_summary_pool().status(data)
+    if status == "done":
+        st.write(value)
+    else:
+        render_pending_summary(data)
+
+def display_profile(data, background_summary=False):
     if not data:
         st.error("Could not fetch profile data.")
         return
@@ -92,8 +114,7 @@ def display_profile(data):
             st.write(f"**{k.replace('_', ' ').title()}:** {v}")
 
     st.subheader("📝 AI Summary of Profile")
-    summary = summarize_profile(data)
-    st.write(summary)
+    render_summary(data, background=background_summary)
 
 # --- Main App Views ---
 def search_by_name():
@@ -102,40 +123,43 @@ def search_by_name():
     past_company = st.text_input("Previous Company (optional)")
     school = st.text_input("School (optional)")
     location = st.text_input("Location (optional)")
-    page = st.number_input("Page Number", min_value=1, value=1)
-    max_show = st.number_input("Max Profiles to Show", min_value=1, max_value=10, value=5)
+    headline = st.text_input("Headline contains (optional, stored profiles only)")
+    skill = st.text_input("Skill (optional, stored profiles only)")
+    page = st.number_input("Start Page Number", min_value=1, value=1)
+    max_show = st.number_input("Max Profiles to Show", min_value=1, max_value=50, value=5)
+    max_pages = st.number_input("Max Pages to Scan", min_value=1, max_value=20, value=5)
     freshness_days = st.selectbox("Freshness Days", options=[30, 60], index=0)
+    local_first = st.checkbox("Search stored profiles first", value=True)
 
     if st.button("Search Profiles"):
         if not name:
             st.error("Name is required to search profiles.")
             return
 
-        api = HarvestAPI()
         with st.spinner("Fetching profiles..."):
             try:
-                result = api.search_profiles(
+                # Stored profiles are searched locally; Harvest is only called if they are not enough
+                elements = search_profiles_local_first(
                     name=name,
                     current_company=current_company or None,
                     past_company=past_company or None,
                     school=school or None,
                     location=location or None,
-                    page=page,
+                    headline=headline or None,
+                    skill=skill or None,
+                    start_page=page,
+                    max_pages=max_pages,
+                    max_show=max_show,
+                    use_local=local_first,
                 )
-                elements = result.get("elements", [])
                 if not elements:
                     st.warning("No profiles found.")
                     return
 
                 links = []
                 for profile in elements:
-                    link = (
-                        profile.get("url")
-                        or profile.get("linkedinUrl")
-                        or (f"https://www.linkedin.com/in/{profile.get('publicIdentifier')}"
-                            if profile.get("publicIdentifier") else None)
-                    )
-                    if link:
+                    link = extract_profile_link(profile)
+                    if link and link not in links:
                         links.append(link)
                     if len(links) >= max_show:
                         break
@@ -144,6 +168,10 @@ def search_by_name():
                     st.warning("No valid LinkedIn URLs found.")
                     return
 
+                local_hits = sum(1 for e in elements if e.get("source") == "local")
+                if local_hits:
+                    st.caption(f"{local_hits} of the results came from stored profiles.")
+
                 selected_idx = st.radio("Select a profile to fetch details:", list(range(1, len(links) + 1)),
                                         format_func=lambda x: links[x - 1])
                 selected_link = links[selected_idx - 1]
@@ -164,30 +192,95 @@ def search_by_id():
             profile_data = get_or_refresh_profile(url, freshness_days)
             display_profile(profile_data)
 
+@st.fragment(run_every=SUMMARY_POLL_SECONDS)
+def render_job_progress(job_id):
+    # Polls the persisted job; the standalone worker (worker.py) does the fetching
+    status = get_job_status(job_id)
+    if not status:
+        st.error(f"Bulk job {job_id} not found.")
+        return
+
+    finished = status["done"] + status["failed"]
+    total = status["total"] or 1
+    st.progress(finished / total, text=f"Job {job_id}: {finished}/{status['total']} processed "
+                                       f"({status['failed']} failed)")
+    if status["status"] == "done":
+        st.rerun()  # Full rerun renders the results
+    elif status["running"] == 0 and status["done"] == 0:
+        st.info("Waiting for a worker to pick up the job (run `python worker.py`).")
+
+def render_job_results(job_id, total):
+    # Paginated so only one page of profiles is loaded and rendered at a time
+    pages = max(1, -(-total // RESULTS_PAGE_SIZE))
+    page = st.number_input(f"Results page (1-{pages})", min_value=1, max_value=pages, value=1)
+    offset = (page - 1) * RESULTS_PAGE_SIZE
+
+    for result in get_job_results(job_id, offset=offset, limit=RESULTS_PAGE_SIZE):
+        st.markdown(f"## Profile {result['position'] + 1}")
+        if result['status'] == "failed":
+            st.error(f"Error: {result['error']}")
+        elif result['profile']:
+            display_profile(result['profile'], background_summary=True)
+        else:
+            st.info(f"Pending: {result['url']}")
+
 def search_by_csv():
     uploaded_file = st.file_uploader("Upload CSV with 'url' column", type=["csv"])
     freshness_days = st.selectbox("Freshness Days for all profiles", options=[30, 60], index=0)
 
-    if uploaded_file:
-        df = pd.read_csv(uploaded_file)
-        if 'url' not in df.columns:
+    if uploaded_file and st.button("Fetch All Profiles"):
+        # The CSV is streamed in chunks straight into the job's item rows
+        try:
+            job_id = create_bulk_job(iter_csv_urls(uploaded_file), freshness_days)
+        except ValueError:
             st.error("CSV must have a 'url' column.")
             return
+        st.session_state["bulk_job_id"] = job_id
 
-        st.success(f"{len(df)} URLs loaded.")
+    job_id = st.session_state.get("bulk_job_id")
+    if job_id:
+        status = get_job_status(job_id)
+        st.markdown(f"### Bulk job {job_id}")
+        if status:
+            st.success(f"{status['total']} URLs loaded.")
+        if status and status["status"] == "done":
+            render_job_results(job_id, status["total"])
+        else:
+            render_job_progress(job_id)
+
+def export_view():
+    fmt = st.selectbox("Format", options=list(EXPORT_FORMATS), index=0)
+    company = st.text_input("Current Company contains (optional)")
+    only_fresh = st.checkbox("Only recently refreshed profiles")
+    freshness_days = st.selectbox("Freshness Days", options=[30, 60], index=0) if only_fresh else None
+    uploaded_file = st.file_uploader("Limit to URLs in CSV with 'url' column (optional)", type=["csv"])
+
+    if st.button("Export Profiles"):
+        # Written to a temp file so large exports never sit in memory; removed however the export ends
+        tmp = tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=False)
+        try:
+            with st.spinner("Exporting profiles..."):
+                try:
+                    with tmp:
+                        count = export_profiles(
+                            tmp,
+                            fmt=fmt,
+                            urls=iter_csv_urls(uploaded_file) if uploaded_file else None,
+                            freshness_days=freshness_days,
+                            company=company or None,
+                        )
+                except (ValueError, RuntimeError) as e:
+                    st.error(f"Error: {e}")
+                    return
 
-        if st.button("Fetch All Profiles"):
-            with st.spinner("Fetching all profiles..."):
-                results = fetch_profiles_from_urls(df['url'].tolist(), freshness_days)
-                for i, result in enumerate(results):
-                    st.markdown(f"## Profile {i+1}")
-                    if result['error']:
-                        st.error(f"Error: {result['error']}")
-                    else:
-                        display_profile(result['profile'])
+            st.success(f"{count} profiles exported.")
+            with open(tmp.name, "rb") as fh:
+                st.download_button("Download", data=fh, file_name=f"profiles.{fmt}")
+        finally:
+            os.unlink(tmp.name)
 
 # --- Main Navigation ---
-option = st.radio("Choose search method", ["Search by Name", "Search by Id", "Search by CSV"])
+option = st.radio("Choose search method", ["Search by Name", "Search by Id", "Search by CSV", "Export Profiles"])
 st.markdown("---")
 
 if option == "Search by Name":
@@ -196,3 +289,5 @@ elif option == "Search by Id":
     search_by_id()
 elif option == "Search by CSV":
     search_by_csv()
+elif option == "Export Profiles":
+    export_view()
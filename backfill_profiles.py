@@ -0,0 +1,43 @@
+import argparse
+import logging
+import os
+from database.db import init_db
+from services.profile_service import backfill_profile_schema
+
+# === Setup logging to file and console ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+console = logging.StreamHandler()
+console.setLevel(logging.INFO)
+logging.getLogger("").addHandler(console)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    One-off backfill that rewrites stored profiles into the strict schema.
+
+    Skills, experiences and certifications saved before normalization (raw
+    strings, NaN values, mixed shapes) become lists of typed dicts. Safe to
+    re-run: rows that already match the schema are skipped.
+    """
+    parser = argparse.ArgumentParser(description="Normalize stored profile fields.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Profiles per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Only count profiles that would change")
+    args = parser.parse_args()
+
+    init_db()
+    result = backfill_profile_schema(batch_size=args.batch_size, dry_run=args.dry_run)
+    action = "would be updated" if args.dry_run else "updated"
+    print(f"✅ {result['scanned']} profiles scanned, {result['updated']} {action}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import logging
+import os
+from database.db import init_db
+from services.profile_history import compact_profile_history
+
+# === Setup logging to file and console ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+console = logging.StreamHandler()
+console.setLevel(logging.INFO)
+logging.getLogger("").addHandler(console)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    Retention/compaction job for `profile_versions`.
+
+    Keeps recent versions, thins older ones to one per month and caps the
+    versions kept per profile. Meant to run periodically (e.g. nightly cron).
+    """
+    parser = argparse.ArgumentParser(description="Compact profile change history.")
+    parser.add_argument("--retention-days", type=int, default=None,
+                        help="Keep every version newer than this (default: PROFILE_HISTORY_RETENTION_DAYS)")
+    parser.add_argument("--max-versions", type=int, default=None,
+                        help="Max versions kept per profile, 0 = no cap (default: PROFILE_HISTORY_MAX_VERSIONS)")
+    args = parser.parse_args()
+
+    init_db()
+    stats = compact_profile_history(retention_days=args.retention_days, max_versions=args.max_versions)
+    print(f"✅ Compacted {stats['profiles']} profiles: {stats['deleted']} versions removed, "
+          f"{stats['merged']} merged.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 import os
 import logging
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
 import urllib.parse
 from config.config import get_env
 
@@ -14,23 +13,53 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-# === Load Database Credentials from Environment Variables ===
-DB_USER = get_env("DB_USER", required=True)
-DB_PASS_RAW = get_env("DB_PASS", required=True)  # Using get_env for consistency and logging
-DB_PASS = urllib.parse.quote_plus(DB_PASS_RAW)   # URL-encode the password in case it has special characters
-DB_HOST = get_env("DB_HOST", required=True)
-DB_PORT = get_env("DB_PORT", required=True)
-DB_NAME = get_env("DB_NAME", required=True)
+# The engine and session factory are built on first use, not at import time
+_engine = None
+_session_factory = None
+_lock = threading.Lock()
 
-# === Build the PostgreSQL Database URL ===
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# === Create SQLAlchemy Engine and Session Factory ===
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+def _database_url() -> str:
+    """
+    Build the PostgreSQL database URL from environment variables.
+    """
+    db_user = get_env("DB_USER", required=True)
+    db_pass_raw = get_env("DB_PASS", required=True)  # Using get_env for consistency and logging
+    db_pass = urllib.parse.quote_plus(db_pass_raw)   # URL-encode the password in case it has special characters
+    db_host = get_env("DB_HOST", required=True)
+    db_port = get_env("DB_PORT", required=True)
+    db_name = get_env("DB_NAME", required=True)
+
+    # Name the driver explicitly so it matches the psycopg2-binary requirement
+    return f"postgresql+psycopg2://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
+
+
+def get_engine():
+    """
+    Return the process-wide SQLAlchemy engine, creating it on first use.
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                from sqlalchemy import create_engine
+                from sqlalchemy.orm import sessionmaker
+
+                engine = create_engine(_database_url(), pool_pre_ping=True, future=True)
+                _session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+                _engine = engine
+
+                # Log successful engine creation
+                logging.info("SQLAlchemy engine created successfully.")
+    return _engine
 
-# Log successful engine creation
-logging.info("SQLAlchemy engine created successfully.")
+
+def SessionLocal():
+    """
+    Open a new Session bound to the process-wide engine.
+    """
+    get_engine()
+    return _session_factory()
 
 
 def init_db():
@@ -42,7 +71,7 @@ def init_db():
     """
     try:
         from database.models import Base  # Local import to avoid circular imports
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
         logging.info("Database initialized and tables created successfully.")
     except Exception as e:
         logging.error(f"Error initializing database: {e}")
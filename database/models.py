@@ -1,6 +1,6 @@
 import logging
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, func
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB
 
 # === Logging Setup ===
@@ -16,6 +16,13 @@ logging.basicConfig(
 # === Base class for SQLAlchemy models ===
 Base = declarative_base()
 
+# Profile content fields populated from StaffSpy data
+PROFILE_FIELDS = [
+    "name", "first_name", "last_name", "location", "headline",
+    "company", "past_company1", "past_company2", "school1", "school2",
+    "skills", "experiences", "certifications"
+]
+
 
 class Profile(Base):
     """
@@ -30,9 +37,12 @@ class Profile(Base):
     # Primary key
     profile_id = Column(Integer, primary_key=True, index=True)
 
-    # Required LinkedIn URL (must be unique)
+    # Required LinkedIn URL in canonical form (must be unique)
     linkedin_url = Column(Text, unique=True, nullable=False)
 
+    # Canonical LinkedIn profile ID, used for all cache lookups
+    linkedin_id = Column(Text, index=True)
+
     # Identity fields
     name = Column(String(255))
     first_name = Column(String(255))
@@ -52,6 +62,15 @@ class Profile(Base):
     experiences = Column(JSONB)           # e.g., list of experience objects
     certifications = Column(JSONB)        # e.g., list of certification objects
 
+    # SHA-256 of the normalized content fields; a refresh with the same hash only touches last_updated
+    content_hash = Column(String(64))
+
+    # Content fields that differed at the last content-changing refresh
+    changed_fields = Column(JSONB)
+
+    # Content version, incremented whenever a refresh rewrites the content (or its fingerprint)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Timestamp of last update (auto-updated on row change)
     last_updated = Column(
         TIMESTAMP,
@@ -59,3 +78,153 @@ class Profile(Base):
         onupdate=func.now(),
         nullable=False
     )
+
+
+class SearchCache(Base):
+    """
+    SQLAlchemy model for the 'search_cache' table.
+
+    Stores Harvest API search responses keyed by a hash of the normalized
+    search parameters, so repeated searches are served without re-billing.
+    """
+
+    __tablename__ = "search_cache"
+
+    # SHA-256 of the normalized search parameters
+    cache_key = Column(String(64), primary_key=True)
+
+    # Normalized parameters (kept for debugging / inspection)
+    params = Column(JSONB, nullable=False)
+
+    # Raw JSON response from the Harvest API
+    response = Column(JSONB, nullable=False)
+
+    # When the response was fetched
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+
+class ProfileSummary(Base):
+    """
+    SQLAlchemy model for the 'profile_summaries' table.
+
+    Caches AI-generated profile summaries keyed by a hash of the profile's
+    content fields, the model name and the prompt version, so a summary is
+    only regenerated when one of those changes.
+    """
+
+    __tablename__ = "profile_summaries"
+
+    # SHA-256 of content fields + model + prompt version
+    content_hash = Column(String(64), primary_key=True)
+
+    # Model and prompt version that produced the summary
+    model = Column(String(255), nullable=False)
+    prompt_version = Column(String(32), nullable=False)
+
+    # Generated summary text
+    summary = Column(Text, nullable=False)
+
+    # When the summary was generated
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+
+class SummaryJob(Base):
+    """
+    SQLAlchemy model for the 'summary_jobs' table.
+
+    Tracks background summary generation per profile content hash, so the
+    UI can show pending summaries and unfinished jobs survive restarts.
+    """
+
+    __tablename__ = "summary_jobs"
+
+    # Same key as profile_summaries.content_hash
+    content_hash = Column(String(64), primary_key=True)
+
+    # Profile the job summarizes (used to re-enqueue after a restart)
+    linkedin_id = Column(Text, index=True)
+
+    # pending | running | done | failed
+    status = Column(String(16), nullable=False, default="pending")
+    error = Column(Text)
+
+    # Last state change
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class BulkJob(Base):
+    """
+    SQLAlchemy model for the 'bulk_jobs' table.
+
+    A persisted bulk CSV refresh; its URLs live in `bulk_job_items` and are
+    processed by the standalone worker (`worker.py`).
+    """
+
+    __tablename__ = "bulk_jobs"
+
+    job_id = Column(Integer, primary_key=True, index=True)
+
+    # pending | running | done
+    status = Column(String(16), nullable=False, default="pending")
+    freshness_days = Column(Integer, nullable=False, default=30)
+    total = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class BulkJobItem(Base):
+    """
+    SQLAlchemy model for the 'bulk_job_items' table.
+
+    One URL of a bulk job with its processing state. Items are claimed with
+    a lease (`locked_at`), so work abandoned by a crashed worker is retried.
+    """
+
+    __tablename__ = "bulk_job_items"
+    __table_args__ = (UniqueConstraint("job_id", "position"),)
+
+    item_id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("bulk_jobs.job_id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Row position in the uploaded CSV (keeps results in input order)
+    position = Column(Integer, nullable=False)
+    url = Column(Text, nullable=False)
+
+    # pending | running | done | failed
+    status = Column(String(16), nullable=False, default="pending", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+
+    # Resulting profile, once done
+    profile_id = Column(Integer, ForeignKey("profiles.profile_id", ondelete="SET NULL"))
+
+    locked_at = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class ProfileVersion(Base):
+    """
+    SQLAlchemy model for the 'profile_versions' table.
+
+    History of a profile's past content, stored as reverse deltas: each row
+    holds only the fields in which that version differed from the next newer
+    version (the newest one being the live `profiles` row).
+    """
+
+    __tablename__ = "profile_versions"
+    __table_args__ = (UniqueConstraint("profile_id", "version"),)
+
+    version_id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("profiles.profile_id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # The profile's `version` number while this content was live
+    version = Column(Integer, nullable=False)
+    content_hash = Column(String(64))
+
+    # {field: value} for the fields that differ from the next newer version
+    delta = Column(JSONB, nullable=False)
+
+    # When this content was last confirmed by a refresh, and when it was replaced
+    captured_at = Column(TIMESTAMP)
+    superseded_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
@@ -1,6 +1,7 @@
 CREATE TABLE IF NOT EXISTS profiles (
     profile_id SERIAL PRIMARY KEY,
     linkedin_url TEXT UNIQUE NOT NULL,
+    linkedin_id TEXT,
     name TEXT,
     first_name TEXT,
     last_name TEXT,
@@ -14,5 +15,99 @@ CREATE TABLE IF NOT EXISTS profiles (
     skills JSONB,
     experiences JSONB,
     certifications JSONB,
+    content_hash VARCHAR(64),
+    changed_fields JSONB,
+    version INTEGER NOT NULL DEFAULT 1,
     last_updated TIMESTAMP NOT NULL DEFAULT NOW()
 );
+
+-- Canonical profile ID used for cache lookups (added to existing tables, then backfilled)
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS linkedin_id TEXT;
+UPDATE profiles
+SET linkedin_id = lower(regexp_replace(linkedin_url, '^.*/(in|pub)/([^/?#]+).*$', '\2'))
+WHERE linkedin_id IS NULL;
+CREATE INDEX IF NOT EXISTS ix_profiles_linkedin_id ON profiles (linkedin_id);
+
+-- Content fingerprint (unchanged refreshes only touch last_updated) and last field diff
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS changed_fields JSONB;
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+-- Local search (services/local_search.py): trigram indexes for fuzzy/substring
+-- matches, a full-text index on the name and GIN on skills
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_profiles_name_trgm ON profiles USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_profiles_headline_trgm ON profiles USING GIN (headline gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_profiles_company_trgm ON profiles USING GIN (company gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_profiles_past_company1_trgm ON profiles USING GIN (past_company1 gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_profiles_past_company2_trgm ON profiles USING GIN (past_company2 gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_profiles_school1_trgm ON profiles USING GIN (school1 gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_profiles_school2_trgm ON profiles USING GIN (school2 gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_profiles_location_trgm ON profiles USING GIN (location gin_trgm_ops);
+DROP INDEX IF EXISTS ix_profiles_search_tsv;
+CREATE INDEX IF NOT EXISTS ix_profiles_name_tsv ON profiles USING GIN (
+    to_tsvector('simple', coalesce(name, ''))
+);
+CREATE INDEX IF NOT EXISTS ix_profiles_skills ON profiles USING GIN (skills jsonb_path_ops);
+
+-- Past profile content as reverse deltas against the next newer version
+CREATE TABLE IF NOT EXISTS profile_versions (
+    version_id SERIAL PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles (profile_id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    content_hash VARCHAR(64),
+    delta JSONB NOT NULL,
+    captured_at TIMESTAMP,
+    superseded_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    UNIQUE (profile_id, version)
+);
+CREATE INDEX IF NOT EXISTS ix_profile_versions_profile_id ON profile_versions (profile_id);
+
+CREATE TABLE IF NOT EXISTS search_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    params JSONB NOT NULL,
+    response JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS profile_summaries (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    model VARCHAR(255) NOT NULL,
+    prompt_version VARCHAR(32) NOT NULL,
+    summary TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS summary_jobs (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    linkedin_id TEXT,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    error TEXT,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS ix_summary_jobs_linkedin_id ON summary_jobs (linkedin_id);
+
+CREATE TABLE IF NOT EXISTS bulk_jobs (
+    job_id SERIAL PRIMARY KEY,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    freshness_days INTEGER NOT NULL DEFAULT 30,
+    total INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS bulk_job_items (
+    item_id SERIAL PRIMARY KEY,
+    job_id INTEGER NOT NULL REFERENCES bulk_jobs (job_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    profile_id INTEGER REFERENCES profiles (profile_id) ON DELETE SET NULL,
+    locked_at TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    UNIQUE (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS ix_bulk_job_items_job_id ON bulk_job_items (job_id);
+CREATE INDEX IF NOT EXISTS ix_bulk_job_items_status ON bulk_job_items (status);
@@ -0,0 +1,56 @@
+import argparse
+import logging
+import os
+from services.bulk_service import iter_csv_urls
+from services.export_service import export_profiles, EXPORT_FORMATS
+
+# === Setup logging to file and console ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+console = logging.StreamHandler()
+console.setLevel(logging.INFO)
+logging.getLogger("").addHandler(console)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    Export stored profiles to CSV, JSONL or Parquet.
+
+    Profiles are streamed from the database, so exports of any size run in
+    constant memory.
+    """
+    parser = argparse.ArgumentParser(description="Export stored LinkedIn profiles.")
+    parser.add_argument("--out", required=True, help="Output file path")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                        help="Output format (default: inferred from --out extension, else csv)")
+    parser.add_argument("--urls-csv", help="Only export profiles listed in this CSV's 'url' column")
+    parser.add_argument("--freshness-days", type=int, help="Only profiles refreshed within this many days")
+    parser.add_argument("--company", help="Only profiles whose current company contains this text")
+    parser.add_argument("--nested", action="store_true", help="Keep JSONB fields nested (JSONL only)")
+    args = parser.parse_args()
+
+    fmt = args.format or os.path.splitext(args.out)[1].lstrip(".").lower()
+    if fmt not in EXPORT_FORMATS:
+        fmt = "csv"
+
+    count = export_profiles(
+        args.out,
+        fmt=fmt,
+        urls=iter_csv_urls(args.urls_csv) if args.urls_csv else None,
+        freshness_days=args.freshness_days,
+        company=args.company,
+        flatten=not args.nested,
+    )
+    print(f"✅ Exported {count} profiles to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@ import logging
 import os
 from config.config import get_env
 from database.db import init_db
-from services.harvest_api import HarvestAPI
+from services.local_search import search_profiles_local_first
 from services.profile_service import get_or_refresh_profile
+from utils.helpers import extract_profile_link
 
 # === Setup logging to file and console ===
 os.makedirs("logs", exist_ok=True)
@@ -61,8 +62,6 @@ def main():
         init_db()
         logger.info("Database initialized")
 
-        api = HarvestAPI()
-
         # Required name input
         name = input("Enter Name (required): ").strip()
         if not name:
@@ -75,10 +74,16 @@ def main():
         past_company = input("Previous Company (optional): ").strip() or None
         location = input("Location (optional): ").strip() or None
         school = input("School (optional): ").strip() or None
+        headline = input("Headline contains (optional, stored profiles only): ").strip() or None
+        skill = input("Skill (optional, stored profiles only): ").strip() or None
 
         # Pagination and result count
-        page = ask_int("Page number (default 1): ", default=1, min_val=1)
-        max_show = ask_int("How many profile links do you need? (max 10): ", default=5, min_val=1, max_val=10)
+        page = ask_int("Start page number (default 1): ", default=1, min_val=1)
+        max_show = ask_int("How many profile links do you need? (max 50): ", default=5, min_val=1, max_val=50)
+        max_pages = ask_int("Max pages to scan (default 5): ", default=5, min_val=1, max_val=20)
+        use_local = True
+        if not (headline or skill):
+            use_local = input("Search stored profiles first? (Y/n): ").strip().lower() not in ("n", "no")
 
         # Freshness setting with fallback
         default_fresh = int(get_env("FRESHNESS_DAYS", 30))
@@ -87,19 +92,24 @@ def main():
             default=default_fresh, min_val=1, max_val=365
         )
 
-        logger.info(f"Searching profiles with name='{name}', page={page}")
+        logger.info(f"Searching profiles with name='{name}', pages {page}..{page + max_pages - 1}")
 
-        # Query Harvest API
-        result = api.search_profiles(
+        # Search stored profiles first (page 1 only, unless declined); Harvest
+        # (pages fanned out concurrently) fills any shortfall
+        elements = search_profiles_local_first(
             name=name,
             current_company=current_company,
             past_company=past_company,
             school=school,
             location=location,
-            page=page,
+            headline=headline,
+            skill=skill,
+            start_page=page,
+            max_pages=max_pages,
+            max_show=max_show,
+            use_local=use_local,
         )
 
-        elements = result.get("elements", [])
         if not elements:
             print("\n❌ No profiles found for this query.")
             logger.info("No profiles found.")
@@ -109,13 +119,8 @@ def main():
         links = []
         print("\n=== Matching Profile Links ===")
         for profile in elements:
-            link = (
-                profile.get("url")
-                or profile.get("linkedinUrl")
-                or (f"https://www.linkedin.com/in/{profile.get('publicIdentifier')}"
-                    if profile.get("publicIdentifier") else None)
-            )
-            if link:
+            link = extract_profile_link(profile)
+            if link and link not in links:
                 links.append(link)
             if len(links) >= max_show:
                 break
@@ -0,0 +1,118 @@
+import argparse
+import ast
+import json
+import random
+import timeit
+import tracemalloc
+from datetime import date
+
+from utils.helpers import safe_parse_jsonish, _parse_jsonish_text
+
+
+def _staffspy_payloads(seed: int = 7):
+    """
+    Build skills/experiences/certifications values shaped like StaffSpy output,
+    as Python reprs (what StaffSpy usually hands back) and as JSON, plus
+    experiences whose dates are `datetime.date` objects, as StaffSpy renders them.
+
+    Returns:
+        dict: {name: (payload, expected parsed value)}
+    """
+    rng = random.Random(seed)
+    words = ["Senior", "Data", "Platform", "Engineer", "Manager", "Cloud", "Product", "Lead", "ML", "Backend"]
+
+    def text(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    skills = [
+        {"name": text(2), "endorsements": rng.randint(0, 99), "passed_assessment": rng.random() < 0.2}
+        for _ in range(50)
+    ]
+    experiences = [
+        {
+            "title": text(3), "company": text(2), "location": f"{text(1)}, {text(1)}",
+            "start_date": f"20{rng.randint(10, 23)}-0{rng.randint(1, 9)}-01",
+            "end_date": None if i == 0 else f"20{rng.randint(10, 24)}-0{rng.randint(1, 9)}-01",
+            "duration": f"{rng.randint(1, 9)} yrs", "emp_type": "Full-time",
+            "description": text(60),
+        }
+        for i in range(25)
+    ]
+    certifications = [
+        {"title": text(4), "issuer": text(1), "date_issued": "2022-05-01", "cert_id": None, "cert_link": None}
+        for _ in range(8)
+    ]
+
+    dated = [
+        {**e, "start_date": date.fromisoformat(e["start_date"]),
+         "end_date": e["end_date"] and date.fromisoformat(e["end_date"])}
+        for e in experiences
+    ]
+
+    values = {"skills": skills, "experiences": experiences, "certifications": certifications}
+    return {
+        **{f"{k} (repr)": (repr(v), v) for k, v in values.items()},
+        **{f"{k} (json)": (json.dumps(v), v) for k, v in values.items()},
+        # Dates come back as ISO strings, i.e. the plain `experiences` value
+        "experiences (dates)": (repr(dated), experiences),
+    }
+
+
+def _literal_eval_parse(s: str):
+    """
+    The previous implementation: `ast.literal_eval`, raw string on failure.
+    """
+    try:
+        return ast.literal_eval(s)
+    except Exception:
+        return s
+
+
+def _time_per_call(fn, repeat: int, number: int) -> float:
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number * 1e6
+
+
+def _peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    """
+    Compare `ast.literal_eval` with the tiered `safe_parse_jsonish` on
+    StaffSpy-shaped payloads: cold (memo cache cleared) and warm (memoized).
+
+    Note that literal_eval cannot parse the JSON payloads (null/true) or the
+    `datetime.date(...)` reprs at all and falls back to returning the raw
+    string, so its time there is the time to fail.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark JSON-ish profile field parsing.")
+    parser.add_argument("--number", type=int, default=200, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs (best is reported)")
+    args = parser.parse_args()
+
+    def cold(s):
+        _parse_jsonish_text.cache_clear()
+        return safe_parse_jsonish(s)
+
+    print(f"{'payload':<24}{'size':>8}{'literal_eval':>14}{'tiered cold':>13}{'tiered warm':>13}"
+          f"{'speedup':>9}{'peak KiB (old/new)':>21}")
+    for name, (payload, expected) in _staffspy_payloads().items():
+        assert cold(payload) == expected
+
+        old_us = _time_per_call(lambda: _literal_eval_parse(payload), args.repeat, args.number)
+        cold_us = _time_per_call(lambda: cold(payload), args.repeat, args.number)
+        safe_parse_jsonish(payload)
+        warm_us = _time_per_call(lambda: safe_parse_jsonish(payload), args.repeat, args.number)
+        old_kib = _peak_kib(lambda: _literal_eval_parse(payload))
+        new_kib = _peak_kib(lambda: cold(payload))
+
+        print(f"{name:<24}{len(payload):>8}{old_us:>12.0f}us{cold_us:>11.0f}us{warm_us:>11.1f}us"
+              f"{old_us / cold_us:>8.1f}x{old_kib:>11.0f} / {new_kib:<8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,195 @@
-from services.profile_service import get_or_refresh_profile
-
-def fetch_profiles_from_urls(url_list, freshness_days):
-    results = []
-    for url in url_list:
-        try:
-            profile = get_or_refresh_profile(url, freshness_days=freshness_days)
-            results.append({
-                "url": url,
-                "profile": profile,
-                "error": None
-            })
-        except Exception as e:
-            results.append({
-                "url": url,
-                "profile": None,
-                "error": str(e)
-            })
-    return results
+import os
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import get_env
+from services.profile_service import get_or_refresh_profile, get_or_refresh_profiles
+from utils.helpers import chunked
+from utils.rate_limit import HostRateLimiter
+
+# === Logging Setup ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the bulk worker pool (overridable per call)
+DEFAULT_MAX_WORKERS = int(get_env("BULK_MAX_WORKERS", 4))
+DEFAULT_RATE_LIMIT = float(get_env("BULK_RATE_LIMIT_PER_SEC", 1))
+DEFAULT_BATCH_SIZE = int(get_env("BULK_BATCH_SIZE", 50))
+DEFAULT_CSV_CHUNK_SIZE = int(get_env("CSV_CHUNK_SIZE", 5000))
+
+
+def _fetch_one(url, freshness_days, limiter=None):
+    """
+    Fetch a single profile, turning any exception into an `error` entry.
+
+    Args:
+        url (str): LinkedIn profile URL.
+        freshness_days (int): Max age in days for data to be considered fresh.
+        limiter (HostRateLimiter, optional): Shared per-host limiter for StaffSpy calls.
+
+    Returns:
+        dict: {"url", "profile", "error"} result entry.
+    """
+    try:
+        profile = get_or_refresh_profile(url, freshness_days=freshness_days, limiter=limiter)
+        return {
+            "url": url,
+            "profile": profile,
+            "error": None
+        }
+    except Exception as e:
+        logger.exception(f"Bulk fetch failed for {url}: {e}")
+        return {
+            "url": url,
+            "profile": None,
+            "error": str(e)
+        }
+
+
+def _fetch_batch(urls, freshness_days, limiter=None):
+    """
+    Fetch a batch of profiles through the two-phase bulk path.
+
+    Args:
+        urls (list[str]): LinkedIn profile URLs in this batch.
+        freshness_days (int): Max age in days for data to be considered fresh.
+        limiter (HostRateLimiter, optional): Shared per-host limiter for StaffSpy calls.
+
+    Returns:
+        list[dict]: One {"url", "profile", "error"} entry per URL, in input order.
+    """
+    try:
+        profiles = get_or_refresh_profiles(urls, freshness_days=freshness_days, limiter=limiter)
+        return [{"url": url, "profile": profiles.get(url), "error": None} for url in urls]
+    except Exception as e:
+        logger.exception(f"Bulk fetch failed for batch of {len(urls)} URLs: {e}")
+        return [{"url": url, "profile": None, "error": str(e)} for url in urls]
+
+
+def iter_csv_urls(csv_file, chunk_size: int = None):
+    """
+    Stream the `url` column of a CSV in chunks, without loading the whole file.
+
+    Args:
+        csv_file: Path or file-like object (e.g. a Streamlit upload).
+        chunk_size (int, optional): Rows read per chunk. Defaults to CSV_CHUNK_SIZE.
+
+    Yields:
+        str: Each non-empty URL, in file order.
+
+    Raises:
+        ValueError: If the CSV has no `url` column.
+    """
+    chunk_size = chunk_size or DEFAULT_CSV_CHUNK_SIZE
+    import pandas as pd  # deferred: only needed once a CSV is actually read
+
+    for chunk in pd.read_csv(csv_file, usecols=["url"], dtype={"url": str}, chunksize=chunk_size):
+        for url in chunk["url"].dropna():
+            url = url.strip()
+            if url:
+                yield url
+
+
+def fetch_profiles_from_urls(
+    urls,
+    freshness_days,
+    max_workers: int = None,
+    rate_limit: float = None,
+    progress_callback=None,
+    batch_size: int = None
+):
+    """
+    Fetch profiles for any iterable of URLs using a bounded worker pool.
+
+    This is a generator: the input is consumed lazily and results are
+    yielded in input order as soon as every earlier batch has completed, so
+    memory stays flat regardless of input size (at most two batches per
+    worker are held). Each result also carries its input `index`.
+    A failure for one URL is recorded in that entry's `error` field and does
+    not affect others.
+
+    With `batch_size` > 1, URLs are grouped into batches that each resolve
+    freshness with one DB query, scrape only stale profiles and write them
+    back with one upsert (see `get_or_refresh_profiles`).
+
+    Args:
+        urls (iterable[str]): LinkedIn profile URLs (list, generator, CSV stream...).
+        freshness_days (int): Max age in days for data to be considered fresh.
+        max_workers (int, optional): Number of concurrent workers. 1 runs serially.
+            Defaults to BULK_MAX_WORKERS.
+        rate_limit (float, optional): Max StaffSpy scrapes started per second per host;
+            profiles served from the cache or DB are not throttled.
+            0 disables rate limiting. Defaults to BULK_RATE_LIMIT_PER_SEC.
+        progress_callback (callable, optional): Called as `callback(done, total, result)`
+            after each URL completes; `total` is None when the input has no length.
+        batch_size (int, optional): URLs per two-phase batch; 1 fetches each URL
+            individually. Defaults to BULK_BATCH_SIZE.
+
+    Yields:
+        dict: {"index", "url", "profile", "error"} for each input URL, in input order.
+    """
+    max_workers = DEFAULT_MAX_WORKERS if max_workers is None else max_workers
+    rate_limit = DEFAULT_RATE_LIMIT if rate_limit is None else rate_limit
+    batch_size = DEFAULT_BATCH_SIZE if batch_size is None else max(1, batch_size)
+
+    total = len(urls) if hasattr(urls, "__len__") else None
+    limiter = HostRateLimiter(rate_limit)
+    done = 0
+
+    logger.info(
+        f"Bulk fetch of {total if total is not None else 'streamed'} URLs with {max_workers} workers, "
+        f"batch size {batch_size}, {rate_limit} req/s per host"
+    )
+
+    def _run(start, chunk):
+        if batch_size == 1:
+            entries = [_fetch_one(chunk[0], freshness_days, limiter)]
+        else:
+            entries = _fetch_batch(chunk, freshness_days, limiter)
+        for offset, entry in enumerate(entries):
+            entry["index"] = start + offset
+        return entries
+
+    def _report(entry):
+        nonlocal done
+        done += 1
+        if progress_callback:
+            try:
+                progress_callback(done, total, entry)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+    chunks = enumerate(chunked(urls, batch_size))
+
+    if max_workers <= 1:
+        for n, chunk in chunks:
+            for entry in _run(n * batch_size, chunk):
+                _report(entry)
+                yield entry
+        return
+
+    # Keep at most two batches per worker in flight so the input is read lazily;
+    # futures are drained in submission order, which doubles as the reorder buffer
+    max_pending = max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for n, chunk in chunks:
+            pending.append(executor.submit(_run, n * batch_size, chunk))
+            if len(pending) < max_pending:
+                continue
+            for entry in pending.popleft().result():
+                _report(entry)
+                yield entry
+
+        while pending:
+            for entry in pending.popleft().result():
+                _report(entry)
+                yield entry
@@ -0,0 +1,242 @@
+import os
+import io
+import csv
+import json
+import logging
+from datetime import timedelta
+from sqlalchemy import select, func
+
+from config.config import get_env
+from database.db import SessionLocal
+from database.models import Profile
+from utils.helpers import chunked, extract_linkedin_id, safe_parse_jsonish, ilike_contains
+
+# === Logging Setup ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+# Rows fetched per round-trip from the server-side cursor
+DEFAULT_EXPORT_BATCH_SIZE = int(get_env("EXPORT_BATCH_SIZE", 1000))
+
+# How many experiences get their own columns in flattened output
+FLAT_EXPERIENCES = 3
+
+SCALAR_COLUMNS = [
+    "profile_id", "linkedin_url", "linkedin_id", "name", "first_name", "last_name",
+    "location", "headline", "company", "past_company1", "past_company2",
+    "school1", "school2", "last_updated",
+]
+
+EXPERIENCE_KEYS = ["title", "company", "start_date", "end_date", "location"]
+
+# Fixed column set for flattened exports (CSV header / Parquet schema)
+EXPORT_COLUMNS = (
+    SCALAR_COLUMNS
+    + ["skills", "skill_count", "certifications", "experience_count"]
+    + [f"experience{i}_{key}" for i in range(1, FLAT_EXPERIENCES + 1) for key in EXPERIENCE_KEYS]
+)
+
+
+def _as_list(value):
+    value = safe_parse_jsonish(value)
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def flatten_profile(profile: dict) -> dict:
+    """
+    Flatten a profile's JSONB fields into scalar columns.
+
+    Skills and certifications become "; "-separated strings; the first
+    FLAT_EXPERIENCES experiences get their own columns.
+
+    Args:
+        profile (dict): Profile row as a dictionary.
+
+    Returns:
+        dict: One value per EXPORT_COLUMNS entry (strings, numbers or None).
+    """
+    row = {column: profile.get(column) for column in SCALAR_COLUMNS}
+    if row["last_updated"] is not None:
+        row["last_updated"] = str(row["last_updated"])
+
+    skills = _as_list(profile.get("skills"))
+    row["skills"] = "; ".join(
+        str(s.get("name") if isinstance(s, dict) else s) for s in skills
+    ) or None
+    row["skill_count"] = len(skills)
+
+    certifications = _as_list(profile.get("certifications"))
+    row["certifications"] = "; ".join(
+        (f"{c.get('title')} ({c.get('issuer')})" if c.get("issuer") else str(c.get("title")))
+        if isinstance(c, dict) else str(c)
+        for c in certifications
+    ) or None
+
+    experiences = _as_list(profile.get("experiences"))
+    row["experience_count"] = len(experiences)
+    for i in range(FLAT_EXPERIENCES):
+        exp = experiences[i] if i < len(experiences) else {}
+        if not isinstance(exp, dict):
+            exp = {"title": exp}
+        for key in EXPERIENCE_KEYS:
+            value = exp.get(key)
+            row[f"experience{i + 1}_{key}"] = str(value) if value is not None else None
+
+    return row
+
+
+def iter_profiles(urls=None, freshness_days: int = None, company: str = None, batch_size: int = None):
+    """
+    Stream profiles from the `profiles` table through a server-side cursor.
+
+    Args:
+        urls (iterable[str], optional): Only these profiles (matched by canonical ID;
+            each profile is yielded once, however often it is listed).
+        freshness_days (int, optional): Only profiles refreshed within this many days.
+        company (str, optional): Case-insensitive substring of the current company.
+        batch_size (int, optional): Rows per cursor fetch. Defaults to EXPORT_BATCH_SIZE.
+
+    Yields:
+        dict: One profile row at a time.
+    """
+    batch_size = batch_size or DEFAULT_EXPORT_BATCH_SIZE
+    table = Profile.__table__
+
+    def _select(ids=None):
+        # Core select of plain rows: nothing accumulates in the session identity map
+        stmt = select(table).order_by(table.c.profile_id)
+        if ids is not None:
+            stmt = stmt.where(table.c.linkedin_id.in_(ids))
+        if freshness_days is not None:
+            stmt = stmt.where(table.c.last_updated >= func.now() - timedelta(days=freshness_days))
+        if company:
+            stmt = stmt.where(ilike_contains(table.c.company, company))
+        # yield_per streams rows with a server-side cursor instead of buffering them all
+        return stmt.execution_options(yield_per=batch_size)
+
+    db = SessionLocal()
+    try:
+        if urls is None:
+            batches = [None]
+        else:
+            # Large URL lists are matched in chunks to keep IN (...) lists bounded;
+            # IDs already requested by an earlier chunk are dropped, so each
+            # profile is exported once
+            seen = set()
+
+            def _new_ids(chunk):
+                ids = [i for i in dict.fromkeys(extract_linkedin_id(u) for u in chunk) if i not in seen]
+                seen.update(ids)
+                return ids
+
+            batches = (ids for ids in map(_new_ids, chunked(urls, batch_size)) if ids)
+
+        for ids in batches:
+            for row in db.execute(_select(ids)):
+                yield dict(row._mapping)
+
+    finally:
+        db.close()
+
+
+def _write_csv(rows, out):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    try:
+        writer = csv.DictWriter(text, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        count = 0
+        for row in rows:
+            writer.writerow(flatten_profile(row))
+            count += 1
+        return count
+    finally:
+        text.detach()
+
+
+def _write_jsonl(rows, out, flatten: bool):
+    count = 0
+    for row in rows:
+        record = flatten_profile(row) if flatten else row
+        out.write((json.dumps(record, default=str, ensure_ascii=False) + "\n").encode("utf-8"))
+        count += 1
+    return count
+
+
+def _write_parquet(rows, out, batch_size: int):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow).") from e
+
+    int_columns = {"profile_id", "skill_count", "experience_count"}
+    schema = pa.schema([
+        (column, pa.int64() if column in int_columns else pa.string())
+        for column in EXPORT_COLUMNS
+    ])
+
+    count = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for batch in chunked((flatten_profile(row) for row in rows), batch_size):
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+
+def export_profiles(out, fmt: str = "csv", urls=None, freshness_days: int = None,
+                    company: str = None, flatten: bool = True, batch_size: int = None) -> int:
+    """
+    Stream profiles matching the filters into CSV, JSONL or Parquet.
+
+    Rows are read through a server-side cursor and written as they arrive,
+    so the result set is never materialized in memory.
+
+    Args:
+        out: Path or binary file-like object to write to.
+        fmt (str): One of "csv", "jsonl", "parquet".
+        urls (iterable[str], optional): Only these profiles.
+        freshness_days (int, optional): Only profiles refreshed within this many days.
+        company (str, optional): Case-insensitive substring of the current company.
+        flatten (bool): Flatten JSONB fields (always on for CSV and Parquet).
+        batch_size (int, optional): Rows per cursor fetch / Parquet row group.
+
+    Returns:
+        int: Number of profiles exported.
+
+    Raises:
+        ValueError: If `fmt` is not supported.
+        RuntimeError: If Parquet is requested but pyarrow is not installed.
+    """
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt} (expected one of {EXPORT_FORMATS})")
+
+    batch_size = batch_size or DEFAULT_EXPORT_BATCH_SIZE
+    rows = iter_profiles(urls=urls, freshness_days=freshness_days, company=company, batch_size=batch_size)
+
+    close = isinstance(out, (str, os.PathLike))
+    fh = open(out, "wb") if close else out
+    try:
+        if fmt == "csv":
+            count = _write_csv(rows, fh)
+        elif fmt == "jsonl":
+            count = _write_jsonl(rows, fh, flatten)
+        else:
+            count = _write_parquet(rows, fh, batch_size)
+    finally:
+        if close:
+            fh.close()
+
+    logger.info(f"Exported {count} profiles as {fmt}.")
+    return count
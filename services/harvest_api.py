@@ -1,7 +1,18 @@
 import os
+import time
+import atexit
+import random
+import asyncio
 import logging
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from config.config import get_env
+from services.search_cache import get_cached_search, store_search
+from utils.helpers import extract_profile_link
 
 # === Logging Setup ===
 os.makedirs("logs", exist_ok=True)
@@ -15,19 +26,179 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# HTTP statuses worth retrying (throttling and transient server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _retry_after_seconds(value):
+    """
+    Parse a `Retry-After` header given either as seconds or as an HTTP date.
+
+    Args:
+        value (str): Raw header value.
+
+    Returns:
+        float or None: Seconds to wait, or None if the header is missing/invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(tz=timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int, base: float, cap: float, retry_after: float = None) -> float:
+    """
+    Compute how long to sleep before retry number `attempt` (0-based).
+
+    Uses "full jitter" exponential backoff capped at `cap`, but never less
+    than `Retry-After` (which is not capped; callers give up instead when
+    it exceeds `cap`, see `_gives_up`).
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _gives_up(retry_after: float, cap: float) -> bool:
+    """
+    Whether a `Retry-After` is too long to wait out within a request.
+    """
+    return retry_after is not None and retry_after > cap
+
+
+def _build_search_params(name, current_company=None, past_company=None, school=None, location=None, page=1):
+    """
+    Build the Harvest API query string for a profile search.
+
+    Returns:
+        dict: Query parameters with only the filters that were provided.
+    """
+    params = {
+        "search": name,
+        "page": page
+    }
+
+    # Add optional filters to the query if provided
+    if current_company:
+        params["currentCompany"] = current_company
+    if past_company:
+        params["pastCompany"] = past_company
+    if school:
+        params["school"] = school
+    if location:
+        params["location"] = location
+
+    return params
+
+
+def _auth_headers(api_key: str) -> dict:
+    """
+    Headers sent with every Harvest API request.
+    """
+    return {
+        "x-api-key": api_key,  # Primary authentication header
+        "Authorization": f"Bearer {api_key}",  # Just in case API uses this style
+        "Accept": "application/json",
+        "Connection": "keep-alive",
+    }
+
+
 class HarvestAPI:
     """
     A client to interact with the Harvest API to search for LinkedIn-like profiles.
 
     Loads the API key from environment variables and supports optional filters
     like company, school, and location during the search.
+
+    Requests go through a long-lived pooled `requests.Session` (keep-alive),
+    and throttled (429) or failed (5xx) calls are retried with exponential
+    backoff and jitter, honouring `Retry-After` (a `Retry-After` longer than
+    the max backoff fails the call instead of blocking it).
     """
     
     BASE_URL = "https://api.harvest-api.com/linkedin/profile-search"
 
-    def __init__(self):
+    def __init__(
+        self,
+        base_url: str = None,
+        pool_size: int = None,
+        max_retries: int = None,
+        backoff_seconds: float = None,
+        max_backoff_seconds: float = None
+    ):
         # Load API key from environment variable
         self.api_key = get_env("HARVEST_API_KEY", required=True)
+        self.base_url = base_url or self.BASE_URL
+
+        # Retry / backoff settings
+        self.max_retries = int(get_env("HARVEST_MAX_RETRIES", 3) if max_retries is None else max_retries)
+        self.backoff_seconds = float(
+            get_env("HARVEST_BACKOFF_SECONDS", 0.5) if backoff_seconds is None else backoff_seconds
+        )
+        self.max_backoff_seconds = float(
+            get_env("HARVEST_MAX_BACKOFF_SECONDS", 30) if max_backoff_seconds is None else max_backoff_seconds
+        )
+
+        # Pooled keep-alive session reused across calls
+        pool_size = int(get_env("HARVEST_POOL_SIZE", 10) if pool_size is None else pool_size)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(_auth_headers(self.api_key))
+
+    def _backoff(self, attempt: int, retry_after: float = None) -> float:
+        return _backoff_delay(attempt, self.backoff_seconds, self.max_backoff_seconds, retry_after)
+
+    def _get(self, params: dict):
+        """
+        GET the search endpoint, retrying on connection errors, 429 and 5xx.
+
+        Args:
+            params (dict): Query string parameters.
+
+        Returns:
+            requests.Response: The final (successful) response.
+
+        Raises:
+            requests.RequestException: If all attempts fail.
+        """
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=30)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Harvest API request error ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            logger.info(f"Harvest API response status: {response.status_code}")
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+                if _gives_up(retry_after, self.max_backoff_seconds):
+                    logger.warning(f"Harvest API asked to retry after {retry_after:.0f}s; giving up")
+                    response.raise_for_status()
+                delay = self._backoff(attempt, retry_after)
+                logger.warning(f"Harvest API returned {response.status_code}; retrying in {delay:.2f}s")
+                response.close()
+                time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return response
 
     def search_profiles(
         self,
@@ -37,7 +208,8 @@ class HarvestAPI:
         school: str = None,
         location: str = None,
         page: int = 1,
-        limit: int = 10
+        limit: int = 10,
+        use_cache: bool = True
     ):
         """
         Calls the Harvest API to search for profiles based on provided filters.
@@ -50,52 +222,297 @@ class HarvestAPI:
             location (str, optional): Filter by location.
             page (int, optional): Pagination page number. Default is 1.
             limit (int, optional): How many results to display (not enforced by API).
+            use_cache (bool, optional): Serve/store the response via the search cache.
 
         Returns:
             dict: Parsed JSON response from the Harvest API.
 
         Raises:
-            requests.HTTPError: If the request fails (non-2xx status).
+            requests.HTTPError: If the request fails (non-2xx status) after retries.
         """
-        params = {
-            "search": name,
-            "page": page
-        }
-
-        # Add optional filters to the query if provided
-        if current_company:
-            params["currentCompany"] = current_company
-        if past_company:
-            params["pastCompany"] = past_company
-        if school:
-            params["school"] = school
-        if location:
-            params["location"] = location
-
-        headers = {
-            "x-api-key": self.api_key,  # Primary authentication header
-            "Authorization": f"Bearer {self.api_key}",  # Just in case API uses this style
-            "Accept": "application/json"
-        }
+        params = _build_search_params(name, current_company, past_company, school, location, page)
+
+        if use_cache:
+            cached = get_cached_search(params)
+            if cached is not None:
+                return cached
 
         logger.info(f"Sending request to Harvest API with parameters: {params}")
 
         try:
-            response = requests.get(
-                self.BASE_URL,
-                params=params,
-                headers=headers,
-                timeout=30
-            )
+            response = self._get(params)
+
+            if response.content:
+                result = response.json()
+            else:
+                logger.warning("Harvest API returned empty response body.")
+                result = {}
+
+            if use_cache:
+                store_search(params, result)
+            return result
+
+        except requests.RequestException as e:
+            logger.error(f"Harvest API request failed: {e}")
+            raise
+
+
+class AsyncHarvestAPI:
+    """
+    asyncio variant of `HarvestAPI` built on `httpx.AsyncClient`.
+
+    Besides single-page searches it can fan out pages concurrently (with a
+    concurrency cap), merge and de-duplicate the results by profile URL,
+    and stop as soon as enough unique profiles have been collected.
+
+    Use as an async context manager, or call `aclose()` when done; the sync
+    wrappers share one long-lived instance (`get_async_harvest_api`).
+    """
+
+    BASE_URL = HarvestAPI.BASE_URL
+
+    def __init__(
+        self,
+        base_url: str = None,
+        pool_size: int = None,
+        max_retries: int = None,
+        backoff_seconds: float = None,
+        max_backoff_seconds: float = None
+    ):
+        self.api_key = get_env("HARVEST_API_KEY", required=True)
+        self.base_url = base_url or self.BASE_URL
+
+        self.max_retries = int(get_env("HARVEST_MAX_RETRIES", 3) if max_retries is None else max_retries)
+        self.backoff_seconds = float(
+            get_env("HARVEST_BACKOFF_SECONDS", 0.5) if backoff_seconds is None else backoff_seconds
+        )
+        self.max_backoff_seconds = float(
+            get_env("HARVEST_MAX_BACKOFF_SECONDS", 30) if max_backoff_seconds is None else max_backoff_seconds
+        )
+
+        pool_size = int(get_env("HARVEST_POOL_SIZE", 10) if pool_size is None else pool_size)
+        self.client = httpx.AsyncClient(
+            headers=_auth_headers(self.api_key),
+            timeout=30,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close the underlying connection pool.
+        """
+        await self.client.aclose()
+
+    async def _get(self, params: dict):
+        """
+        GET the search endpoint, retrying on connection errors, 429 and 5xx.
+
+        Raises:
+            httpx.HTTPError: If all attempts fail.
+        """
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = await self.client.get(self.base_url, params=params)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                delay = _backoff_delay(attempt, self.backoff_seconds, self.max_backoff_seconds)
+                logger.warning(f"Harvest API request error ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
             logger.info(f"Harvest API response status: {response.status_code}")
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+                if _gives_up(retry_after, self.max_backoff_seconds):
+                    logger.warning(f"Harvest API asked to retry after {retry_after:.0f}s; giving up")
+                    response.raise_for_status()
+                delay = _backoff_delay(attempt, self.backoff_seconds, self.max_backoff_seconds, retry_after)
+                logger.warning(f"Harvest API returned {response.status_code}; retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
             response.raise_for_status()
+            return response
+
+    async def search_profiles(
+        self,
+        name: str,
+        current_company: str = None,
+        past_company: str = None,
+        school: str = None,
+        location: str = None,
+        page: int = 1,
+        use_cache: bool = True
+    ):
+        """
+        Async equivalent of `HarvestAPI.search_profiles` for a single page.
+
+        Returns:
+            dict: Parsed JSON response from the Harvest API.
+        """
+        params = _build_search_params(name, current_company, past_company, school, location, page)
+
+        # The search cache is synchronous (SQLAlchemy); keep it off the event loop
+        if use_cache:
+            cached = await asyncio.to_thread(get_cached_search, params)
+            if cached is not None:
+                return cached
+
+        logger.info(f"Sending async request to Harvest API with parameters: {params}")
 
+        try:
+            response = await self._get(params)
             if response.content:
-                return response.json()
+                result = response.json()
             else:
                 logger.warning("Harvest API returned empty response body.")
-                return {}
+                result = {}
 
-        except requests.RequestException as e:
+            if use_cache:
+                await asyncio.to_thread(store_search, params, result)
+            return result
+        except httpx.HTTPError as e:
             logger.error(f"Harvest API request failed: {e}")
             raise
+
+    async def search_many_pages(
+        self,
+        name: str,
+        current_company: str = None,
+        past_company: str = None,
+        school: str = None,
+        location: str = None,
+        start_page: int = 1,
+        max_pages: int = 5,
+        max_show: int = 50,
+        concurrency: int = None
+    ):
+        """
+        Search pages `start_page`..`start_page + max_pages - 1`, fanning out only as needed.
+
+        The first page is fetched on its own; its size gives an estimate of
+        how many more pages `max_show` needs, and only those are fetched
+        concurrently (at most `concurrency` at a time). Results are merged in
+        page order and de-duplicated by canonical profile URL. Fetching stops
+        once `max_show` unique profiles are collected or a page comes back empty.
+
+        Args:
+            name (str): Name of the person to search.
+            current_company, past_company, school, location (str, optional): Filters.
+            start_page (int): First page to fetch.
+            max_pages (int): Maximum number of pages to fetch.
+            max_show (int): Stop once this many unique profiles are collected.
+            concurrency (int, optional): Max pages in flight. Defaults to HARVEST_PAGE_CONCURRENCY.
+
+        Returns:
+            list[dict]: Unique result elements (at most `max_show`), in page order.
+        """
+        concurrency = concurrency or int(get_env("HARVEST_PAGE_CONCURRENCY", 3))
+
+        async def fetch_page(page):
+            result = await self.search_profiles(
+                name, current_company, past_company, school, location, page
+            )
+            return result.get("elements", []) or []
+
+        end_page = start_page + max_pages
+        next_page = start_page
+        page_size = None
+        elements, seen = [], set()
+        finished = False
+
+        while not finished and next_page < end_page:
+            if page_size is None:
+                batch = 1
+            else:
+                # Pages still needed at the observed page size (duplicates may need more later)
+                needed = -(-(max_show - len(elements)) // page_size)
+                batch = max(1, min(concurrency, needed, end_page - next_page))
+
+            pages = range(next_page, next_page + batch)
+            results = await asyncio.gather(*(fetch_page(page) for page in pages))
+            next_page += batch
+
+            for page_elements in results:
+                if not page_elements:
+                    finished = True  # Ran past the last page of results
+                    break
+                page_size = page_size or len(page_elements)
+                for element in page_elements:
+                    link = extract_profile_link(element)
+                    if link and link not in seen:
+                        seen.add(link)
+                        elements.append(element)
+                        if len(elements) >= max_show:
+                            finished = True
+                            break
+                if finished:
+                    break
+
+        logger.info(f"Collected {len(elements)} unique profiles from {next_page - start_page} pages")
+        return elements[:max_show]
+
+
+# Long-lived async client and the event loop (in a daemon thread) that owns it;
+# httpx connections are bound to one loop, so every call is run on this one
+_async_loop = None
+_async_client = None
+_async_lock = threading.Lock()
+
+
+def get_async_harvest_api():
+    """
+    Return the process-wide AsyncHarvestAPI and the event loop it runs on.
+
+    Both are created on first use and reused, so searches share one
+    keep-alive connection pool.
+
+    Returns:
+        tuple[asyncio.AbstractEventLoop, AsyncHarvestAPI]
+    """
+    global _async_loop, _async_client
+    if _async_client is None:
+        with _async_lock:
+            if _async_client is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="harvest-api", daemon=True).start()
+                _async_client = AsyncHarvestAPI()
+                _async_loop = loop
+                atexit.register(_close_async_harvest_api)
+    return _async_loop, _async_client
+
+
+def _close_async_harvest_api():
+    """
+    Close the shared async client's connection pool and stop its loop.
+    """
+    if _async_client is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_async_client.aclose(), _async_loop).result(timeout=5)
+    except Exception as e:
+        logger.warning(f"Failed to close the shared Harvest API client: {e}")
+    _async_loop.call_soon_threadsafe(_async_loop.stop)
+
+
+def search_profiles_multi_page(**kwargs):
+    """
+    Synchronous wrapper around `AsyncHarvestAPI.search_many_pages`.
+
+    Accepts the same keyword arguments; intended for the CLI and Streamlit,
+    which do not run their own event loop. Calls from any thread run on the
+    shared client's loop (see `get_async_harvest_api`).
+
+    Returns:
+        list[dict]: Unique result elements, in page order.
+    """
+    loop, api = get_async_harvest_api()
+    return asyncio.run_coroutine_threadsafe(api.search_many_pages(**kwargs), loop).result()
@@ -0,0 +1,425 @@
+import os
+import time
+import logging
+from datetime import timedelta
+from sqlalchemy import select, update, and_, or_, exists, func
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.config import get_env
+from database.db import SessionLocal
+from database.models import BulkJob, BulkJobItem, Profile
+from services.search_cache import purge_expired_searches
+from services.bulk_service import fetch_profiles_from_urls
+from services.profile_service import get_staffspy, get_write_stats, get_cache_stats
+from services.profile_schema import conform_profile_fields
+from services.summary_worker import get_summary_pool
+from utils.helpers import chunked
+
+# === Logging Setup ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+# Item/job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Worker defaults
+DEFAULT_CLAIM_SIZE = int(get_env("JOB_CLAIM_SIZE", 50))
+DEFAULT_LEASE_SECONDS = int(get_env("JOB_LEASE_SECONDS", 600))
+DEFAULT_POLL_SECONDS = float(get_env("JOB_POLL_SECONDS", 5))
+MAX_ATTEMPTS = int(get_env("JOB_MAX_ATTEMPTS", 3))
+DEFAULT_INSERT_CHUNK_SIZE = int(get_env("JOB_INSERT_CHUNK_SIZE", 1000))
+
+# How often an idle worker purges expired Harvest search cache entries
+SEARCH_CACHE_PURGE_SECONDS = float(get_env("HARVEST_CACHE_PURGE_SECONDS", 3600))
+
+
+def create_bulk_job(urls, freshness_days: int = 30, chunk_size: int = None) -> int:
+    """
+    Persist a bulk refresh job and one pending item per URL.
+
+    `urls` may be any iterable (e.g. a streamed CSV); items are inserted in
+    chunks so the full URL list is never held in memory.
+
+    Args:
+        urls (iterable[str]): LinkedIn profile URLs, in CSV order.
+        freshness_days (int): Max age in days for data to be considered fresh.
+        chunk_size (int, optional): Items inserted per statement. Defaults to JOB_INSERT_CHUNK_SIZE.
+
+    Returns:
+        int: The new job's ID.
+    """
+    chunk_size = chunk_size or DEFAULT_INSERT_CHUNK_SIZE
+    db = SessionLocal()
+    try:
+        job = BulkJob(status=PENDING, freshness_days=freshness_days, total=0)
+        db.add(job)
+        db.flush()
+
+        total = 0
+        for chunk in chunked(urls, chunk_size):
+            db.execute(
+                BulkJobItem.__table__.insert(),
+                [
+                    {"job_id": job.job_id, "position": total + i, "url": url, "status": PENDING, "attempts": 0}
+                    for i, url in enumerate(chunk)
+                ],
+            )
+            total += len(chunk)
+
+        job.total = total
+        job_id = job.job_id
+        db.commit()
+
+        logger.info(f"Created bulk job {job_id} with {total} URLs.")
+        return job_id
+
+    except SQLAlchemyError as e:
+        logger.exception(f"Failed to create bulk job: {e}")
+        db.rollback()
+        raise
+
+    finally:
+        db.close()
+
+
+def _claimable(lease_seconds: int = None):
+    """
+    Condition for items a worker may claim: pending, or with an expired
+    lease and attempts left.
+    """
+    lease_seconds = lease_seconds or DEFAULT_LEASE_SECONDS
+    return or_(
+        BulkJobItem.status == PENDING,
+        and_(
+            BulkJobItem.status == RUNNING,
+            BulkJobItem.locked_at < func.now() - timedelta(seconds=lease_seconds),
+            BulkJobItem.attempts < MAX_ATTEMPTS,
+        ),
+    )
+
+
+def has_claimable_items(lease_seconds: int = None) -> bool:
+    """
+    Check whether any bulk job item is waiting to be claimed.
+
+    Args:
+        lease_seconds (int, optional): How long a claim stays valid. Defaults to JOB_LEASE_SECONDS.
+
+    Returns:
+        bool: True if `claim_items` would find work (or the check failed).
+    """
+    db = SessionLocal()
+    try:
+        return db.scalar(select(exists().where(_claimable(lease_seconds))))
+    except SQLAlchemyError as e:
+        logger.exception(f"Failed to check the bulk job queue: {e}")
+        return True
+    finally:
+        db.close()
+
+
+def claim_items(db, batch_size: int = None, lease_seconds: int = None):
+    """
+    Atomically claim pending items (or items whose lease expired).
+
+    Uses `FOR UPDATE SKIP LOCKED`, so several workers can run side by side
+    without claiming the same item. Expired items are only reclaimed while
+    they have attempts left (see `fail_exhausted_items`).
+
+    Args:
+        db (Session): Active SQLAlchemy session (caller commits).
+        batch_size (int, optional): Max items to claim. Defaults to JOB_CLAIM_SIZE.
+        lease_seconds (int, optional): How long a claim stays valid. Defaults to JOB_LEASE_SECONDS.
+
+    Returns:
+        list: Claimed rows with `item_id`, `job_id`, `url` and `attempts`.
+    """
+    batch_size = batch_size or DEFAULT_CLAIM_SIZE
+
+    claimable = (
+        select(BulkJobItem.item_id)
+        .where(_claimable(lease_seconds))
+        .order_by(BulkJobItem.job_id, BulkJobItem.position)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+    stmt = (
+        update(BulkJobItem)
+        .where(BulkJobItem.item_id.in_(claimable))
+        .values(status=RUNNING, locked_at=func.now(), attempts=BulkJobItem.attempts + 1)
+        .returning(BulkJobItem.item_id, BulkJobItem.job_id, BulkJobItem.url, BulkJobItem.attempts)
+    )
+    return db.execute(stmt).all()
+
+
+def fail_exhausted_items(db, lease_seconds: int = None):
+    """
+    Mark items whose lease expired after their last attempt as failed.
+
+    Such an item was claimed MAX_ATTEMPTS times and its worker never
+    reported back (e.g. it crashed on it), so it is not claimed again.
+
+    Args:
+        db (Session): Active SQLAlchemy session (caller commits).
+        lease_seconds (int, optional): How long a claim stays valid. Defaults to JOB_LEASE_SECONDS.
+
+    Returns:
+        set[int]: IDs of the jobs that had items failed.
+    """
+    lease_seconds = lease_seconds or DEFAULT_LEASE_SECONDS
+    stmt = (
+        update(BulkJobItem)
+        .where(
+            BulkJobItem.status == RUNNING,
+            BulkJobItem.locked_at < func.now() - timedelta(seconds=lease_seconds),
+            BulkJobItem.attempts >= MAX_ATTEMPTS,
+        )
+        .values(status=FAILED, locked_at=None, error=f"Worker did not finish the item in {MAX_ATTEMPTS} attempts")
+        .returning(BulkJobItem.item_id, BulkJobItem.job_id)
+    )
+    failed = db.execute(stmt).all()
+    job_ids = {row.job_id for row in failed}
+    if failed:
+        logger.warning(f"Failed {len(failed)} bulk job items that ran out of attempts: {[r.item_id for r in failed]}")
+        _finish_jobs(db, job_ids)
+    return job_ids
+
+
+def process_batch(batch_size: int = None, lease_seconds: int = None) -> int:
+    """
+    Claim and process one batch of bulk job items.
+
+    Items are fetched through the bounded, rate-limited bulk pool (and its
+    two-phase bulk path), grouped by their job's freshness setting. Processing
+    is idempotent: re-running an item just re-reads (or refreshes) the same
+    profile row. Fetched profiles are queued for background summaries.
+
+    Returns:
+        int: Number of items processed (0 when the queue is empty).
+    """
+    db = SessionLocal()
+    try:
+        fail_exhausted_items(db, lease_seconds)
+        items = claim_items(db, batch_size, lease_seconds)
+        if not items:
+            db.commit()
+            return 0
+
+        job_ids = {item.job_id for item in items}
+        freshness = dict(
+            db.query(BulkJob.job_id, BulkJob.freshness_days).filter(BulkJob.job_id.in_(job_ids)).all()
+        )
+        db.execute(
+            update(BulkJob)
+            .where(BulkJob.job_id.in_(job_ids), BulkJob.status == PENDING)
+            .values(status=RUNNING)
+        )
+        db.commit()
+
+    except SQLAlchemyError as e:
+        logger.exception(f"Failed to claim bulk job items: {e}")
+        db.rollback()
+        return 0
+
+    finally:
+        db.close()
+
+    logger.info(f"Claimed {len(items)} items from jobs {sorted(job_ids)}")
+
+    # Group by freshness so each group is one two-phase bulk refresh
+    groups = {}
+    for item in items:
+        groups.setdefault(freshness.get(item.job_id, 30), []).append(item)
+
+    updates, profiles = [], []
+    for freshness_days, group in groups.items():
+        # Per-URL failures come back as entries with an `error`, never as exceptions
+        for entry in fetch_profiles_from_urls([item.url for item in group], freshness_days):
+            item = group[entry["index"]]
+            profile = entry["profile"]
+            if profile:
+                profiles.append(profile)
+                updates.append({
+                    "item_id": item.item_id, "status": DONE, "error": None,
+                    "profile_id": profile.get("profile_id"), "locked_at": None,
+                })
+                continue
+
+            retry = item.attempts < MAX_ATTEMPTS
+            updates.append({
+                "item_id": item.item_id, "status": PENDING if retry else FAILED,
+                "error": entry["error"] or "No profile data returned", "profile_id": None, "locked_at": None,
+            })
+
+    db = SessionLocal()
+    try:
+        # One executemany for all item results, one statement to close finished jobs
+        db.execute(update(BulkJobItem), updates)
+        _finish_jobs(db, job_ids)
+        db.commit()
+
+    except SQLAlchemyError as e:
+        logger.exception(f"Failed to record bulk job results: {e}")
+        db.rollback()
+
+    finally:
+        db.close()
+
+    # Summaries are generated in the background; already cached ones are skipped
+    try:
+        get_summary_pool().enqueue_many(profiles)
+    except Exception as e:
+        logger.exception(f"Failed to enqueue summaries for {len(profiles)} profiles: {e}")
+
+    return len(items)
+
+
+def _finish_jobs(db, job_ids):
+    """
+    Mark jobs done once none of their items are pending or running.
+    """
+    unfinished = exists().where(
+        BulkJobItem.job_id == BulkJob.job_id,
+        BulkJobItem.status.in_([PENDING, RUNNING]),
+    )
+    db.execute(
+        update(BulkJob)
+        .where(BulkJob.job_id.in_(job_ids), ~unfinished)
+        .values(status=DONE)
+    )
+
+
+def run_worker(batch_size: int = None, poll_seconds: float = None, once: bool = False):
+    """
+    Process bulk job items until stopped (or until the queue is empty if `once`).
+
+    While the queue is empty the worker also purges expired Harvest search
+    cache entries, at most every HARVEST_CACHE_PURGE_SECONDS.
+
+    Args:
+        batch_size (int, optional): Items claimed per batch. Defaults to JOB_CLAIM_SIZE.
+        poll_seconds (float, optional): Sleep between polls of an empty queue.
+            Defaults to JOB_POLL_SECONDS.
+        once (bool): Exit as soon as the queue is empty (also while scraping is paused).
+    """
+    poll_seconds = DEFAULT_POLL_SECONDS if poll_seconds is None else poll_seconds
+    logger.info("Bulk job worker started.")
+    last_purge = None
+
+    while True:
+        # Don't burn item attempts while scraping is paused
+        staffspy = get_staffspy()
+        if staffspy.is_paused():
+            if once and not has_claimable_items():
+                _log_exit()
+                return
+            logger.info(f"No StaffSpy account available; worker paused: {staffspy.stats()}")
+            time.sleep(poll_seconds)
+            continue
+
+        processed = process_batch(batch_size)
+        if processed:
+            continue
+
+        # Housekeeping while idle: drop expired search cache rows
+        if last_purge is None or time.monotonic() - last_purge >= SEARCH_CACHE_PURGE_SECONDS:
+            purge_expired_searches()
+            last_purge = time.monotonic()
+        if once:
+            _log_exit()
+            return
+        time.sleep(poll_seconds)
+
+
+def _log_exit():
+    logger.info(
+        f"Bulk job queue empty; worker exiting. Profile writes: {get_write_stats()}, "
+        f"profile cache: {get_cache_stats()}"
+    )
+
+
+def get_job_status(job_id: int):
+    """
+    Summarize a bulk job's progress.
+
+    Args:
+        job_id (int): The job's ID.
+
+    Returns:
+        dict or None: {"job_id", "status", "total", "pending", "running", "done", "failed"},
+                      or None if the job doesn't exist.
+    """
+    db = SessionLocal()
+    try:
+        job = db.get(BulkJob, job_id)
+        if not job:
+            return None
+
+        counts = dict(
+            db.query(BulkJobItem.status, func.count())
+            .filter(BulkJobItem.job_id == job_id)
+            .group_by(BulkJobItem.status)
+            .all()
+        )
+        return {
+            "job_id": job.job_id,
+            "status": job.status,
+            "total": job.total,
+            **{state: counts.get(state, 0) for state in (PENDING, RUNNING, DONE, FAILED)},
+        }
+
+    finally:
+        db.close()
+
+
+def get_job_results(job_id: int, offset: int = 0, limit: int = None):
+    """
+    Load one page of a bulk job's results in CSV order.
+
+    Args:
+        job_id (int): The job's ID.
+        offset (int): Number of items to skip.
+        limit (int, optional): Max items to return (all if None).
+
+    Returns:
+        list[dict]: One {"position", "url", "status", "profile", "error"} entry per item.
+    """
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(BulkJobItem, Profile)
+            .outerjoin(Profile, Profile.profile_id == BulkJobItem.profile_id)
+            .filter(BulkJobItem.job_id == job_id)
+            .order_by(BulkJobItem.position)
+            .offset(offset)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+
+        return [
+            {
+                "position": item.position,
+                "url": item.url,
+                "status": item.status,
+                "profile": conform_profile_fields(
+                    {c.name: getattr(prof, c.name) for c in prof.__table__.columns}
+                ) if prof else None,
+                "error": item.error,
+            }
+            for item, prof in query.all()
+        ]
+
+    finally:
+        db.close()
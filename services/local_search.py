@@ -0,0 +1,189 @@
+import os
+import time
+import logging
+from sqlalchemy import select, or_, and_, func, literal_column, cast
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.config import get_env
+from database.db import SessionLocal
+from database.models import Profile
+from services.harvest_api import search_profiles_multi_page
+from utils.helpers import extract_profile_link, ilike_contains
+
+# === Logging Setup ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on local hits returned per search
+DEFAULT_LOCAL_LIMIT = int(get_env("LOCAL_SEARCH_LIMIT", 50))
+
+# Must match the expression of ix_profiles_name_tsv in schema.sql, or the index is not used.
+# Only the name is indexed: a name search must not hit on headline/company/location words.
+SEARCH_DOCUMENT = "to_tsvector('simple', coalesce(profiles.name, ''))"
+
+
+def search_local_profiles(name: str, current_company: str = None, past_company: str = None,
+                          school: str = None, location: str = None, headline: str = None,
+                          skill: str = None, limit: int = None, offset: int = 0):
+    """
+    Search stored profiles with the trigram/full-text indexes on `profiles`.
+
+    The name must be trigram-similar to the stored name or contain all of
+    its words (in any order, via the full-text index on the name). The other
+    arguments are filters: those of the Harvest API plus headline and skill
+    (substring filters are served by the columns' trigram indexes). Hits are ranked by name
+    similarity plus full-text rank.
+
+    Args:
+        name (str): Name to search for (required).
+        current_company (str, optional): Substring of the current company.
+        past_company (str, optional): Substring of either past company.
+        school (str, optional): Substring of either school.
+        location (str, optional): Substring of the location.
+        headline (str, optional): Substring of the headline.
+        skill (str, optional): Exact skill name (GIN index on `skills`).
+        limit (int, optional): Max hits. Defaults to LOCAL_SEARCH_LIMIT.
+        offset (int): Ranked hits to skip (for paging).
+
+    Returns:
+        list[dict]: Harvest-style elements ({"linkedinUrl", "publicIdentifier",
+                    "name", "headline", "company", "location", "score",
+                    "source": "local"}), best match first. Empty on DB errors
+                    (e.g. pg_trgm not installed).
+    """
+    limit = limit or DEFAULT_LOCAL_LIMIT
+    document = literal_column(SEARCH_DOCUMENT)
+    query = func.plainto_tsquery(literal_column("'simple'"), name)
+    score = (func.similarity(Profile.name, name) + func.ts_rank_cd(document, query)).label("score")
+
+    filters = [or_(Profile.name.op("%")(name), document.op("@@")(query))]
+    if current_company:
+        filters.append(ilike_contains(Profile.company, current_company))
+    if past_company:
+        filters.append(or_(ilike_contains(Profile.past_company1, past_company),
+                           ilike_contains(Profile.past_company2, past_company)))
+    if school:
+        filters.append(or_(ilike_contains(Profile.school1, school), ilike_contains(Profile.school2, school)))
+    if location:
+        filters.append(ilike_contains(Profile.location, location))
+    if headline:
+        filters.append(ilike_contains(Profile.headline, headline))
+    if skill:
+        filters.append(Profile.skills.op("@>")(cast([{"name": skill}], JSONB)))
+
+    stmt = (
+        select(
+            Profile.linkedin_url, Profile.linkedin_id, Profile.name, Profile.headline,
+            Profile.company, Profile.location, score,
+        )
+        .where(and_(*filters))
+        .order_by(score.desc(), Profile.last_updated.desc(), Profile.profile_id)
+        .limit(limit)
+        .offset(offset)
+    )
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rows = db.execute(stmt).all()
+    except SQLAlchemyError as e:
+        logger.warning(f"Local profile search failed, falling back to Harvest: {e}")
+        db.rollback()
+        return []
+    finally:
+        db.close()
+
+    logger.info(f"Local search for '{name}': {len(rows)} hits in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return [
+        {
+            "linkedinUrl": row.linkedin_url,
+            "publicIdentifier": row.linkedin_id,
+            "name": row.name,
+            "headline": row.headline,
+            "company": row.company,
+            "location": row.location,
+            "score": float(row.score or 0),
+            "source": "local",
+        }
+        for row in rows
+    ]
+
+
+def search_profiles_local_first(name: str, current_company: str = None, past_company: str = None,
+                                school: str = None, location: str = None, headline: str = None,
+                                skill: str = None, max_show: int = 10, min_local_results: int = None,
+                                use_local: bool = True, **harvest_kwargs):
+    """
+    Search stored profiles first and only call Harvest when they are not enough.
+
+    Stored profiles only stand in for the first results page: when
+    `start_page` > 1 (or `use_local` is False) Harvest is queried directly.
+    Harvest cannot filter by headline or skill, so with either filter only
+    stored profiles are searched, paged by `max_show` hits per page.
+
+    Args:
+        name, current_company, past_company, school, location: Search fields,
+            as for `AsyncHarvestAPI.search_many_pages`.
+        headline (str, optional): Substring of the headline (stored profiles only).
+        skill (str, optional): Exact skill name (stored profiles only).
+        max_show (int): Number of unique profiles wanted.
+        min_local_results (int, optional): Local hits that make a Harvest call
+            unnecessary. Defaults to `max_show`.
+        use_local (bool): Set False to skip stored profiles and query Harvest only.
+        **harvest_kwargs: Passed to `search_profiles_multi_page` (start_page, max_pages, ...).
+
+    Returns:
+        list[dict]: Local hits first, then Harvest elements for profiles not
+                    already found locally.
+
+    Raises:
+        ValueError: If `headline` or `skill` is given with `use_local` False.
+    """
+    min_local_results = max_show if min_local_results is None else min_local_results
+    fields = {
+        "name": name,
+        "current_company": current_company,
+        "past_company": past_company,
+        "school": school,
+        "location": location,
+    }
+
+    start_page = harvest_kwargs.get("start_page", 1)
+    if headline or skill:
+        if not use_local:
+            raise ValueError("Headline and skill filters only apply to stored profiles; search them first.")
+        return search_local_profiles(**fields, headline=headline, skill=skill,
+                                     limit=max_show, offset=(start_page - 1) * max_show)
+
+    if not use_local or start_page > 1:
+        return search_profiles_multi_page(**fields, max_show=max_show, **harvest_kwargs)
+
+    local = search_local_profiles(**fields, limit=max_show)
+    if len(local) >= min_local_results:
+        logger.info(f"Served search for '{name}' from {len(local)} stored profiles; Harvest skipped.")
+        return local
+
+    try:
+        remote = search_profiles_multi_page(**fields, max_show=max_show, **harvest_kwargs)
+    except Exception as e:
+        if not local:
+            raise
+        logger.exception(f"Harvest search failed; returning {len(local)} local hits only: {e}")
+        return local
+
+    seen = {extract_profile_link(element) for element in local}
+    merged = list(local)
+    for element in remote or []:
+        link = extract_profile_link(element)
+        if link not in seen:
+            seen.add(link)
+            merged.append(element)
+    return merged
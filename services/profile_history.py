@@ -0,0 +1,281 @@
+import os
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, update, bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.config import get_env
+from database.db import SessionLocal
+from database.models import Profile, ProfileVersion, PROFILE_FIELDS
+
+# === Logging Setup ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+# Versions newer than this are kept as-is; older ones are thinned to one per month
+DEFAULT_RETENTION_DAYS = int(get_env("PROFILE_HISTORY_RETENTION_DAYS", 90))
+
+# Hard cap on stored versions per profile (0 = no cap)
+DEFAULT_MAX_VERSIONS = int(get_env("PROFILE_HISTORY_MAX_VERSIONS", 50))
+
+
+def record_versions(db, refreshed):
+    """
+    Store the outgoing content of profiles whose refresh changed them.
+
+    Must run before the new content is written, while the Profile objects
+    still hold the old values. Only the changed fields are stored.
+
+    Args:
+        db (Session): Active SQLAlchemy session (caller commits).
+        refreshed (list[tuple[dict, Profile]]): Rows from `_profile_row`
+            paired with the existing Profile (or None).
+
+    Returns:
+        int: Number of versions recorded.
+    """
+    rows = [
+        {
+            "profile_id": prof.profile_id,
+            "version": prof.version or 1,
+            "content_hash": prof.content_hash,
+            "delta": {field: getattr(prof, field) for field in row["changed_fields"]},
+            "captured_at": prof.last_updated,
+        }
+        for row, prof in refreshed
+        if prof and row["changed_fields"]
+    ]
+    if rows:
+        # A concurrent refresh may already have recorded the same version
+        db.execute(insert(ProfileVersion).values(rows).on_conflict_do_nothing(
+            index_elements=[ProfileVersion.profile_id, ProfileVersion.version]
+        ))
+    return len(rows)
+
+
+def list_profile_versions(profile_id: int):
+    """
+    List a profile's stored versions, newest first.
+
+    Args:
+        profile_id (int): The profile's ID.
+
+    Returns:
+        list[dict]: {"version", "changed_fields", "captured_at", "superseded_at"}
+                    per stored version; the live row is not included.
+    """
+    db = SessionLocal()
+    try:
+        versions = (
+            db.query(ProfileVersion)
+            .filter(ProfileVersion.profile_id == profile_id)
+            .order_by(ProfileVersion.version.desc())
+            .all()
+        )
+        return [
+            {
+                "version": v.version,
+                "changed_fields": sorted(v.delta),
+                "captured_at": v.captured_at,
+                "superseded_at": v.superseded_at,
+            }
+            for v in versions
+        ]
+    finally:
+        db.close()
+
+
+def get_profile_version(profile_id: int, version: int = None):
+    """
+    Reconstruct a profile's content as of a past version.
+
+    Starts from the live row and applies the reverse deltas of every newer
+    stored version, newest first. If `version` itself was compacted away,
+    the closest newer stored version (the one that replaced it) is returned.
+
+    Args:
+        profile_id (int): The profile's ID.
+        version (int, optional): Version to rebuild. Defaults to the live version.
+
+    Returns:
+        dict or None: {"version": int, **PROFILE_FIELDS}, or None if the
+                      profile doesn't exist.
+    """
+    db = SessionLocal()
+    try:
+        prof = db.get(Profile, profile_id)
+        if not prof:
+            return None
+
+        content = {field: getattr(prof, field) for field in PROFILE_FIELDS}
+        current = prof.version or 1
+        if version is None or version >= current:
+            return {"version": current, **content}
+
+        deltas = (
+            db.query(ProfileVersion.version, ProfileVersion.delta)
+            .filter(ProfileVersion.profile_id == profile_id, ProfileVersion.version >= version)
+            .order_by(ProfileVersion.version.desc())
+            .all()
+        )
+        return _rebuild_version(content, current, deltas)
+
+    finally:
+        db.close()
+
+
+def _rebuild_version(content: dict, current: int, deltas):
+    """
+    Apply reverse deltas to the live content.
+
+    Args:
+        content (dict): Live PROFILE_FIELDS values.
+        current (int): Live version.
+        deltas (list[tuple[int, dict]]): (version, delta) of every stored
+            version at or above the one wanted, newest first.
+
+    Returns:
+        dict: {"version": int, **PROFILE_FIELDS} of the oldest version in `deltas`
+              (the live version if there are none).
+    """
+    content = dict(content)
+    for _, delta in deltas:
+        content.update(delta)
+    return {"version": deltas[-1][0] if deltas else current, **content}
+
+
+def _compact_versions(versions, cutoff, max_versions: int):
+    """
+    Decide which versions to keep and fold the dropped deltas into them.
+
+    Versions older than `cutoff` are thinned to the newest one per calendar
+    month; beyond that, the oldest are dropped down to `max_versions`.
+
+    Args:
+        versions (list[ProfileVersion]): One profile's versions, oldest first.
+        cutoff (datetime): Versions superseded before this are thinned.
+        max_versions (int): Cap on kept versions (0 = no cap).
+
+    Returns:
+        tuple[dict, list[int]]: New deltas by version_id for kept versions
+        whose delta changed, and version_ids to delete.
+    """
+    keep = set()
+    newest_per_month = {}
+    for v in versions:
+        if v.superseded_at >= cutoff:
+            keep.add(v.version_id)
+        else:
+            # Oldest first, so the last one seen per month is the newest
+            newest_per_month[(v.superseded_at.year, v.superseded_at.month)] = v.version_id
+    keep.update(newest_per_month.values())
+
+    if max_versions and len(keep) > max_versions:
+        kept_in_order = [v.version_id for v in versions if v.version_id in keep]
+        keep = set(kept_in_order[-max_versions:])
+
+    # Walk newest to oldest: a kept version absorbs the deltas of the dropped
+    # versions between it and the next newer kept version (its own values win)
+    new_deltas, dropped, carry = {}, [], {}
+    for v in reversed(versions):
+        if v.version_id in keep:
+            if carry:
+                new_deltas[v.version_id] = {**carry, **v.delta}
+                carry = {}
+        else:
+            carry = {**carry, **v.delta}
+            dropped.append(v.version_id)
+
+    return new_deltas, dropped
+
+
+def compact_profile_history(retention_days: int = None, max_versions: int = None, batch_size: int = 200) -> dict:
+    """
+    Thin out old profile versions so history grows with time, not refresh count.
+
+    Recent versions (within `retention_days`) are kept; older ones are
+    reduced to one per month, and each profile keeps at most `max_versions`.
+    Deltas of dropped versions are merged into the next older kept version,
+    so every kept version can still be reconstructed exactly.
+
+    Args:
+        retention_days (int, optional): Defaults to PROFILE_HISTORY_RETENTION_DAYS.
+        max_versions (int, optional): Defaults to PROFILE_HISTORY_MAX_VERSIONS.
+        batch_size (int): Profiles compacted per transaction.
+
+    Returns:
+        dict: {"profiles": int, "merged": int, "deleted": int}
+    """
+    retention_days = DEFAULT_RETENTION_DAYS if retention_days is None else retention_days
+    max_versions = DEFAULT_MAX_VERSIONS if max_versions is None else max_versions
+    cutoff = datetime.now(tz=timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
+
+    table = ProfileVersion.__table__
+    merge_stmt = (
+        update(table)
+        .where(table.c.version_id == bindparam("b_version_id"))
+        .values(delta=bindparam("b_delta"))
+    )
+
+    stats = {"profiles": 0, "merged": 0, "deleted": 0}
+    last_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            # Next batch of profiles that have any history (keyset pagination)
+            profile_ids = [
+                pid for (pid,) in db.query(ProfileVersion.profile_id)
+                .filter(ProfileVersion.profile_id > last_id)
+                .group_by(ProfileVersion.profile_id)
+                .order_by(ProfileVersion.profile_id)
+                .limit(batch_size)
+                .all()
+            ]
+            if not profile_ids:
+                break
+
+            versions_by_profile = {}
+            for v in (
+                db.query(ProfileVersion)
+                .filter(ProfileVersion.profile_id.in_(profile_ids))
+                .order_by(ProfileVersion.profile_id, ProfileVersion.version)
+                .all()
+            ):
+                versions_by_profile.setdefault(v.profile_id, []).append(v)
+
+            merges, deletes = [], []
+            for versions in versions_by_profile.values():
+                new_deltas, dropped = _compact_versions(versions, cutoff, max_versions)
+                merges.extend({"b_version_id": vid, "b_delta": delta} for vid, delta in new_deltas.items())
+                deletes.extend(dropped)
+                if dropped:
+                    stats["profiles"] += 1
+
+            if merges:
+                db.execute(merge_stmt, merges)
+            if deletes:
+                db.execute(delete(ProfileVersion).where(ProfileVersion.version_id.in_(deletes)))
+            db.commit()
+
+            stats["merged"] += len(merges)
+            stats["deleted"] += len(deletes)
+            last_id = profile_ids[-1]
+
+    except SQLAlchemyError as e:
+        logger.exception(f"Profile history compaction failed: {e}")
+        db.rollback()
+        raise
+
+    finally:
+        db.close()
+
+    logger.info(f"Profile history compaction: {stats}")
+    return stats
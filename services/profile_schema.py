@@ -0,0 +1,251 @@
+import os
+import json
+import math
+import hashlib
+import re
+import logging
+from datetime import date, datetime
+from typing import List, Optional, TypedDict
+
+from utils.helpers import safe_parse_jsonish
+
+# === Logging Setup ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Skill(TypedDict):
+    name: str
+    endorsements: int
+    passed_assessment: bool
+
+
+class Experience(TypedDict):
+    title: Optional[str]
+    company: Optional[str]
+    location: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    duration: Optional[str]
+    emp_type: Optional[str]
+    description: Optional[str]
+
+
+class Certification(TypedDict):
+    title: Optional[str]
+    issuer: Optional[str]
+    date_issued: Optional[str]
+    cert_id: Optional[str]
+    cert_link: Optional[str]
+
+
+# Separators for skills that arrive as one "Python, SQL; Docker" string
+_SKILL_SPLIT_RE = re.compile(r"\s*[,;|]\s*")
+
+
+def _clean(value):
+    """
+    Coerce a scalar into a JSON-safe value: trimmed text, ISO date or None.
+
+    NaN/NaT (as produced by pandas) and blank strings become None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, datetime):
+        return None if value != value else value.date().isoformat()  # NaT != NaT
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    text = str(value).strip()
+    return text or None
+
+
+def _as_int(value) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value) and value == value  # NaN is truthy but means "unknown"
+
+
+def _as_items(value, field: str) -> list:
+    """
+    Parse a JSON-ish value into a list of items (dicts or scalars).
+    """
+    value = safe_parse_jsonish(value)
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return []
+    if isinstance(value, dict):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if isinstance(value, str):
+        logger.warning(f"Unparseable {field} value stored as plain text: {value[:80]!r}")
+    return [value]
+
+
+def normalize_skills(value) -> List[Skill]:
+    """
+    Normalize skills into a list of `Skill` dicts.
+
+    Plain strings become skill names (a delimited string is split); entries
+    without a name are dropped.
+
+    Args:
+        value: Skills as returned by StaffSpy or stored in the DB.
+
+    Returns:
+        list[Skill]: Normalized skills, in their original order.
+    """
+    skills = []
+    for item in _as_items(value, "skills"):
+        if isinstance(item, dict):
+            name = _clean(item.get("name"))
+            if name:
+                skills.append({
+                    "name": name,
+                    "endorsements": _as_int(item.get("endorsements")),
+                    "passed_assessment": _as_bool(item.get("passed_assessment")),
+                })
+            continue
+
+        text = _clean(item)
+        for name in _SKILL_SPLIT_RE.split(text) if text else []:
+            if name:
+                skills.append({"name": name, "endorsements": 0, "passed_assessment": False})
+    return skills
+
+
+def normalize_experiences(value) -> List[Experience]:
+    """
+    Normalize experiences into a list of `Experience` dicts.
+
+    Dates become ISO strings; a plain string becomes an experience title.
+
+    Args:
+        value: Experiences as returned by StaffSpy or stored in the DB.
+
+    Returns:
+        list[Experience]: Normalized experiences, in their original order.
+    """
+    experiences = []
+    for item in _as_items(value, "experiences"):
+        if not isinstance(item, dict):
+            item = {"title": item}
+        exp = {key: _clean(item.get(key)) for key in Experience.__annotations__}
+        if any(exp.values()):
+            experiences.append(exp)
+    return experiences
+
+
+def normalize_certifications(value) -> List[Certification]:
+    """
+    Normalize certifications into a list of `Certification` dicts.
+
+    Args:
+        value: Certifications as returned by StaffSpy or stored in the DB.
+
+    Returns:
+        list[Certification]: Normalized certifications, in their original order.
+    """
+    certifications = []
+    for item in _as_items(value, "certifications"):
+        if not isinstance(item, dict):
+            item = {"title": item}
+        cert = {key: _clean(item.get(key)) for key in Certification.__annotations__}
+        if any(cert.values()):
+            certifications.append(cert)
+    return certifications
+
+
+def normalize_profile_fields(data: dict) -> dict:
+    """
+    Apply the strict schema to a profile's structured fields.
+
+    Scalar fields are trimmed (blank/NaN become None); skills, experiences and
+    certifications always become lists of typed dicts, so readers never need
+    to parse them.
+
+    Args:
+        data (dict): Profile fields, e.g. from `StaffSpyService`.
+
+    Returns:
+        dict: A new dict with the same keys, normalized.
+    """
+    normalized = {}
+    for key, value in data.items():
+        if key == "skills":
+            normalized[key] = normalize_skills(value)
+        elif key == "experiences":
+            normalized[key] = normalize_experiences(value)
+        elif key == "certifications":
+            normalized[key] = normalize_certifications(value)
+        else:
+            normalized[key] = _clean(value)
+    return normalized
+
+
+# Structured fields, their item shape and the normalizer that produces it
+_STRUCTURED_FIELDS = {
+    "skills": (Skill, normalize_skills),
+    "experiences": (Experience, normalize_experiences),
+    "certifications": (Certification, normalize_certifications),
+}
+
+
+def _conforms(value, shape) -> bool:
+    keys = shape.__annotations__.keys()
+    return isinstance(value, list) and all(isinstance(item, dict) and keys <= item.keys() for item in value)
+
+
+def conform_profile_fields(data: dict) -> dict:
+    """
+    Bring a stored profile's structured fields into the strict schema on read.
+
+    Rows written before the schema existed (and not yet rewritten by
+    `backfill_profile_schema`) may hold plain strings, unparsed text or
+    dicts with missing keys. Fields that already conform are left as they
+    are, so the common case costs one shape check per field.
+
+    Args:
+        data (dict): Profile row as a dictionary (modified in place).
+
+    Returns:
+        dict: The same dict, or None if `data` is None.
+    """
+    if not data:
+        return data
+    for field, (shape, normalize) in _STRUCTURED_FIELDS.items():
+        if field in data and not _conforms(data[field], shape):
+            data[field] = normalize(data[field])
+    return data
+
+
+def profile_fingerprint(data: dict, fields) -> str:
+    """
+    Hash a profile's normalized content fields.
+
+    Args:
+        data (dict): Normalized profile fields.
+        fields (list[str]): Content fields to include (e.g. PROFILE_FIELDS).
+
+    Returns:
+        str: SHA-256 hex digest, stable across key order.
+    """
+    payload = json.dumps({field: data.get(field) for field in fields}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,12 +1,21 @@
 import os
+import copy
 import logging
+import threading
+from collections import Counter
 from datetime import datetime, timezone
+from sqlalchemy import func, select, update, bindparam
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 
+from config.config import get_env
 from database.db import SessionLocal
-from database.models import Profile
+from database.models import Profile, PROFILE_FIELDS
 from services.staff_spy import StaffSpyService
-from utils.helpers import extract_linkedin_id
+from services.profile_schema import normalize_profile_fields, conform_profile_fields, profile_fingerprint
+from services.profile_history import record_versions
+from utils.cache import TTLCache
+from utils.helpers import extract_linkedin_id, canonicalize_linkedin_url
 
 # === Logging Setup ===
 os.makedirs("logs", exist_ok=True)
@@ -18,7 +27,170 @@ logging.basicConfig(
 )
 
 logger = logging.getLogger(__name__)
-staffspy = StaffSpyService()
+
+# StaffSpy loads its session files (and pandas) on first use, not at import time
+_staffspy = None
+_staffspy_lock = threading.Lock()
+
+
+def get_staffspy() -> StaffSpyService:
+    """
+    Return the process-wide StaffSpy service, creating it on first use.
+    """
+    global _staffspy
+    if _staffspy is None:
+        with _staffspy_lock:
+            if _staffspy is None:
+                _staffspy = StaffSpyService()
+    return _staffspy
+
+
+# In-process cache of profile dicts keyed by canonical LinkedIn ID
+profile_cache = TTLCache(
+    maxsize=int(get_env("PROFILE_CACHE_SIZE", 1024)),
+    ttl=float(get_env("PROFILE_CACHE_TTL_SECONDS", 600)),
+)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is still running wait for it and receive the same result
+    (or exception) instead of running the function again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Run `fn()` for `key`, or wait for and share an in-flight run.
+
+        Args:
+            key: Identifier of the work (e.g. a LinkedIn ID).
+            fn (callable): Zero-argument function doing the work.
+
+        Returns:
+            Whatever `fn()` returned for the leader.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+                leader = True
+                self.executions += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            logger.info(f"Waiting on in-flight refresh for: {key}")
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["done"].set()
+
+    def do_many(self, keys, fn):
+        """
+        Batch variant of `do`: run `fn` once for the keys nobody else is running.
+
+        Keys already in flight (in `do` or another `do_many`) are not passed
+        to `fn`; their leaders' results are waited for after `fn` returns.
+        A leader that failed yields None for its key.
+
+        Args:
+            keys (list): Identifiers of the work.
+            fn (callable): Called with the list of keys this caller leads;
+                returns a dict of key -> result.
+
+        Returns:
+            dict: Result per key.
+        """
+        led, waiting = {}, {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is None:
+                    call = {"done": threading.Event(), "result": None, "error": None}
+                    self._calls[key] = call
+                    led[key] = call
+                    self.executions += 1
+                else:
+                    waiting[key] = call
+                    self.coalesced += 1
+
+        results = {}
+        try:
+            if led:
+                results.update(fn(list(led)))
+                for key, call in led.items():
+                    call["result"] = results.get(key)
+        except Exception as e:
+            for call in led.values():
+                call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                for key in led:
+                    self._calls.pop(key, None)
+            for call in led.values():
+                call["done"].set()
+
+        if waiting:
+            logger.info(f"Waiting on {len(waiting)} in-flight refreshes")
+        for key, call in waiting.items():
+            call["done"].wait()
+            results[key] = call["result"] if call["error"] is None else None
+        return results
+
+
+refresh_flight = SingleFlight()
+
+# Refresh write counters: inserted/updated/touched rows and per-field changes
+write_stats = Counter()
+_write_stats_lock = threading.Lock()
+
+
+def get_write_stats() -> dict:
+    """
+    Summarize how many refresh writes were avoided by fingerprint matching.
+
+    Returns:
+        dict: Row counts by write kind (plus writes lost to a concurrent
+              refresh), the share of refreshes that only touched
+              `last_updated`, and how often each field changed.
+    """
+    with _write_stats_lock:
+        stats = dict(write_stats)
+
+    refreshes = sum(stats.get(kind, 0) for kind in ("inserted", "updated", "touched"))
+    return {
+        "inserted": stats.get("inserted", 0),
+        "updated": stats.get("updated", 0),
+        "touched": stats.get("touched", 0),
+        "conflicts": stats.get("conflicts", 0),
+        "touched_ratio": stats.get("touched", 0) / refreshes if refreshes else 0.0,
+        "field_changes": {
+            key.split(":", 1)[1]: count for key, count in stats.items() if key.startswith("field:")
+        },
+    }
 
 
 def _age_in_days(ts) -> int:
@@ -43,69 +215,483 @@ def _age_in_days(ts) -> int:
     return (now - ts).days
 
 
-def get_or_refresh_profile(linkedin_url: str, freshness_days: int = 30):
+def _cache_get(linkedin_id: str, freshness_days: int):
+    """
+    Look up a profile in the in-process cache, honouring `freshness_days`.
+
+    Args:
+        linkedin_id (str): Canonical LinkedIn profile ID.
+        freshness_days (int): Max age in days for data to be considered fresh.
+
+    Returns:
+        dict or None: A deep copy of the cached profile if present and fresh enough.
+    """
+    data = profile_cache.get(linkedin_id)
+    if data and _age_in_days(data.get("last_updated")) <= freshness_days:
+        # Deep copy: the JSONB lists must not be shared with callers
+        return copy.deepcopy(data)
+    return None
+
+
+def _cache_put(data: dict):
+    """
+    Store a deep copy of a profile dict in the in-process cache (no-op for None).
+    """
+    if data and data.get("linkedin_id"):
+        profile_cache.set(data["linkedin_id"], copy.deepcopy(data))
+    return data
+
+
+def get_cache_stats() -> dict:
+    """
+    Summarize the in-process profile cache and refresh coalescing.
+
+    Returns:
+        dict: Cache size, hits/misses/evictions/expirations and hit ratio,
+              plus refresh executions and coalesced waiters.
+    """
+    stats = profile_cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        **stats,
+        "hit_ratio": stats["hits"] / lookups if lookups else 0.0,
+        "refreshes": refresh_flight.executions,
+        "coalesced_refreshes": refresh_flight.coalesced,
+    }
+
+
+def get_or_refresh_profile(linkedin_url: str, freshness_days: int = 30, limiter=None):
     """
     Retrieves a LinkedIn profile from the database if it's fresh.
-    Otherwise, fetches from StaffSpy API and upserts into the database.
+    Otherwise, fetches from StaffSpy API and upserts into the database
+    with a single `INSERT ... ON CONFLICT DO UPDATE ... RETURNING` statement.
+
+    The URL is canonicalized first, so every variant of the same profile URL
+    shares one row and one scrape.
 
     Args:
         linkedin_url (str): The LinkedIn profile URL to fetch.
         freshness_days (int): Max age in days for data to be considered fresh.
+        limiter (HostRateLimiter, optional): Waited on before a StaffSpy scrape only.
 
     Returns:
         dict or None: The profile data as a dictionary, or None if not found/fetched.
     """
+    linkedin_id = extract_linkedin_id(linkedin_url)
+
+    cached = _cache_get(linkedin_id, freshness_days)
+    if cached:
+        logger.info(f"Using cached profile for: {linkedin_id}")
+        return cached
+
     db = SessionLocal()
 
     try:
-        # Attempt to fetch profile from DB
-        prof = db.query(Profile).filter(Profile.linkedin_url == linkedin_url).first()
+        # Attempt to fetch profile from DB by canonical ID
+        prof = (
+            db.query(Profile)
+            .filter(Profile.linkedin_id == linkedin_id)
+            .order_by(Profile.last_updated.desc())
+            .first()
+        )
 
         if prof and _age_in_days(prof.last_updated) <= freshness_days:
-            logger.info(f"Using fresh profile from DB for: {linkedin_url}")
-            return _to_dict(prof)
+            logger.info(f"Using fresh profile from DB for: {linkedin_id}")
+            return _cache_put(_to_dict(prof))
+
+        # Concurrent callers for the same ID share one scrape + upsert
+        data = refresh_flight.do(linkedin_id, lambda: _refresh_profile(db, linkedin_id, prof, limiter))
+        # Waiters share the leader's result, so each gets its own copy
+        return copy.deepcopy(data) if data else None
+
+    except SQLAlchemyError as e:
+        logger.exception(f"Database error while processing {linkedin_url}: {e}")
+        db.rollback()
+        return None
+
+    finally:
+        db.close()
+
+
+def _refresh_profile(db, linkedin_id: str, prof: Profile = None, limiter=None):
+    """
+    Scrape a profile from StaffSpy and upsert it, falling back to the stale row.
+
+    Args:
+        db (Session): Active SQLAlchemy session.
+        linkedin_id (str): Canonical LinkedIn profile ID.
+        prof (Profile, optional): Existing (stale) row for this ID.
+        limiter (HostRateLimiter, optional): Waited on before the scrape.
+
+    Returns:
+        dict or None: The refreshed profile, the stale profile, or None.
+    """
+    if limiter:
+        limiter.wait(canonicalize_linkedin_url(linkedin_id))
+
+    # Fetch new data using StaffSpy
+    newdata = get_staffspy().fetch_profile(linkedin_id)
+
+    if not newdata:
+        logger.warning(f"No data returned from StaffSpy for: {linkedin_id}")
+        if prof:
+            logger.info(f"Serving stale profile from DB for: {linkedin_id}")
+        return _to_dict(prof) if prof else None
+
+    # Atomic upsert (or touch-only update if the content is unchanged)
+    row = _profile_row(linkedin_id, newdata, prof)
+    # Convert before commit so expired attributes don't trigger a reload
+    data = _to_dict(_save_profiles(db, [(row, prof)])[0])
+    db.commit()
+
+    logger.info(f"Profile for {linkedin_id} refreshed and saved to DB.")
+    return _cache_put(data)
+
+
+def get_or_refresh_profiles(linkedin_urls, freshness_days: int = 30, limiter=None):
+    """
+    Bulk variant of `get_or_refresh_profile` for many URLs at once.
+
+    Resolves freshness for the whole list with a single query, fetches only
+    the stale/missing profiles from StaffSpy in batches, and writes them back
+    with one multi-row upsert. URLs that canonicalize to the same profile ID
+    are fetched once.
 
-        # Fetch new data using StaffSpy
-        linkedin_id = extract_linkedin_id(linkedin_url)
-        newdata = staffspy.fetch_profile(linkedin_id)
+    Args:
+        linkedin_urls (list[str]): LinkedIn profile URLs to fetch.
+        freshness_days (int): Max age in days for data to be considered fresh.
+        limiter (HostRateLimiter, optional): Waited on once before the StaffSpy
+            phase, and only if some profiles are stale or missing.
+
+    Returns:
+        dict: Mapping of each input URL to its profile dict, or None if not found/fetched.
+    """
+    ids_by_url = {url: extract_linkedin_id(url) for url in linkedin_urls if url}
+    by_id = {}
+
+    # Serve what we can from the in-process cache before touching the DB
+    ids = []
+    for linkedin_id in dict.fromkeys(ids_by_url.values()):
+        cached = _cache_get(linkedin_id, freshness_days)
+        if cached:
+            by_id[linkedin_id] = cached
+        else:
+            ids.append(linkedin_id)
+
+    cached_count = len(by_id)
+    if not ids:
+        return {url: by_id.get(linkedin_id) for url, linkedin_id in ids_by_url.items()}
+
+    db = SessionLocal()
+
+    try:
+        # Phase 1: one freshness query for the whole list (newest row wins)
+        existing = {
+            prof.linkedin_id: prof
+            for prof in (
+                db.query(Profile)
+                .filter(Profile.linkedin_id.in_(ids))
+                .order_by(Profile.last_updated.asc())
+                .all()
+            )
+        }
+
+        stale = []
+        for linkedin_id in ids:
+            prof = existing.get(linkedin_id)
+            if prof and _age_in_days(prof.last_updated) <= freshness_days:
+                by_id[linkedin_id] = _cache_put(_to_dict(prof))
+            else:
+                stale.append(linkedin_id)
+
+        missing = sum(1 for linkedin_id in stale if linkedin_id not in existing)
+        logger.info(
+            f"Bulk refresh: {cached_count} cached, {len(ids) - len(stale)} fresh, "
+            f"{len(stale) - missing} stale, {missing} missing"
+        )
+
+        if stale:
+            # Phase 2: stale IDs another caller is already refreshing are waited
+            # for rather than scraped again (shared with get_or_refresh_profile)
+            refreshed = refresh_flight.do_many(
+                stale, lambda led: _refresh_profiles(db, led, existing, limiter)
+            )
+            for linkedin_id in stale:
+                data = refreshed.get(linkedin_id)
+                prof = existing.get(linkedin_id)
+                by_id[linkedin_id] = copy.deepcopy(data) if data else _to_dict(prof)
+
+    except SQLAlchemyError as e:
+        logger.exception(f"Database error during bulk refresh of {len(ids)} profiles: {e}")
+        db.rollback()
+
+    finally:
+        db.close()
+
+    return {url: by_id.get(linkedin_id) for url, linkedin_id in ids_by_url.items()}
 
+
+def _refresh_profiles(db, linkedin_ids, existing: dict, limiter=None) -> dict:
+    """
+    Scrape many profiles from StaffSpy and write them back in one upsert.
+
+    Args:
+        db (Session): Active SQLAlchemy session (committed here).
+        linkedin_ids (list[str]): Canonical IDs to refresh.
+        existing (dict): Existing Profile rows by linkedin_id.
+        limiter (HostRateLimiter, optional): Waited on once before scraping.
+
+    Returns:
+        dict: Profile dict per ID, refreshed or stale (None if neither exists).
+    """
+    if limiter:
+        limiter.wait(canonicalize_linkedin_url(linkedin_ids[0]))
+
+    # Fetch only stale/missing profiles, batched per StaffSpy call
+    fetched = get_staffspy().fetch_profiles(linkedin_ids)
+
+    results, refreshed = {}, []
+    for linkedin_id in linkedin_ids:
+        newdata = fetched.get(linkedin_id)
+        prof = existing.get(linkedin_id)
         if not newdata:
-            logger.warning(f"No data returned from StaffSpy for: {linkedin_url}")
-            return _to_dict(prof) if prof else None
+            logger.warning(f"No data returned from StaffSpy for: {linkedin_id}")
+            results[linkedin_id] = _to_dict(prof)
+            continue
+        refreshed.append((_profile_row(linkedin_id, newdata, prof), prof))
+
+    for prof in _save_profiles(db, refreshed):
+        results[prof.linkedin_id] = _cache_put(_to_dict(prof))
+    db.commit()
+
+    logger.info(f"Bulk refresh saved {len(refreshed)} profiles to DB.")
+    return results
+
+
+def _profile_row(linkedin_id: str, newdata: dict, prof: Profile = None) -> dict:
+    """
+    Build an upsert row for a profile from normalized StaffSpy data.
+
+    Content fields go through the strict profile schema, so stored
+    skills/experiences/certifications are always lists of dicts.
+
+    Args:
+        linkedin_id (str): Canonical LinkedIn profile ID.
+        newdata (dict): Normalized profile data from StaffSpyService.
+        prof (Profile, optional): Existing row for this ID. Its URL is kept so
+            rows stored before canonicalization are updated in place.
+
+    Returns:
+        dict: Row with `linkedin_url`, `linkedin_id`, PROFILE_FIELDS,
+              `content_hash`, `changed_fields` (None for a new profile) and
+              `version`, always bumped for an existing row. Only the upsert
+              writes it, and the upsert's version check expects the live row
+              one below it, also when just a missing/outdated `content_hash`
+              is rewritten (unchanged content, empty `changed_fields`).
+    """
+    content = normalize_profile_fields({field: newdata.get(field) for field in PROFILE_FIELDS})
+    changed = [f for f in PROFILE_FIELDS if content[f] != getattr(prof, f)] if prof else None
+    version = (prof.version or 1) if prof else 1
+    return {
+        "linkedin_url": prof.linkedin_url if prof else canonicalize_linkedin_url(linkedin_id),
+        "linkedin_id": linkedin_id,
+        **content,
+        "content_hash": profile_fingerprint(content, PROFILE_FIELDS),
+        "changed_fields": changed,
+        "version": version + 1 if prof else version,
+    }
 
-        # If profile doesn't exist in DB, create one
-        if not prof:
-            prof = Profile(linkedin_url=linkedin_url)
 
-        # Update the profile with new data
-        for field in [
-            "name", "first_name", "last_name", "location", "headline",
-            "company", "past_company1", "past_company2", "school1", "school2",
-            "skills", "experiences", "certifications"
-        ]:
-            setattr(prof, field, newdata.get(field))
+def _save_profiles(db, refreshed):
+    """
+    Write refreshed profiles, skipping content writes when nothing changed.
+
+    Rows whose fingerprint matches the stored `content_hash` get a touch-only
+    update of `last_updated`; the rest go through the multi-row upsert, with
+    their previous content recorded in `profile_versions` as a delta.
+    If another refresh changed a profile since it was read (its version
+    moved on), that write is skipped and the newer row is returned instead.
+    Every write is counted in `write_stats`.
+
+    Args:
+        db (Session): Active SQLAlchemy session (caller commits).
+        refreshed (list[tuple[dict, Profile]]): Rows from `_profile_row`
+            paired with the existing Profile (or None).
+
+    Returns:
+        list[Profile]: The touched/inserted/updated Profile objects.
+    """
+    touch_ids = [prof.profile_id for row, prof in refreshed if prof and prof.content_hash == row["content_hash"]]
+    touched = set(touch_ids)
+    rows = [row for row, prof in refreshed if not (prof and prof.profile_id in touched)]
+
+    # Record the outgoing content first, while the Profile objects still hold it
+    record_versions(db, [(row, prof) for row, prof in refreshed if not (prof and prof.profile_id in touched)])
+
+    saved = []
+    if touch_ids:
+        stmt = (
+            update(Profile)
+            .where(Profile.profile_id.in_(touch_ids))
+            .values(last_updated=func.now())
+            .returning(Profile)
+        )
+        saved.extend(db.scalars(
+            stmt, execution_options={"populate_existing": True, "synchronize_session": False}
+        ).all())
+    upserted = _upsert_profiles(db, rows)
+    saved.extend(upserted)
+
+    # Rows the version check skipped lost a race with a concurrent refresh
+    written = {prof.linkedin_url for prof in upserted}
+    lost = [row["linkedin_url"] for row in rows if row["linkedin_url"] not in written]
+    if lost:
+        logger.info(f"{len(lost)} profiles were changed by a concurrent refresh; keeping those: {lost}")
+        saved.extend(db.scalars(
+            select(Profile).where(Profile.linkedin_url.in_(lost)),
+            execution_options={"populate_existing": True},
+        ).all())
+        rows = [row for row in rows if row["linkedin_url"] in written]
+
+    with _write_stats_lock:
+        write_stats["touched"] += len(touch_ids)
+        write_stats["conflicts"] += len(lost)
+        for row in rows:
+            if row["changed_fields"] is None:
+                write_stats["inserted"] += 1
+                continue
+            write_stats["updated"] += 1
+            for field in row["changed_fields"]:
+                write_stats[f"field:{field}"] += 1
 
-        # Commit changes to the database
-        db.add(prof)
-        db.commit()
-        db.refresh(prof)
+    for row in rows:
+        if row["changed_fields"]:
+            logger.info(f"Profile {row['linkedin_id']} changed: {', '.join(row['changed_fields'])}")
+    if touch_ids:
+        logger.info(f"{len(touch_ids)} unchanged profiles only had last_updated touched.")
+
+    return saved
+
+
+def _upsert_profiles(db, rows):
+    """
+    Insert or update many profiles with a single `INSERT ... ON CONFLICT DO UPDATE`.
+
+    `last_updated` is set explicitly on update, since the ORM `onupdate`
+    hook does not fire for Core upserts. An existing row is only updated
+    if it is still at the version the row was built from (`version - 1`),
+    so two concurrent refreshes can't both write the same next version;
+    the losing rows are simply not returned.
+
+    Args:
+        db (Session): Active SQLAlchemy session (caller commits).
+        rows (list[dict]): Profile rows as built by `_profile_row`.
+
+    Returns:
+        list[Profile]: The inserted/updated Profile objects.
+    """
+    if not rows:
+        return []
 
-        logger.info(f"Profile for {linkedin_url} refreshed and saved to DB.")
-        return _to_dict(prof)
+    stmt = insert(Profile).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Profile.linkedin_url],
+        set_={
+            **{field: stmt.excluded[field] for field in PROFILE_FIELDS},
+            "linkedin_id": stmt.excluded.linkedin_id,
+            "content_hash": stmt.excluded.content_hash,
+            "changed_fields": stmt.excluded.changed_fields,
+            "version": stmt.excluded.version,
+            "last_updated": func.now(),
+        },
+        # Optimistic concurrency: the live row must still be at the version we read
+        where=Profile.__table__.c.version == stmt.excluded.version - 1,
+    ).returning(Profile)
+
+    # populate_existing refreshes any Profile already loaded in this session
+    return db.scalars(stmt, execution_options={"populate_existing": True}).all()
+
+
+def backfill_profile_schema(batch_size: int = 500, dry_run: bool = False) -> dict:
+    """
+    Rewrite stored profiles so their content fields follow the strict schema
+    and carry an up-to-date `content_hash`.
+
+    Rows are scanned in `profile_id` order, one batch per transaction; only
+    rows whose normalized content differs are updated, and `last_updated`
+    is left untouched (this is a format change, not a refresh).
+
+    Args:
+        batch_size (int): Rows read and written per batch.
+        dry_run (bool): Count the rows that would change without writing.
+
+    Returns:
+        dict: {"scanned": int, "updated": int}
+    """
+    table = Profile.__table__
+    stmt = (
+        update(table)
+        .where(table.c.profile_id == bindparam("b_profile_id"))
+        .values(
+            **{field: bindparam(f"b_{field}") for field in PROFILE_FIELDS},
+            content_hash=bindparam("b_content_hash"),
+            last_updated=table.c.last_updated,
+        )
+    )
+
+    scanned = updated = 0
+    last_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(
+                select(table.c.profile_id, table.c.content_hash, *[table.c[field] for field in PROFILE_FIELDS])
+                .where(table.c.profile_id > last_id)
+                .order_by(table.c.profile_id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            changes = []
+            for row in rows:
+                current = {field: row._mapping[field] for field in PROFILE_FIELDS}
+                normalized = normalize_profile_fields(current)
+                content_hash = profile_fingerprint(normalized, PROFILE_FIELDS)
+                if normalized != current or content_hash != row.content_hash:
+                    changes.append({
+                        "b_profile_id": row.profile_id,
+                        "b_content_hash": content_hash,
+                        **{f"b_{field}": value for field, value in normalized.items()},
+                    })
+
+            if changes and not dry_run:
+                db.execute(stmt, changes)
+                db.commit()
+
+            scanned += len(rows)
+            updated += len(changes)
+            last_id = rows[-1].profile_id
+            logger.info(f"Schema backfill: {scanned} scanned, {updated} {'to update' if dry_run else 'updated'}")
 
     except SQLAlchemyError as e:
-        logger.exception(f"Database error while processing {linkedin_url}: {e}")
+        logger.exception(f"Schema backfill failed after {scanned} profiles: {e}")
         db.rollback()
-        return None
+        raise
 
     finally:
         db.close()
 
+    return {"scanned": scanned, "updated": updated}
+
 
 def _to_dict(prof: Profile):
     """
     Convert SQLAlchemy Profile object into a dictionary.
 
+    Skills, experiences and certifications of rows stored before the strict
+    schema are normalized here, so readers never see the legacy shapes.
+
     Args:
         prof (Profile): SQLAlchemy profile object
 
@@ -115,4 +701,4 @@ def _to_dict(prof: Profile):
     if not prof:
         return None
 
-    return {column.name: getattr(prof, column.name) for column in prof.__table__.columns}
+    return conform_profile_fields({column.name: getattr(prof, column.name) for column in prof.__table__.columns})
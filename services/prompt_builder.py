@@ -0,0 +1,182 @@
+from config.config import get_env
+from utils.helpers import safe_parse_jsonish
+
+# Approximate prompt budget for the profile text (excluding instructions)
+DEFAULT_TOKEN_BUDGET = int(get_env("SUMMARY_TOKEN_BUDGET", 800))
+
+# Rough characters-per-token ratio for English text on LLaMA-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Identity/work fields rendered as "Label: value" lines, in this order
+HEADER_FIELDS = [
+    ("name", "Name"),
+    ("headline", "Headline"),
+    ("location", "Location"),
+    ("company", "Current company"),
+    ("past_company1", "Past company"),
+    ("past_company2", "Past company"),
+    ("school1", "School"),
+    ("school2", "School"),
+]
+
+# How many items of each section are guaranteed a slot before the rest compete
+CORE_EXPERIENCES = 3
+CORE_SKILLS = 10
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (no tokenizer dependency).
+
+    Args:
+        text (str): Prompt text.
+
+    Returns:
+        int: Approximate token count.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _as_list(value):
+    """
+    Coerce a skills/experiences/certifications value into a list.
+    """
+    value = safe_parse_jsonish(value)
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _rank_experiences(experiences):
+    """
+    Current roles (no end date) first, otherwise keep StaffSpy's recency order.
+    """
+    indexed = list(enumerate(experiences))
+    indexed.sort(key=lambda item: (
+        not (isinstance(item[1], dict) and not item[1].get("end_date")),
+        item[0],
+    ))
+    return [exp for _, exp in indexed]
+
+
+def _rank_skills(skills):
+    """
+    Most endorsed skills first; passed assessments break ties.
+    """
+    def key(item):
+        index, skill = item
+        if not isinstance(skill, dict):
+            return (0, 0, index)
+        return (-(skill.get("endorsements") or 0), not skill.get("passed_assessment"), index)
+
+    return [skill for _, skill in sorted(enumerate(skills), key=key)]
+
+
+def _render_experience(exp) -> str:
+    if not isinstance(exp, dict):
+        return f"- {exp}"
+    title = exp.get("title") or "Role"
+    company = exp.get("company")
+    start = exp.get("start_date")
+    end = exp.get("end_date") or "Present"
+    line = f"- {title}" + (f" @ {company}" if company else "")
+    if start:
+        line += f" ({start} - {end})"
+    return line
+
+
+def _render_skill(skill) -> str:
+    if not isinstance(skill, dict):
+        return str(skill)
+    name = skill.get("name") or ""
+    endorsements = skill.get("endorsements")
+    return f"{name} ({endorsements})" if endorsements else name
+
+
+def _render_certification(cert) -> str:
+    if not isinstance(cert, dict):
+        return f"- {cert}"
+    title = cert.get("title") or "Certification"
+    issuer = cert.get("issuer")
+    return f"- {title}" + (f" ({issuer})" if issuer else "")
+
+
+def build_profile_prompt(profile_data: dict, token_budget: int = None):
+    """
+    Render a compact, deterministic text representation of a profile.
+
+    Only content fields are included (no IDs or timestamps). Experiences and
+    skills are ranked, and lower-ranked items are dropped once the estimated
+    token budget is reached; the header lines are always kept.
+
+    Args:
+        profile_data (dict): A dictionary of profile fields.
+        token_budget (int, optional): Approximate token budget for the text.
+            Defaults to SUMMARY_TOKEN_BUDGET.
+
+    Returns:
+        tuple[str, dict]: The profile text and prompt-size stats.
+    """
+    token_budget = DEFAULT_TOKEN_BUDGET if token_budget is None else token_budget
+
+    header = [
+        f"{label}: {profile_data[field]}"
+        for field, label in HEADER_FIELDS
+        if profile_data.get(field)
+    ]
+
+    experiences = _rank_experiences(_as_list(profile_data.get("experiences")))
+    skills = _rank_skills(_as_list(profile_data.get("skills")))
+    certifications = _as_list(profile_data.get("certifications"))
+
+    rendered = {
+        "experiences": [_render_experience(e) for e in experiences],
+        "skills": [_render_skill(s) for s in skills],
+        "certifications": [_render_certification(c) for c in certifications],
+    }
+
+    # Candidates in priority order: core experiences/skills first, then the rest
+    candidates = (
+        [("experiences", i) for i in range(min(CORE_EXPERIENCES, len(experiences)))]
+        + [("skills", i) for i in range(min(CORE_SKILLS, len(skills)))]
+        + [("experiences", i) for i in range(CORE_EXPERIENCES, len(experiences))]
+        + [("certifications", i) for i in range(len(certifications))]
+        + [("skills", i) for i in range(CORE_SKILLS, len(skills))]
+    )
+
+    used = estimate_tokens("\n".join(header))
+    chosen = {"experiences": [], "skills": [], "certifications": []}
+    for section, index in candidates:
+        # Each item pays ~2 tokens for separators; a section's first item also pays for its heading
+        cost = estimate_tokens(rendered[section][index]) + 2
+        if not chosen[section]:
+            cost += 3
+        if used + cost > token_budget:
+            continue
+        chosen[section].append(index)
+        used += cost
+
+    lines = list(header)
+    if chosen["experiences"]:
+        lines.append("Experience:")
+        lines.extend(rendered["experiences"][i] for i in sorted(chosen["experiences"]))
+    if chosen["skills"]:
+        lines.append("Skills: " + ", ".join(rendered["skills"][i] for i in sorted(chosen["skills"])))
+    if chosen["certifications"]:
+        lines.append("Certifications:")
+        lines.extend(rendered["certifications"][i] for i in sorted(chosen["certifications"]))
+
+    text = "\n".join(lines)
+    stats = {
+        "chars": len(text),
+        "tokens_est": estimate_tokens(text),
+        "token_budget": token_budget,
+        "experiences": f"{len(chosen['experiences'])}/{len(experiences)}",
+        "skills": f"{len(chosen['skills'])}/{len(skills)}",
+        "certifications": f"{len(chosen['certifications'])}/{len(certifications)}",
+        "truncated": sum(len(v) for v in chosen.values())
+                     < len(experiences) + len(skills) + len(certifications),
+    }
+    return text, stats
@@ -0,0 +1,161 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.config import get_env
+from database.db import SessionLocal
+from database.models import SearchCache
+
+# === Logging Setup ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+# How long a cached search response stays valid
+DEFAULT_TTL_HOURS = float(get_env("HARVEST_CACHE_TTL_HOURS", 24))
+
+
+def normalize_search_params(params: dict) -> dict:
+    """
+    Normalize search parameters so equivalent searches share a cache entry.
+
+    Strings are trimmed, lowercased and whitespace-collapsed; empty values
+    are dropped.
+
+    Args:
+        params (dict): Harvest API query parameters.
+
+    Returns:
+        dict: Normalized parameters.
+    """
+    normalized = {}
+    for key, value in params.items():
+        if isinstance(value, str):
+            value = " ".join(value.split()).lower()
+        if value is None or value == "":
+            continue
+        normalized[key] = value
+    return normalized
+
+
+def search_cache_key(params: dict) -> str:
+    """
+    Build the cache key (SHA-256 hex digest) for a set of search parameters.
+    """
+    payload = json.dumps(normalize_search_params(params), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_search(params: dict, ttl_hours: float = None):
+    """
+    Look up a cached Harvest API response for these search parameters.
+
+    Args:
+        params (dict): Harvest API query parameters.
+        ttl_hours (float, optional): Max age of a usable entry. Defaults to HARVEST_CACHE_TTL_HOURS.
+
+    Returns:
+        dict or None: The cached response, or None on a miss/expired entry/DB error.
+    """
+    ttl_hours = DEFAULT_TTL_HOURS if ttl_hours is None else ttl_hours
+    if ttl_hours <= 0:
+        return None
+
+    db = SessionLocal()
+    try:
+        entry = (
+            db.query(SearchCache)
+            .filter(SearchCache.cache_key == search_cache_key(params))
+            .filter(SearchCache.created_at >= func.now() - timedelta(hours=ttl_hours))
+            .first()
+        )
+        if entry is None:
+            return None
+
+        logger.info(f"Search cache hit for parameters: {params}")
+        return entry.response
+
+    except SQLAlchemyError as e:
+        logger.warning(f"Search cache lookup failed: {e}")
+        return None
+
+    finally:
+        db.close()
+
+
+def store_search(params: dict, response: dict):
+    """
+    Save (or replace) the cached Harvest API response for these search parameters.
+
+    Responses without result elements (empty bodies, error payloads, pages
+    past the end) are not cached, so a transient empty result is not served
+    for the whole TTL. Errors are logged and swallowed; caching must never
+    break a search.
+
+    Args:
+        params (dict): Harvest API query parameters.
+        response (dict): Parsed JSON response to cache.
+    """
+    if not isinstance(response, dict) or not response.get("elements"):
+        logger.info(f"Not caching empty Harvest API response for parameters: {params}")
+        return
+
+    db = SessionLocal()
+    try:
+        stmt = insert(SearchCache).values(
+            cache_key=search_cache_key(params),
+            params=normalize_search_params(params),
+            response=response,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SearchCache.cache_key],
+            set_={"response": stmt.excluded.response, "created_at": func.now()},
+        )
+        db.execute(stmt)
+        db.commit()
+
+    except SQLAlchemyError as e:
+        logger.warning(f"Search cache store failed: {e}")
+        db.rollback()
+
+    finally:
+        db.close()
+
+
+def purge_expired_searches(ttl_hours: float = None) -> int:
+    """
+    Delete cache entries older than the TTL.
+
+    Returns:
+        int: Number of rows deleted.
+    """
+    ttl_hours = DEFAULT_TTL_HOURS if ttl_hours is None else ttl_hours
+    db = SessionLocal()
+    try:
+        deleted = (
+            db.query(SearchCache)
+            .filter(SearchCache.created_at < func.now() - timedelta(hours=ttl_hours))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        logger.info(f"Purged {deleted} expired search cache entries.")
+        return deleted
+
+    except SQLAlchemyError as e:
+        logger.exception(f"Failed to purge search cache: {e}")
+        db.rollback()
+        return 0
+
+    finally:
+        db.close()
@@ -1,9 +1,17 @@
 import os
+import glob
+import time
 import logging
-import pandas as pd
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 from config.config import get_env
-from utils.helpers import safe_parse_jsonish, coalesce
-from staffspy import LinkedInAccount
+from utils.helpers import safe_parse_jsonish, coalesce, extract_linkedin_id
+from utils.rate_limit import AdaptiveTokenBucket
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # === Logging Setup ===
 os.makedirs("logs", exist_ok=True)
@@ -16,20 +24,296 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Number of LinkedIn IDs sent per `scrape_users` call in batch mode
+DEFAULT_BATCH_SIZE = int(get_env("STAFFSPY_BATCH_SIZE", 10))
+
+# Error text / HTTP statuses that mean LinkedIn is throttling the session. Numeric
+# codes are only taken from a status attribute: bare digits in a message may be
+# part of an ID or a byte count.
+THROTTLE_MARKERS = ("too many requests", "rate limit", "throttl", "captcha", "challenge")
+THROTTLE_STATUSES = {429, 999}
+
+
+def _is_throttle_error(error: Exception) -> bool:
+    """
+    Guess whether a StaffSpy exception is a throttling signal from LinkedIn.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status in THROTTLE_STATUSES:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+
+class StaffSpyAccount:
+    """
+    One LinkedIn session plus the pacing state that belongs to it.
+
+    Each account has its own adaptive token bucket, a circuit breaker that
+    quarantines it when it starts failing, and an optional quota of profiles
+    per time window. Once the quota is used up the account cools down until
+    the window rolls over.
+    """
+
+    def __init__(self, name: str, account, quota: int = 0, quota_window_seconds: float = 3600):
+        self.name = name
+        self.account = account
+        self.quota = quota
+        self.quota_window_seconds = quota_window_seconds
+        self.in_flight = 0
+        self.scraped = 0
+        self._window_start = time.monotonic()
+        self._window_used = 0
+
+        # Profiles scraped per second; each ID in a batch costs one token
+        self.limiter = AdaptiveTokenBucket(
+            rate_per_sec=float(get_env("STAFFSPY_RATE_PER_SEC", 0.5)),
+            burst=float(get_env("STAFFSPY_BURST", DEFAULT_BATCH_SIZE)),
+            min_rate=float(get_env("STAFFSPY_MIN_RATE_PER_SEC", 0.02)),
+        )
+        self.breaker = CircuitBreaker(
+            f"staffspy:{name}",
+            failure_threshold=int(get_env("STAFFSPY_BREAKER_THRESHOLD", 5)),
+            reset_seconds=float(get_env("STAFFSPY_BREAKER_RESET_SECONDS", 300)),
+        )
+
+    def quota_left(self, now: float):
+        """
+        Profiles this account may still scrape in the current window (None if unlimited).
+        Caller holds the pool lock.
+        """
+        if not self.quota:
+            return None
+        if now - self._window_start >= self.quota_window_seconds:
+            self._window_start = now
+            self._window_used = 0
+        return self.quota - self._window_used
+
+    def cooldown_until(self):
+        """
+        Monotonic time at which an exhausted quota resets (None if not cooling down).
+        Caller holds the pool lock.
+        """
+        left = self.quota_left(time.monotonic())
+        if left is None or left > 0:
+            return None
+        return self._window_start + self.quota_window_seconds
+
+    def reserve(self, count: int) -> int:
+        """
+        Claim a call slot and up to `count` profiles of quota. Caller holds the pool lock.
+
+        Returns:
+            int: Profiles granted (less than `count` when the quota runs short).
+        """
+        left = self.quota_left(time.monotonic())
+        granted = count if left is None else max(0, min(count, left))
+        self.in_flight += 1
+        self._window_used += granted
+        return granted
+
+    def scrape(self, linkedin_ids):
+        """
+        Call `scrape_users` on this session, feeding the limiter and breaker.
+        """
+        self.limiter.acquire(len(linkedin_ids))
+        try:
+            df = self.account.scrape_users(user_ids=linkedin_ids)
+        except Exception as e:
+            if _is_throttle_error(e):
+                # Quarantine straight away once backoff can't slow us down any further
+                at_floor = self.limiter.rate <= self.limiter.min_rate
+                self.limiter.throttled()
+                self.breaker.record_failure(trip=at_floor)
+                logger.warning(f"StaffSpy account {self.name} throttled; rate lowered to {self.limiter.rate:.3f}/s")
+            else:
+                self.breaker.record_failure()
+            raise
+
+        self.limiter.succeeded()
+        self.breaker.record_success()
+        self.scraped += len(linkedin_ids)
+        return df
+
+    def stats(self) -> dict:
+        return {
+            "account": self.name,
+            **self.breaker.stats(),
+            "rate_per_sec": self.limiter.rate,
+            "throttles": self.limiter.throttles,
+            "in_flight": self.in_flight,
+            "scraped": self.scraped,
+            "quota": self.quota or None,
+            "quota_used": self._window_used if self.quota else None,
+        }
+
+
+def _session_files():
+    """
+    List the session files to load.
+
+    Every `*.pkl` in STAFFSPY_SESSION_DIR if it is set, otherwise just
+    STAFFSPY_SESSION_FILE.
+    """
+    session_dir = get_env("STAFFSPY_SESSION_DIR")
+    if session_dir:
+        return sorted(glob.glob(os.path.join(session_dir, "*.pkl")))
+    return [get_env("STAFFSPY_SESSION_FILE", "session.pkl")]
+
 
 class StaffSpyService:
     """
     Wrapper class around the StaffSpy LinkedIn scraper.
     
-    Loads a session file and fetches profile data using a LinkedIn ID.
+    Loads a pool of session files and fetches profile data using LinkedIn IDs.
+
+    Each `scrape_users` call is dispatched to the least-loaded available
+    account (round-robin among ties). Accounts are skipped while they are
+    quarantined by their circuit breaker or cooling down after using up
+    their quota. When no account is available no calls are made and
+    fetches return None, so callers fall back to the stale data they
+    already have.
     """
 
     def __init__(self):
-        # Load the session file path from environment variable or default
-        session_file = get_env("STAFFSPY_SESSION_FILE", "session.pkl")
+        # Imported here: staffspy pulls in pandas and its browser stack
+        from staffspy import LinkedInAccount
+
+        quota = int(get_env("STAFFSPY_ACCOUNT_QUOTA", 0))
+        quota_window = float(get_env("STAFFSPY_QUOTA_WINDOW_SECONDS", 3600))
+
+        self.accounts = []
+        for session_file in _session_files():
+            try:
+                # Initialize the LinkedInAccount object with session and log level
+                account = LinkedInAccount(session_file=session_file, log_level=1)
+            except Exception as e:
+                logger.exception(f"Failed to load StaffSpy session {session_file}: {e}")
+                continue
+            name = os.path.splitext(os.path.basename(session_file))[0]
+            self.accounts.append(StaffSpyAccount(name, account, quota, quota_window))
+
+        if not self.accounts:
+            raise RuntimeError("No StaffSpy session could be loaded (check STAFFSPY_SESSION_DIR/STAFFSPY_SESSION_FILE).")
+
+        logger.info(f"Loaded {len(self.accounts)} StaffSpy account(s): {[a.name for a in self.accounts]}")
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _acquire_account(self, count: int):
+        """
+        Pick and reserve an account for a call scraping up to `count` profiles.
+
+        An account with less quota left than `count` is still used, but only
+        for as many profiles as its quota allows.
+
+        Returns:
+            tuple[StaffSpyAccount, int] or tuple[None, 0]: The account and how
+            many profiles it was granted, or (None, 0) if none is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            n = len(self.accounts)
+            # Rotate the starting point so ties are broken round-robin
+            order = [self.accounts[(self._next + i) % n] for i in range(n)]
+            self._next = (self._next + 1) % n
+
+            candidates = []
+            for account in order:
+                left = account.quota_left(now)
+                if left is not None and left <= 0:
+                    continue
+                if account.breaker.is_open():
+                    continue
+                candidates.append(account)
+
+            # Least loaded first; sort is stable, so the rotation breaks ties
+            for account in sorted(candidates, key=lambda a: a.in_flight):
+                # allow() also claims the single trial call of a half-open breaker
+                if account.breaker.allow():
+                    return account, account.reserve(count)
+            return None, 0
+
+    def _release_account(self, account: StaffSpyAccount):
+        with self._lock:
+            account.in_flight -= 1
+
+    def _scrape(self, linkedin_ids):
+        """
+        Call `scrape_users` on the best available account(s).
+
+        A batch larger than the chosen account's remaining quota is split:
+        the account scrapes what its quota allows and the rest goes to the
+        next available account. If accounts run out part-way, or a later
+        part fails, the rows scraped so far are returned and the remaining
+        IDs are left out.
+
+        Args:
+            linkedin_ids (list[str]): IDs for one logical `scrape_users` call.
+
+        Returns:
+            pd.DataFrame or None: Whatever StaffSpy returned (concatenated if split).
+
+        Raises:
+            CircuitOpenError: If every account is quarantined or over quota; no call was made.
+            Exception: Whatever the first `scrape_users` call raised (nothing was scraped).
+        """
+        frames = []
+        remaining = list(linkedin_ids)
+        while remaining:
+            account, granted = self._acquire_account(len(remaining))
+            if account is None:
+                if not frames:
+                    raise CircuitOpenError("All StaffSpy accounts are quarantined or over quota; scraping paused")
+                logger.warning(f"StaffSpy quota exhausted; {len(remaining)} LinkedIn IDs left unscraped")
+                break
+
+            part, remaining = remaining[:granted], remaining[granted:]
+            try:
+                frames.append(account.scrape(part))
+            except Exception as e:
+                if not frames:
+                    raise
+                # Earlier parts already spent their quota; keep their rows
+                logger.exception(
+                    f"StaffSpy scrape failed after a split batch; returning {len(frames)} scraped part(s), "
+                    f"{len(part) + len(remaining)} LinkedIn IDs left unscraped: {e}"
+                )
+                break
+            finally:
+                self._release_account(account)
 
-        # Initialize the LinkedInAccount object with session and log level
-        self.account = LinkedInAccount(session_file=session_file, log_level=1)
+        frames = [df for df in frames if df is not None]
+        if len(frames) <= 1:
+            return frames[0] if frames else None
+
+        import pandas as pd  # already loaded by staffspy
+        return pd.concat(frames, ignore_index=True)
+
+    def is_paused(self) -> bool:
+        """
+        Check whether no account can currently take work.
+        """
+        with self._lock:
+            return all(
+                account.breaker.is_open() or account.cooldown_until() is not None
+                for account in self.accounts
+            )
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Per-account breaker state, transition counts, scrape rate and quota use.
+        """
+        with self._lock:
+            return {
+                "accounts": [account.stats() for account in self.accounts],
+                "available": sum(
+                    1 for account in self.accounts
+                    if not account.breaker.is_open() and account.cooldown_until() is None
+                ),
+            }
 
     def fetch_profile(self, linkedin_id: str):
         """
@@ -42,61 +326,180 @@ class StaffSpyService:
             dict or None: A normalized dictionary of profile data, or None on failure
         """
         try:
-            df: pd.DataFrame = self.account.scrape_users(user_ids=[linkedin_id])
+            df: pd.DataFrame = self._scrape([linkedin_id])
 
             if df is None or df.empty:
                 logger.warning(f"No data returned for LinkedIn ID: {linkedin_id}")
                 return None
 
             row = df.iloc[0].to_dict()
-
-            # Extract and normalize fields using fallback options where necessary
-            name = row.get("name")
-            first_name = row.get("first_name")
-            last_name = row.get("last_name")
-            location = row.get("location")
-            headline = coalesce(row.get("headline"), row.get("position"), row.get("current_position"))
-
-            company = coalesce(row.get("company"), row.get("current_company"))
-            past_company1 = coalesce(row.get("past_company1"), row.get("past_company_1"))
-            past_company2 = coalesce(row.get("past_company2"), row.get("past_company_2"))
-
-            school1 = coalesce(row.get("school1"), row.get("school_1"))
-            school2 = coalesce(row.get("school2"), row.get("school_2"))
-
-            # Handle skills field which could be JSONish or broken up
-            skills = safe_parse_jsonish(row.get("skills"))
-            if not skills:
-                tops = [
-                    row.get("top_skill_1"),
-                    row.get("top_skill_2"),
-                    row.get("top_skill_3")
-                ]
-                tops = [s for s in tops if s and str(s).strip()]
-                if tops:
-                    skills = tops  # fallback to simple list if present
-
-            experiences = safe_parse_jsonish(row.get("experiences"))
-            certifications = safe_parse_jsonish(row.get("certifications"))
-
             logger.info(f"Successfully fetched profile for LinkedIn ID: {linkedin_id}")
+            return _normalize_row(row)
 
-            return {
-                "name": name,
-                "first_name": first_name,
-                "last_name": last_name,
-                "location": location,
-                "headline": headline,
-                "company": company,
-                "past_company1": past_company1,
-                "past_company2": past_company2,
-                "school1": school1,
-                "school2": school2,
-                "skills": skills,
-                "experiences": experiences,
-                "certifications": certifications,
-            }
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping fetch for LinkedIn ID {linkedin_id}: {e}")
+            return None
 
         except Exception as e:
             logger.exception(f"StaffSpy fetch failed for LinkedIn ID {linkedin_id}: {e}")
             return None
+
+    def fetch_profiles(self, linkedin_ids, chunk_size: int = None):
+        """
+        Fetch many LinkedIn profiles, issuing one `scrape_users` call per chunk of IDs.
+
+        Chunks are spread over the account pool and fetched concurrently.
+
+        Args:
+            linkedin_ids (list[str]): LinkedIn user IDs to fetch.
+            chunk_size (int, optional): IDs per `scrape_users` call.
+                Defaults to STAFFSPY_BATCH_SIZE.
+
+        Returns:
+            dict: Mapping of each requested ID to its normalized profile dict,
+                  or None if it could not be fetched.
+        """
+        chunk_size = chunk_size or DEFAULT_BATCH_SIZE
+
+        # Preserve order while dropping duplicate IDs
+        ids = list(dict.fromkeys(i for i in linkedin_ids if i))
+        results = {i: None for i in ids}
+        chunks = [ids[start:start + chunk_size] for start in range(0, len(ids), chunk_size)]
+
+        def fetch_chunk(chunk):
+            try:
+                df: pd.DataFrame = self._scrape(chunk)
+            except CircuitOpenError as e:
+                logger.warning(f"Skipping batch of {len(chunk)} LinkedIn IDs: {e}")
+                return {}
+            except Exception as e:
+                logger.exception(f"StaffSpy batch fetch failed for {len(chunk)} IDs: {e}")
+                return {}
+
+            if df is None or df.empty:
+                logger.warning(f"No data returned for batch of {len(chunk)} LinkedIn IDs")
+                return {}
+
+            rows = df.to_dict(orient="records")
+            logger.info(f"Fetched {len(rows)} profiles in batch of {len(chunk)} LinkedIn IDs")
+            return {
+                linkedin_id: _normalize_row(row)
+                for linkedin_id, row in _match_rows_to_ids(chunk, rows).items()
+            }
+
+        # One chunk in flight per account, so throughput scales with the pool
+        workers = max(1, min(len(self.accounts), len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="staffspy") as executor:
+            for fetched in executor.map(fetch_chunk, chunks):
+                results.update(fetched)
+
+        return results
+
+
+def _row_linkedin_id(row: dict):
+    """
+    Work out which LinkedIn ID a StaffSpy result row belongs to.
+
+    Args:
+        row (dict): A single row from a `scrape_users` DataFrame.
+
+    Returns:
+        str or None: The LinkedIn ID, if it can be determined.
+    """
+    profile_id = coalesce(row.get("profile_id"), row.get("user_id"))
+    if profile_id:
+        return str(profile_id).strip()
+
+    link = coalesce(row.get("profile_link"), row.get("linkedin_url"))
+    if link:
+        return extract_linkedin_id(str(link))
+
+    return None
+
+
+def _match_rows_to_ids(ids, rows):
+    """
+    Map StaffSpy result rows back to the IDs that were requested.
+
+    Rows are matched on their own profile ID/link. If none of them carry a
+    usable ID but the counts line up, rows are matched to IDs by position.
+
+    Args:
+        ids (list[str]): The IDs sent in the `scrape_users` call.
+        rows (list[dict]): The rows returned.
+
+    Returns:
+        dict: Mapping of requested ID to its raw row.
+    """
+    wanted = {i.lower(): i for i in ids}
+    matched = {}
+
+    for row in rows:
+        row_id = _row_linkedin_id(row)
+        if row_id and row_id.lower() in wanted:
+            matched[wanted[row_id.lower()]] = row
+
+    if not matched and len(rows) == len(ids):
+        matched = dict(zip(ids, rows))
+
+    missing = [i for i in ids if i not in matched]
+    if missing:
+        logger.warning(f"No StaffSpy rows matched LinkedIn IDs: {missing}")
+
+    return matched
+
+
+def _normalize_row(row: dict):
+    """
+    Normalize a raw StaffSpy row to match our DB schema.
+
+    Args:
+        row (dict): A single row from a `scrape_users` DataFrame.
+
+    Returns:
+        dict: A normalized dictionary of profile data.
+    """
+    # Extract and normalize fields using fallback options where necessary
+    name = row.get("name")
+    first_name = row.get("first_name")
+    last_name = row.get("last_name")
+    location = row.get("location")
+    headline = coalesce(row.get("headline"), row.get("position"), row.get("current_position"))
+
+    company = coalesce(row.get("company"), row.get("current_company"))
+    past_company1 = coalesce(row.get("past_company1"), row.get("past_company_1"))
+    past_company2 = coalesce(row.get("past_company2"), row.get("past_company_2"))
+
+    school1 = coalesce(row.get("school1"), row.get("school_1"))
+    school2 = coalesce(row.get("school2"), row.get("school_2"))
+
+    # Handle skills field which could be JSONish or broken up
+    skills = safe_parse_jsonish(row.get("skills"))
+    if not skills:
+        tops = [
+            row.get("top_skill_1"),
+            row.get("top_skill_2"),
+            row.get("top_skill_3")
+        ]
+        tops = [s for s in tops if s and str(s).strip()]
+        if tops:
+            skills = tops  # fallback to simple list if present
+
+    experiences = safe_parse_jsonish(row.get("experiences"))
+    certifications = safe_parse_jsonish(row.get("certifications"))
+
+    return {
+        "name": name,
+        "first_name": first_name,
+        "last_name": last_name,
+        "location": location,
+        "headline": headline,
+        "company": company,
+        "past_company1": past_company1,
+        "past_company2": past_company2,
+        "school1": school1,
+        "school2": school2,
+        "skills": skills,
+        "experiences": experiences,
+        "certifications": certifications,
+    }
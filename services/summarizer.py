@@ -1,6 +1,15 @@
 import os
+import json
+import hashlib
 import logging
-import ollama
+import threading
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.config import get_env
+from database.db import SessionLocal
+from database.models import ProfileSummary, PROFILE_FIELDS
+from services.prompt_builder import build_profile_prompt, DEFAULT_TOKEN_BUDGET
 
 # === Logging Setup ===
 os.makedirs("logs", exist_ok=True)
@@ -13,13 +22,174 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Ollama model used for summaries
+SUMMARY_MODEL = get_env("OLLAMA_MODEL", "llama3")
+
+# Bump whenever the prompt changes so cached summaries are regenerated
+PROMPT_VERSION = "2"
+
+# The token budget decides what goes into the prompt, so it is part of the
+# version summaries are cached under (changing SUMMARY_TOKEN_BUDGET regenerates them)
+CACHE_PROMPT_VERSION = f"{PROMPT_VERSION}-budget{DEFAULT_TOKEN_BUDGET}"
+
+# Ollama client, created on first use so importing this module stays cheap
+_ollama_client = None
+_ollama_lock = threading.Lock()
+
+
+def get_ollama_client():
+    """
+    Return the process-wide Ollama client, creating it on first use.
+
+    The host comes from OLLAMA_HOST (the client's default if unset).
+    """
+    global _ollama_client
+    if _ollama_client is None:
+        with _ollama_lock:
+            if _ollama_client is None:
+                import ollama
+                _ollama_client = ollama.Client(host=get_env("OLLAMA_HOST") or None)
+    return _ollama_client
+
+
+def summary_content_hash(profile_data: dict, model: str = None, prompt_version: str = None) -> str:
+    """
+    Hash the profile's content fields together with the model and prompt version
+    (which includes the prompt token budget).
+
+    Metadata such as `profile_id` or `last_updated` is ignored, so a refresh
+    that returns identical data keeps the same hash.
+
+    Args:
+        profile_data (dict): A dictionary of profile fields.
+        model (str, optional): Model name. Defaults to OLLAMA_MODEL.
+        prompt_version (str, optional): Prompt version. Defaults to CACHE_PROMPT_VERSION.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    payload = json.dumps(
+        {
+            "content": {field: profile_data.get(field) for field in PROFILE_FIELDS},
+            "model": model or SUMMARY_MODEL,
+            "prompt_version": prompt_version or CACHE_PROMPT_VERSION,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_summary(content_hash: str):
+    """
+    Look up a previously generated summary.
+
+    Args:
+        content_hash (str): Hash from `summary_content_hash`.
+
+    Returns:
+        str or None: The cached summary, or None on a miss/DB error.
+    """
+    db = SessionLocal()
+    try:
+        entry = db.get(ProfileSummary, content_hash)
+        return entry.summary if entry else None
+    except SQLAlchemyError as e:
+        logger.warning(f"Summary cache lookup failed: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def store_summary(content_hash: str, summary: str):
+    """
+    Persist a generated summary. Errors are logged and swallowed.
+
+    Args:
+        content_hash (str): Hash from `summary_content_hash`.
+        summary (str): Generated summary text.
+    """
+    db = SessionLocal()
+    try:
+        stmt = insert(ProfileSummary).values(
+            content_hash=content_hash,
+            model=SUMMARY_MODEL,
+            prompt_version=CACHE_PROMPT_VERSION,
+            summary=summary,
+        ).on_conflict_do_nothing(index_elements=[ProfileSummary.content_hash])
+        db.execute(stmt)
+        db.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"Summary cache store failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _build_messages(profile_data: dict) -> list:
+    """
+    Build the chat messages asking the model to summarize a profile.
+
+    Args:
+        profile_data (dict): A dictionary of profile fields.
+
+    Returns:
+        list[dict]: System and user messages for `ollama.chat`.
+    """
+    full_text, stats = build_profile_prompt(profile_data)
+    logger.info(f"Summary prompt stats: {stats}")
+
+    return [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that summarizes LinkedIn profiles."
+        },
+        {
+            "role": "user",
+            "content": f"Summarize this LinkedIn profile:\n\n{full_text}"
+        }
+    ]
+
 
-def summarize_profile(profile_data: dict) -> str:
+def generate_summary(profile_data: dict, content_hash: str = None, chat=None) -> str:
+    """
+    Generate a summary with the model and store it in the summary cache.
+
+    Unlike `summarize_profile`, errors are raised rather than turned into text.
+
+    Args:
+        profile_data (dict): A dictionary of profile fields.
+        content_hash (str, optional): Precomputed `summary_content_hash`.
+        chat (callable, optional): Chat backend with the `ollama.chat` signature.
+            Defaults to the shared Ollama client.
+
+    Returns:
+        str: The generated summary.
+    """
+    content_hash = content_hash or summary_content_hash(profile_data)
+    chat = chat or get_ollama_client().chat
+
+    # Call the local Ollama model
+    response = chat(model=SUMMARY_MODEL, messages=_build_messages(profile_data))
+
+    summary = response["message"]["content"].strip()
+    logger.info("Profile summarized successfully.")
+    store_summary(content_hash, summary)
+    return summary
+
+
+def summarize_profile(profile_data: dict, chat=None) -> str:
     """
     Summarize a LinkedIn-style profile using a local LLaMA3 model via Ollama.
 
+    Summaries are cached by a hash of the profile content, model name and
+    prompt version (including the token budget), and only regenerated when
+    one of those changes.
+
     Args:
         profile_data (dict): A dictionary of profile fields (name, company, skills, etc.)
+        chat (callable, optional): Chat backend with the `ollama.chat` signature.
+            Defaults to the shared Ollama client.
 
     Returns:
         str: A natural language summary of the profile, or an error message.
@@ -28,34 +198,63 @@ def summarize_profile(profile_data: dict) -> str:
         logger.warning("No profile data provided for summarization.")
         return "No profile data available to summarize."
 
-    # Convert the dict to a human-readable text block
-    text_parts = []
-    for key, value in profile_data.items():
-        if value:
-            text_parts.append(f"{key.replace('_', ' ').title()}: {value}")
-
-    full_text = "\n".join(text_parts)
+    content_hash = summary_content_hash(profile_data)
+    cached = get_cached_summary(content_hash)
+    if cached:
+        logger.info("Using cached profile summary.")
+        return cached
 
     try:
-        # Call the local Ollama model
-        response = ollama.chat(
-            model="llama3",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that summarizes LinkedIn profiles."
-                },
-                {
-                    "role": "user",
-                    "content": f"Summarize this LinkedIn profile:\n\n{full_text}"
-                }
-            ]
-        )
-
-        summary = response["message"]["content"].strip()
-        logger.info("Profile summarized successfully.")
-        return summary
+        return generate_summary(profile_data, content_hash, chat)
 
     except Exception as e:
         logger.exception(f"Failed to summarize profile: {e}")
         return f"⚠️ Summarization failed: {e}"
+
+
+def stream_profile_summary(profile_data: dict, chat=None):
+    """
+    Streaming variant of `summarize_profile` that yields text as it is generated.
+
+    A cached summary is yielded in one piece; otherwise tokens are yielded
+    as the model produces them and the full summary is cached at the end.
+
+    Args:
+        profile_data (dict): A dictionary of profile fields.
+        chat (callable, optional): Chat backend with the `ollama.chat` signature
+            supporting `stream=True`. Defaults to the shared Ollama client.
+
+    Yields:
+        str: Summary text chunks (or a single error message).
+    """
+    if not profile_data:
+        logger.warning("No profile data provided for summarization.")
+        yield "No profile data available to summarize."
+        return
+
+    content_hash = summary_content_hash(profile_data)
+    cached = get_cached_summary(content_hash)
+    if cached:
+        logger.info("Using cached profile summary.")
+        yield cached
+        return
+
+    chat = chat or get_ollama_client().chat
+    parts = []
+
+    try:
+        for chunk in chat(model=SUMMARY_MODEL, messages=_build_messages(profile_data), stream=True):
+            token = chunk["message"]["content"]
+            if token:
+                parts.append(token)
+                yield token
+
+    except Exception as e:
+        logger.exception(f"Failed to stream profile summary: {e}")
+        yield f"\n\n⚠️ Summarization failed: {e}"
+        return
+
+    summary = "".join(parts).strip()
+    if summary:
+        logger.info("Profile summary streamed successfully.")
+        store_summary(content_hash, summary)
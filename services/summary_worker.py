@@ -0,0 +1,232 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from sqlalchemy import func, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.config import get_env
+from database.db import SessionLocal
+from database.models import Profile, SummaryJob
+from services.profile_schema import conform_profile_fields
+from services.summarizer import summary_content_hash, get_cached_summary, generate_summary
+
+# === Logging Setup ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# A pending/running job untouched for this long is treated as orphaned (its process died)
+STALE_JOB_SECONDS = int(get_env("SUMMARY_JOB_STALE_SECONDS", 600))
+
+
+def _set_job_status(content_hash: str, status: str, linkedin_id: str = None, error: str = None):
+    """
+    Upsert the persisted state of a summary job. Errors are logged and swallowed.
+    """
+    db = SessionLocal()
+    try:
+        values = {"content_hash": content_hash, "status": status, "error": error}
+        if linkedin_id:
+            values["linkedin_id"] = linkedin_id
+
+        stmt = insert(SummaryJob).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SummaryJob.content_hash],
+            set_={
+                **{k: stmt.excluded[k] for k in values if k != "content_hash"},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to persist summary job {content_hash} as {status}: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _get_job_status(content_hash: str):
+    """
+    Returns:
+        tuple[str, str, bool] or None: Persisted (status, error, stale) for the
+        job, if any; `stale` means it was last updated over STALE_JOB_SECONDS ago.
+    """
+    db = SessionLocal()
+    try:
+        stale = SummaryJob.updated_at < func.now() - timedelta(seconds=STALE_JOB_SECONDS)
+        job = (
+            db.query(SummaryJob.status, SummaryJob.error, stale.label("stale"))
+            .filter(SummaryJob.content_hash == content_hash)
+            .first()
+        )
+        return (job.status, job.error, job.stale) if job else None
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to read summary job {content_hash}: {e}")
+        return None
+    finally:
+        db.close()
+
+
+class SummaryWorkerPool:
+    """
+    Background pool that generates profile summaries off the render path.
+
+    Profiles are enqueued after fetch/refresh (by the bulk job worker, or by
+    the UI); a bounded number of worker threads generate the summaries (which
+    land in the summary cache), and each job's state is persisted in
+    `summary_jobs` so the UI can poll it, also for jobs run by another process.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or int(get_env("SUMMARY_WORKERS", 2))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="summary")
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    def enqueue(self, profile_data: dict):
+        """
+        Queue a profile for summarization unless it is already cached or queued.
+
+        Args:
+            profile_data (dict): A dictionary of profile fields.
+
+        Returns:
+            str or None: The job's content hash, or None for empty input.
+        """
+        if not profile_data:
+            return None
+
+        content_hash = summary_content_hash(profile_data)
+
+        with self._lock:
+            if content_hash in self._inflight:
+                return content_hash
+            self._inflight.add(content_hash)
+
+        if get_cached_summary(content_hash):
+            with self._lock:
+                self._inflight.discard(content_hash)
+            return content_hash
+
+        _set_job_status(content_hash, PENDING, linkedin_id=profile_data.get("linkedin_id"))
+        self._executor.submit(self._run, content_hash, dict(profile_data))
+        return content_hash
+
+    def enqueue_many(self, profiles):
+        """
+        Queue several profiles; None entries are skipped.
+
+        Returns:
+            list[str]: Content hashes of the queued profiles.
+        """
+        return [h for h in (self.enqueue(p) for p in profiles if p) if h]
+
+    def _run(self, content_hash: str, profile_data: dict):
+        try:
+            _set_job_status(content_hash, RUNNING)
+            generate_summary(profile_data, content_hash)
+            _set_job_status(content_hash, DONE)
+        except Exception as e:
+            logger.exception(f"Background summary failed for {content_hash}: {e}")
+            _set_job_status(content_hash, FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self._inflight.discard(content_hash)
+
+    def status(self, profile_data: dict):
+        """
+        Report where a profile's summary stands.
+
+        Args:
+            profile_data (dict): A dictionary of profile fields.
+
+        Returns:
+            tuple[str, str or None]: (status, summary-or-error). Status is one of
+            done/pending/running/failed, or None if the profile was never enqueued.
+        """
+        content_hash = summary_content_hash(profile_data)
+
+        summary = get_cached_summary(content_hash)
+        if summary:
+            return DONE, summary
+
+        with self._lock:
+            queued = content_hash in self._inflight
+
+        job = _get_job_status(content_hash)
+        if job:
+            status, error, stale = job
+            # Another process (e.g. worker.py) may own it; only a stale one was orphaned
+            if status in (PENDING, RUNNING) and not queued and stale:
+                return None, None
+            return status, error
+
+        return (PENDING, None) if queued else (None, None)
+
+    def requeue_unfinished(self) -> int:
+        """
+        Re-enqueue jobs left over from a previous process: failed ones, and
+        pending/running ones untouched for STALE_JOB_SECONDS (fresher ones
+        may still belong to a live process). Called at worker startup.
+
+        Returns:
+            int: Number of jobs re-enqueued.
+        """
+        db = SessionLocal()
+        try:
+            stale = SummaryJob.updated_at < func.now() - timedelta(seconds=STALE_JOB_SECONDS)
+            rows = (
+                db.query(Profile)
+                .join(SummaryJob, SummaryJob.linkedin_id == Profile.linkedin_id)
+                .filter(or_(
+                    SummaryJob.status == FAILED,
+                    and_(SummaryJob.status.in_([PENDING, RUNNING]), stale),
+                ))
+                .all()
+            )
+            # Same shape as the profile dicts the UI hashes, so the job keys match
+            profiles = [
+                conform_profile_fields({c.name: getattr(p, c.name) for c in p.__table__.columns})
+                for p in rows
+            ]
+        except SQLAlchemyError as e:
+            logger.exception(f"Failed to load unfinished summary jobs: {e}")
+            return 0
+        finally:
+            db.close()
+
+        queued = self.enqueue_many(profiles)
+        logger.info(f"Re-enqueued {len(queued)} unfinished summary jobs.")
+        return len(queued)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_summary_pool() -> SummaryWorkerPool:
+    """
+    Return the process-wide summary worker pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SummaryWorkerPool()
+    return _pool
@@ -0,0 +1,85 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Modules app.py / main.py / worker.py import before any user action
+STARTUP_MODULES = [
+    "config.config",
+    "database.db",
+    "database.models",
+    "services.harvest_api",
+    "services.profile_service",
+    "services.bulk_service",
+    "services.export_service",
+    "services.job_queue",
+    "services.summarizer",
+    "services.summary_worker",
+    "utils.helpers",
+]
+
+# Heavy dependencies that must only be imported on first use
+DEFERRED_MODULES = ["pandas", "staffspy", "ollama", "pyarrow"]
+
+# Run in a fresh interpreter so nothing is already cached in sys.modules
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed_ms, "loaded": [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+
+def measure(runs: int):
+    """
+    Time a cold import of STARTUP_MODULES in `runs` fresh interpreters.
+
+    Returns:
+        tuple[list[float], list[str]]: Per-run times in ms, and any deferred
+        modules that were imported anyway.
+    """
+    code = PROBE.format(modules=STARTUP_MODULES, deferred=DEFERRED_MODULES)
+    times, loaded = [], set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result["ms"])
+        loaded.update(result["loaded"])
+    return times, sorted(loaded)
+
+
+def main():
+    """
+    Check that importing the app's service layer stays within a startup budget
+    and does not pull in pandas, staffspy, ollama or pyarrow.
+
+    Exits non-zero when the median import time exceeds the budget or a
+    deferred module was imported.
+    """
+    parser = argparse.ArgumentParser(description="Measure cold-start import time.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--budget-ms", type=float, default=750, help="Max median import time in ms")
+    args = parser.parse_args()
+
+    times, loaded = measure(args.runs)
+    median = statistics.median(times)
+    print(f"Cold import of {len(STARTUP_MODULES)} modules: median {median:.0f} ms "
+          f"(min {min(times):.0f}, max {max(times):.0f}) over {args.runs} runs; budget {args.budget_ms:.0f} ms")
+
+    failed = False
+    if loaded:
+        print(f"❌ Deferred modules imported at startup: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget_ms:
+        print("❌ Startup budget exceeded")
+        failed = True
+    if not failed:
+        print("✅ Within startup budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
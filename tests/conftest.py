@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the app's packages (config, database, services, utils) from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,39 @@
+import time
+import random
+
+from services import bulk_service
+
+
+def test_results_come_back_in_input_order(monkeypatch):
+    def fake_fetch_batch(urls, freshness_days, limiter=None):
+        # Later batches often finish first
+        time.sleep(random.uniform(0, 0.02))
+        return [{"url": url, "profile": {"url": url}, "error": None} for url in urls]
+
+    monkeypatch.setattr(bulk_service, "_fetch_batch", fake_fetch_batch)
+    urls = [f"https://www.linkedin.com/in/p{i}" for i in range(57)]
+
+    progress = []
+    results = list(bulk_service.fetch_profiles_from_urls(
+        iter(urls), freshness_days=30, max_workers=4, rate_limit=0, batch_size=5,
+        progress_callback=lambda done, total, entry: progress.append(done),
+    ))
+
+    assert [r["url"] for r in results] == urls
+    assert [r["index"] for r in results] == list(range(len(urls)))
+    assert progress == list(range(1, len(urls) + 1))
+
+
+def test_a_failing_url_does_not_affect_the_others(monkeypatch):
+    def fake_get_or_refresh_profile(url, freshness_days=30, limiter=None):
+        if url.endswith("bad"):
+            raise RuntimeError("boom")
+        return {"url": url}
+
+    monkeypatch.setattr(bulk_service, "get_or_refresh_profile", fake_get_or_refresh_profile)
+    urls = ["https://www.linkedin.com/in/good", "https://www.linkedin.com/in/bad"]
+
+    results = list(bulk_service.fetch_profiles_from_urls(urls, 30, max_workers=2, rate_limit=0, batch_size=1))
+
+    assert [r["error"] for r in results] == [None, "boom"]
+    assert results[0]["profile"] == {"url": urls[0]}
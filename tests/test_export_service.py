@@ -0,0 +1,59 @@
+from sqlalchemy.dialects import postgresql
+
+from database.models import Profile
+from services import export_service
+from utils.helpers import ilike_contains
+
+
+def _compile(expr):
+    compiled = expr.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def test_like_wildcards_in_the_filter_are_escaped():
+    sql, params = _compile(ilike_contains(Profile.company, "100%_Remote!"))
+    assert "ESCAPE '!'" in sql
+    assert list(params.values()) == ["%100!%!_Remote!!%"]
+
+
+def test_flatten_profile_joins_skills_and_experiences():
+    row = export_service.flatten_profile({
+        "profile_id": 1,
+        "skills": [{"name": "Python"}, {"name": "SQL"}],
+        "experiences": [{"title": "Engineer", "company": "Acme"}],
+        "certifications": [{"title": "AWS SA", "issuer": "Amazon"}],
+        "last_updated": None,
+    })
+    assert row["skills"] == "Python; SQL"
+    assert row["skill_count"] == 2
+    assert row["certifications"] == "AWS SA (Amazon)"
+    assert row["experience1_title"] == "Engineer"
+    assert row["experience2_title"] is None
+    assert set(row) == set(export_service.EXPORT_COLUMNS)
+
+
+class RecordingSession:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, stmt):
+        self.log.append(stmt.compile(dialect=postgresql.dialect()).params)
+        return []
+
+    def close(self):
+        pass
+
+
+def test_profiles_listed_in_several_url_chunks_are_requested_once(monkeypatch):
+    log = []
+    monkeypatch.setattr(export_service, "SessionLocal", lambda: RecordingSession(log))
+    urls = [
+        "https://www.linkedin.com/in/a", "https://www.linkedin.com/in/b",
+        "linkedin.com/in/A/", "https://www.linkedin.com/in/c",
+        "https://www.linkedin.com/in/b", "https://www.linkedin.com/in/a",
+    ]
+
+    list(export_service.iter_profiles(urls=urls, batch_size=2))
+
+    requested = [ids for params in log for ids in params.values() if isinstance(ids, list)]
+    assert requested == [["a", "b"], ["c"]]
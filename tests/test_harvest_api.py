@@ -0,0 +1,198 @@
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from services.harvest_api import HarvestAPI, AsyncHarvestAPI, _backoff_delay
+
+
+class StubHarvest:
+    """
+    Local HTTP server that replays scripted (status, headers, body) responses.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(self.path)
+                status, headers, body = stub.responses.pop(0)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/linkedin/profile-search"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+PAGE = {"elements": [{"linkedinUrl": "https://www.linkedin.com/in/jane-doe"}]}
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("HARVEST_API_KEY", "test-key")
+
+
+@pytest.fixture
+def stub(request):
+    server = StubHarvest(request.param)
+    yield server
+    server.close()
+
+
+def _client(cls, url):
+    return cls(base_url=url, max_retries=3, backoff_seconds=0.01, max_backoff_seconds=1)
+
+
+@pytest.mark.parametrize("stub", [[
+    (503, {}, {}),
+    (429, {"Retry-After": "0"}, {}),
+    (200, {}, PAGE),
+]], indirect=True)
+def test_retries_throttled_and_failed_calls(stub):
+    result = _client(HarvestAPI, stub.url).search_profiles("Jane Doe", use_cache=False)
+    assert result == PAGE
+    assert len(stub.requests) == 3
+
+
+@pytest.mark.parametrize("stub", [[
+    (429, {"Retry-After": "0.3"}, {}),
+    (200, {}, PAGE),
+]], indirect=True)
+def test_waits_out_retry_after(stub):
+    started = time.monotonic()
+    result = _client(HarvestAPI, stub.url).search_profiles("Jane Doe", use_cache=False)
+    assert result == PAGE
+    assert time.monotonic() - started >= 0.3
+
+
+@pytest.mark.parametrize("stub", [[
+    (429, {"Retry-After": "120"}, {}),
+    (200, {}, PAGE),
+]], indirect=True)
+def test_gives_up_when_retry_after_exceeds_max_backoff(stub):
+    started = time.monotonic()
+    with pytest.raises(requests.HTTPError):
+        _client(HarvestAPI, stub.url).search_profiles("Jane Doe", use_cache=False)
+    assert len(stub.requests) == 1
+    assert time.monotonic() - started < 1
+
+
+@pytest.mark.parametrize("stub", [[
+    (500, {}, {}),
+    (500, {}, {}),
+    (500, {}, {}),
+    (500, {}, {}),
+]], indirect=True)
+def test_raises_after_max_retries(stub):
+    with pytest.raises(requests.HTTPError):
+        _client(HarvestAPI, stub.url).search_profiles("Jane Doe", use_cache=False)
+    assert len(stub.requests) == 4
+
+
+@pytest.mark.parametrize("stub", [[
+    (429, {"Retry-After": "0"}, {}),
+    (200, {}, PAGE),
+]], indirect=True)
+def test_async_client_retries(stub):
+    async def run():
+        async with _client(AsyncHarvestAPI, stub.url) as api:
+            return await api.search_profiles("Jane Doe", use_cache=False)
+
+    assert asyncio.run(run()) == PAGE
+    assert len(stub.requests) == 2
+
+
+@pytest.mark.parametrize("stub", [[
+    (429, {"Retry-After": "120"}, {}),
+]], indirect=True)
+def test_async_client_gives_up_on_long_retry_after(stub):
+    async def run():
+        async with _client(AsyncHarvestAPI, stub.url) as api:
+            return await api.search_profiles("Jane Doe", use_cache=False)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+
+def test_backoff_never_undercuts_retry_after():
+    assert _backoff_delay(0, base=0.01, cap=1, retry_after=5) == 5
+    assert 0 <= _backoff_delay(10, base=0.5, cap=2) <= 2
+
+
+class PagedHarvest(AsyncHarvestAPI):
+    """
+    AsyncHarvestAPI whose pages come from memory; records which pages were requested.
+    """
+
+    def __init__(self, total, page_size=10):
+        self.total = total
+        self.page_size = page_size
+        self.pages = []
+
+    async def search_profiles(self, name, current_company=None, past_company=None,
+                              school=None, location=None, page=1, use_cache=True):
+        self.pages.append(page)
+        first = (page - 1) * self.page_size
+        ids = range(first, min(first + self.page_size, self.total))
+        return {"elements": [{"linkedinUrl": f"https://www.linkedin.com/in/p{i}"} for i in ids]}
+
+
+def _search(api, **kwargs):
+    return asyncio.run(api.search_many_pages("Jane Doe", **kwargs))
+
+
+def test_first_page_alone_when_it_covers_max_show():
+    api = PagedHarvest(total=100)
+    assert len(_search(api, max_pages=5, max_show=5, concurrency=3)) == 5
+    assert api.pages == [1]
+
+
+def test_fans_out_only_the_pages_still_needed():
+    api = PagedHarvest(total=100)
+    assert len(_search(api, max_pages=5, max_show=25, concurrency=3)) == 25
+    assert sorted(api.pages) == [1, 2, 3]
+
+
+def test_stops_at_the_last_page_of_results():
+    api = PagedHarvest(total=15)
+    assert len(_search(api, start_page=1, max_pages=5, max_show=50, concurrency=2)) == 15
+    assert sorted(api.pages) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("stub", [[(200, {}, PAGE), (200, {}, PAGE)]], indirect=True)
+def test_multi_page_search_reuses_one_client(stub, monkeypatch):
+    from services import harvest_api
+
+    monkeypatch.setattr(AsyncHarvestAPI, "BASE_URL", stub.url)
+    monkeypatch.setattr(harvest_api, "get_cached_search", lambda params: None)
+    monkeypatch.setattr(harvest_api, "store_search", lambda params, result: None)
+
+    first = harvest_api.search_profiles_multi_page(name="Jane Doe", max_pages=1, max_show=5)
+    _, client = harvest_api.get_async_harvest_api()
+    second = harvest_api.search_profiles_multi_page(name="John Roe", max_pages=1, max_show=5)
+
+    assert first == second == PAGE["elements"]
+    assert harvest_api.get_async_harvest_api()[1] is client
+    assert len(stub.requests) == 2
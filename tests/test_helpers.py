@@ -0,0 +1,78 @@
+import ast
+import json
+from datetime import date, datetime
+
+import pytest
+
+from utils.helpers import (
+    canonicalize_linkedin_url, extract_linkedin_id, extract_profile_link,
+    _python_repr_to_json, safe_parse_jsonish,
+)
+
+MEMBER_ID = "ACoAABcDeFgHiJkLmNoPqRsTuVwXyZ0123456789"
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/in/sonupatel-a-l/",
+    "http://linkedin.com/in/Sonupatel-A-L",
+    "linkedin.com/in/sonupatel-a-l?utm_source=share#top",
+    "https://in.linkedin.com/in/sonupatel-a-l/en",
+    "https://www.linkedin.com/in/sonupatel-a-l/details/skills/",
+    "www.linkedin.com/pub/SONUPATEL-A-L",
+    "  Sonupatel-A-L  ",
+])
+def test_vanity_slugs_are_canonicalized_and_lowercased(url):
+    assert extract_linkedin_id(url) == "sonupatel-a-l"
+    assert canonicalize_linkedin_url(url) == "https://www.linkedin.com/in/sonupatel-a-l"
+
+
+def test_percent_encoded_slugs_are_decoded_and_re_encoded():
+    url = "https://www.linkedin.com/in/J%C3%BCrgen-M%C3%BCller/"
+    assert extract_linkedin_id(url) == "jürgen-müller"
+    assert canonicalize_linkedin_url(url) == "https://www.linkedin.com/in/j%C3%BCrgen-m%C3%BCller"
+
+
+@pytest.mark.parametrize("url", [
+    f"https://www.linkedin.com/in/{MEMBER_ID}",
+    f"linkedin.com/in/{MEMBER_ID}/?miniProfileUrn=x",
+    MEMBER_ID,
+])
+def test_member_urn_ids_keep_their_case(url):
+    assert extract_linkedin_id(url) == MEMBER_ID
+    assert canonicalize_linkedin_url(url) == f"https://www.linkedin.com/in/{MEMBER_ID}"
+
+
+def test_profile_link_prefers_the_public_identifier():
+    element = {"linkedinUrl": f"https://www.linkedin.com/in/{MEMBER_ID}", "publicIdentifier": "Jane-Doe"}
+    assert extract_profile_link(element) == "https://www.linkedin.com/in/jane-doe"
+    assert extract_profile_link({"linkedinUrl": f"https://www.linkedin.com/in/{MEMBER_ID}"}) == \
+        f"https://www.linkedin.com/in/{MEMBER_ID}"
+    assert extract_profile_link({"name": "No link"}) is None
+
+
+@pytest.mark.parametrize("value", [
+    [{"name": "O'Brien & Co"}],
+    [{"name": 'He said "hi"'}],
+    [{"name": "it's \"both\""}],
+    [{"path": "C:\\Users\\jane", "tab": "a\tb", "nl": "line\nbreak"}],
+    [{"note": "None of True or False (yet)", "flag": True, "none": None}],
+    [{"unicode": "Zürich \u2013 caf\xe9", "ctrl": "\x00\x1f"}],
+    {"nested": [[1, -2.5], {"k": ""}], "empty": ""},
+])
+def test_python_reprs_are_rewritten_to_equivalent_json(value):
+    text = repr(value)
+    assert json.loads(_python_repr_to_json(text)) == ast.literal_eval(text)
+    assert safe_parse_jsonish(text) == value
+
+
+def test_date_calls_are_rewritten_without_the_ast_fallback():
+    value = [{"start": date(2020, 1, 5), "end": datetime(2021, 2, 3, 4, 5), "title": "date(2020, 1, 1)"}]
+    expected = [{"start": "2020-01-05", "end": "2021-02-03T04:05:00", "title": "date(2020, 1, 1)"}]
+    assert json.loads(_python_repr_to_json(repr(value))) == expected
+    assert safe_parse_jsonish(repr(value)) == expected
+
+
+@pytest.mark.parametrize("text", ["[(1, 2)]", "[{'a': set()}]", "[os.system('x')]"])
+def test_other_parentheses_are_left_to_the_ast_tier(text):
+    with pytest.raises(ValueError):
+        _python_repr_to_json(text)
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services import job_queue
+
+
+@pytest.fixture
+def paused(monkeypatch):
+    staffspy = SimpleNamespace(is_paused=lambda: True, stats=lambda: {})
+    monkeypatch.setattr(job_queue, "get_staffspy", lambda: staffspy)
+    monkeypatch.setattr(job_queue, "process_batch", lambda *args: pytest.fail("claimed items while paused"))
+
+
+def test_once_exits_while_paused_when_the_queue_is_empty(paused, monkeypatch):
+    monkeypatch.setattr(job_queue, "has_claimable_items", lambda: False)
+    monkeypatch.setattr(job_queue.time, "sleep", lambda s: pytest.fail("slept on an empty queue"))
+
+    job_queue.run_worker(poll_seconds=0, once=True)
+
+
+def test_once_waits_out_a_pause_while_items_are_queued(paused, monkeypatch):
+    checks = iter([True, True, False])
+    sleeps = []
+    monkeypatch.setattr(job_queue, "has_claimable_items", lambda: next(checks))
+    monkeypatch.setattr(job_queue.time, "sleep", sleeps.append)
+
+    job_queue.run_worker(poll_seconds=0, once=True)
+
+    assert len(sleeps) == 2
+
+
+class ClaimSession:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, stmt):
+        self.log.append("execute")
+        return SimpleNamespace(all=lambda: [])
+
+    def commit(self):
+        self.log.append("commit")
+
+    def rollback(self):
+        self.log.append("rollback")
+
+    def close(self):
+        self.log.append("close")
+
+
+def test_an_empty_poll_closes_its_session(monkeypatch):
+    log = []
+    monkeypatch.setattr(job_queue, "SessionLocal", lambda: ClaimSession(log))
+
+    assert job_queue.process_batch() == 0
+    assert log[-2:] == ["commit", "close"]
@@ -0,0 +1,149 @@
+import re
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from services import local_search
+
+SCHEMA = Path(__file__).resolve().parent.parent / "database" / "schema.sql"
+
+
+class RecordingSession:
+    def __init__(self, log, rows):
+        self.log = log
+        self.rows = rows
+
+    def execute(self, stmt):
+        self.log.append(stmt)
+        return SimpleNamespace(all=lambda: self.rows)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _normalize(sql):
+    return re.sub(r"\s+", "", sql.replace("profiles.", ""))
+
+
+def _local(url, name="Jane Doe"):
+    return {"linkedinUrl": url, "name": name, "source": "local"}
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    log = []
+    row = SimpleNamespace(linkedin_url="https://www.linkedin.com/in/jane", linkedin_id="jane",
+                          name="Jane Doe", headline=None, company="Acme", location=None, score=1.4)
+    monkeypatch.setattr(local_search, "SessionLocal", lambda: RecordingSession(log, [row]))
+    return log
+
+
+def test_search_document_matches_the_schema_index():
+    schema = SCHEMA.read_text()
+    index = re.search(r"CREATE INDEX IF NOT EXISTS ix_profiles_name_tsv ON profiles USING GIN \((.*?)\);",
+                      schema, re.S)
+    assert index is not None
+    assert _normalize(index.group(1)) == _normalize(local_search.SEARCH_DOCUMENT)
+
+
+def test_search_matches_the_name_only_and_escapes_filters(executed):
+    hits = local_search.search_local_profiles("Jane Doe", current_company="100%", limit=5)
+
+    sql = str(executed[0].compile(dialect=postgresql.dialect()))
+    assert "profiles.name %% " in sql
+    assert local_search.SEARCH_DOCUMENT + " @@ plainto_tsquery('simple'" in sql
+    assert "headline" not in sql.split("WHERE", 1)[1]
+    assert "ESCAPE '!'" in sql
+    assert hits == [{
+        "linkedinUrl": "https://www.linkedin.com/in/jane", "publicIdentifier": "jane", "name": "Jane Doe",
+        "headline": None, "company": "Acme", "location": None, "score": 1.4, "source": "local",
+    }]
+
+
+def test_headline_and_skill_filters_use_their_indexes_and_page_with_offset(executed):
+    local_search.search_local_profiles("Jane Doe", headline="Data", skill="SQL", limit=5, offset=10)
+
+    compiled = executed[0].compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "profiles.headline ILIKE " in sql
+    assert "profiles.skills @> " in sql
+    assert "OFFSET" in sql and 10 in compiled.params.values()
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    calls = {"local": [], "harvest": []}
+
+    def fake_local(**kwargs):
+        calls["local"].append(kwargs)
+        return list(calls.get("local_hits", []))
+
+    def fake_harvest(**kwargs):
+        calls["harvest"].append(kwargs)
+        if isinstance(calls.get("remote"), Exception):
+            raise calls["remote"]
+        return list(calls.get("remote", []))
+
+    monkeypatch.setattr(local_search, "search_local_profiles", fake_local)
+    monkeypatch.setattr(local_search, "search_profiles_multi_page", fake_harvest)
+    return calls
+
+
+def test_enough_local_hits_skip_harvest(searches):
+    searches["local_hits"] = [_local("https://www.linkedin.com/in/a"), _local("https://www.linkedin.com/in/b")]
+
+    result = local_search.search_profiles_local_first("Jane Doe", max_show=2)
+
+    assert [hit["linkedinUrl"] for hit in result] == ["https://www.linkedin.com/in/a", "https://www.linkedin.com/in/b"]
+    assert searches["harvest"] == []
+
+
+def test_later_pages_and_opt_out_go_straight_to_harvest(searches):
+    searches["local_hits"] = [_local("https://www.linkedin.com/in/a")]
+    searches["remote"] = [{"linkedinUrl": "https://www.linkedin.com/in/z"}]
+
+    assert local_search.search_profiles_local_first("Jane Doe", max_show=1, start_page=3) == searches["remote"]
+    assert local_search.search_profiles_local_first("Jane Doe", max_show=1, use_local=False) == searches["remote"]
+    assert searches["local"] == []
+    assert searches["harvest"][0]["start_page"] == 3
+
+
+def test_harvest_fills_the_shortfall_without_duplicates(searches):
+    searches["local_hits"] = [_local("https://www.linkedin.com/in/a")]
+    searches["remote"] = [{"linkedinUrl": "https://www.linkedin.com/in/a"}, {"linkedinUrl": "https://www.linkedin.com/in/b"}]
+
+    result = local_search.search_profiles_local_first("Jane Doe", max_show=2, max_pages=3)
+
+    assert [hit["linkedinUrl"] for hit in result] == ["https://www.linkedin.com/in/a", "https://www.linkedin.com/in/b"]
+    assert result[0]["source"] == "local"
+    assert searches["harvest"][0]["max_pages"] == 3
+
+
+def test_harvest_errors_fall_back_to_local_hits(searches):
+    searches["local_hits"] = [_local("https://www.linkedin.com/in/a")]
+    searches["remote"] = RuntimeError("quota exceeded")
+
+    assert local_search.search_profiles_local_first("Jane Doe", max_show=5) == searches["local_hits"]
+
+    searches["local_hits"] = []
+    with pytest.raises(RuntimeError):
+        local_search.search_profiles_local_first("Jane Doe", max_show=5)
+
+
+def test_headline_and_skill_searches_stay_on_stored_profiles(searches):
+    searches["local_hits"] = [_local("https://www.linkedin.com/in/a")]
+
+    result = local_search.search_profiles_local_first("Jane Doe", skill="SQL", max_show=5, start_page=3)
+
+    assert result == searches["local_hits"]
+    assert searches["harvest"] == []
+    assert searches["local"][0]["skill"] == "SQL"
+    assert searches["local"][0]["offset"] == 10
+
+    with pytest.raises(ValueError):
+        local_search.search_profiles_local_first("Jane Doe", headline="Data", use_local=False)
@@ -0,0 +1,89 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from services.profile_history import _compact_versions, _rebuild_version
+
+FIELDS = ["headline", "company", "location"]
+
+# Content of versions 1..6; version 6 is the live row
+HISTORY = {
+    1: {"headline": "Intern", "company": "Acme", "location": "Berlin"},
+    2: {"headline": "Engineer", "company": "Acme", "location": "Berlin"},
+    3: {"headline": "Engineer", "company": "Globex", "location": "Berlin"},
+    4: {"headline": "Engineer", "company": "Globex", "location": "Paris"},
+    5: {"headline": "Senior Engineer", "company": "Globex", "location": "Paris"},
+    6: {"headline": "Staff Engineer", "company": "Initech", "location": "Paris"},
+}
+
+# When each version was replaced by the next one
+SUPERSEDED_AT = {
+    1: datetime(2026, 1, 5),
+    2: datetime(2026, 1, 20),
+    3: datetime(2026, 2, 3),
+    4: datetime(2026, 2, 25),
+    5: datetime(2026, 9, 30),
+}
+
+CUTOFF = datetime(2026, 7, 1)
+
+
+def _stored_versions():
+    # What record_versions stores: the outgoing values of the fields that changed
+    return [
+        SimpleNamespace(
+            version_id=100 + version,
+            version=version,
+            superseded_at=SUPERSEDED_AT[version],
+            delta={f: HISTORY[version][f] for f in FIELDS if HISTORY[version][f] != HISTORY[version + 1][f]},
+        )
+        for version in range(1, 6)
+    ]
+
+
+def _compact(versions, max_versions=0):
+    new_deltas, dropped = _compact_versions(versions, CUTOFF, max_versions)
+    kept = []
+    for v in versions:
+        if v.version_id in dropped:
+            continue
+        if v.version_id in new_deltas:
+            v.delta = new_deltas[v.version_id]
+        kept.append(v)
+    return kept
+
+
+def _rebuild(kept, version):
+    # Same query get_profile_version runs: versions >= wanted, newest first
+    deltas = [(v.version, v.delta) for v in sorted(kept, key=lambda v: -v.version) if v.version >= version]
+    return _rebuild_version(HISTORY[6], 6, deltas)
+
+
+def test_every_stored_version_rebuilds_exactly_before_compaction():
+    kept = _stored_versions()
+    for version in range(1, 7):
+        assert _rebuild(kept, version) == {"version": version, **HISTORY[version]}
+
+
+def test_kept_versions_rebuild_exactly_after_compaction():
+    kept = _compact(_stored_versions())
+
+    # Old versions are thinned to the newest one per month
+    assert [v.version for v in kept] == [2, 4, 5]
+    for version in (2, 4, 5, 6):
+        assert _rebuild(kept, version) == {"version": version, **HISTORY[version]}
+
+
+def test_compacted_versions_resolve_to_the_closest_newer_version():
+    kept = _compact(_stored_versions())
+    assert _rebuild(kept, 3) == {"version": 4, **HISTORY[4]}
+    assert _rebuild(kept, 1) == {"version": 2, **HISTORY[2]}
+
+
+@pytest.mark.parametrize("max_versions", [1, 2, 3])
+def test_version_cap_keeps_the_newest_versions_rebuildable(max_versions):
+    kept = _compact(_stored_versions(), max_versions=max_versions)
+    assert len(kept) == max_versions
+    for v in kept:
+        assert _rebuild(kept, v.version) == {"version": v.version, **HISTORY[v.version]}
@@ -0,0 +1,39 @@
+from services.profile_schema import conform_profile_fields, normalize_profile_fields
+
+
+def test_legacy_rows_are_normalized_on_read():
+    legacy = {
+        "name": "Jane Doe",
+        "skills": ["Python", "SQL"],
+        "experiences": "not json at all",
+        "certifications": [{"title": "AWS SA"}],
+    }
+
+    data = conform_profile_fields(dict(legacy))
+
+    assert data["skills"] == [
+        {"name": "Python", "endorsements": 0, "passed_assessment": False},
+        {"name": "SQL", "endorsements": 0, "passed_assessment": False},
+    ]
+    assert data["experiences"][0]["title"] == "not json at all"
+    assert set(data["experiences"][0]) >= {"company", "duration", "location", "start_date", "end_date"}
+    assert data["certifications"][0]["cert_link"] is None
+
+
+def test_conforming_rows_are_left_untouched():
+    data = normalize_profile_fields({
+        "name": "Jane Doe",
+        "skills": "Python; SQL",
+        "experiences": [{"title": "Engineer", "company": "Acme"}],
+        "certifications": None,
+    })
+    skills = data["skills"]
+
+    assert conform_profile_fields(data)["skills"] is skills
+    assert data["certifications"] == []
+
+
+def test_missing_and_empty_profiles():
+    assert conform_profile_fields(None) is None
+    assert conform_profile_fields({"name": "Jane"}) == {"name": "Jane"}
+    assert conform_profile_fields({"skills": None})["skills"] == []
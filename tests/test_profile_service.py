@@ -0,0 +1,208 @@
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from database.models import PROFILE_FIELDS
+from services import profile_service
+
+
+class RecordingSession:
+    """
+    Stands in for a Session: records what `scalars()` was called with.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def scalars(self, stmt, execution_options=None):
+        self.calls.append((stmt, execution_options or {}))
+        return self
+
+    def all(self):
+        return []
+
+
+def _row(linkedin_id):
+    return {
+        "linkedin_url": f"https://www.linkedin.com/in/{linkedin_id}",
+        "linkedin_id": linkedin_id,
+        **{field: None for field in PROFILE_FIELDS},
+        "content_hash": "0" * 64,
+        "changed_fields": None,
+        "version": 1,
+    }
+
+
+def test_upsert_refreshes_objects_already_in_the_session():
+    # Phase 1 loads the stale Profile objects into the session; without
+    # populate_existing, RETURNING would hand those stale objects back.
+    db = RecordingSession()
+    profile_service._upsert_profiles(db, [_row("jane-doe"), _row("john-roe")])
+
+    (stmt, options), = db.calls
+    assert options.get("populate_existing") is True
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (linkedin_url) DO UPDATE" in sql
+    assert "RETURNING" in sql
+
+
+def test_upsert_without_rows_does_not_touch_the_db():
+    db = RecordingSession()
+    assert profile_service._upsert_profiles(db, []) == []
+    assert db.calls == []
+
+
+def test_cached_profiles_do_not_share_jsonb_lists_with_callers():
+    profile_service.profile_cache.clear()
+    data = {
+        "linkedin_id": "cache-test",
+        "last_updated": datetime.now(tz=timezone.utc).replace(tzinfo=None),
+        "skills": [{"name": "Python", "endorsements": 3, "passed_assessment": False}],
+    }
+    profile_service._cache_put(data)
+    data["skills"].append({"name": "Leaked", "endorsements": 0, "passed_assessment": False})
+
+    first = profile_service._cache_get("cache-test", freshness_days=30)
+    first["skills"][0]["name"] = "Mutated"
+    second = profile_service._cache_get("cache-test", freshness_days=30)
+
+    assert second["skills"] == [{"name": "Python", "endorsements": 3, "passed_assessment": False}]
+    assert profile_service.get_cache_stats()["hits"] >= 2
+
+
+def test_bulk_refresh_waits_for_ids_already_in_flight():
+    flight = profile_service.SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def slow_single_refresh():
+        started.set()
+        release.wait(5)
+        return {"linkedin_id": "a", "source": "single"}
+
+    single = threading.Thread(target=flight.do, args=("a", slow_single_refresh))
+    single.start()
+    started.wait(5)
+
+    scraped = []
+
+    def bulk_refresh(led):
+        scraped.extend(led)
+        release.set()
+        return {key: {"linkedin_id": key, "source": "bulk"} for key in led}
+
+    results = flight.do_many(["a", "b"], bulk_refresh)
+    single.join(5)
+
+    assert scraped == ["b"]
+    assert results["a"]["source"] == "single"
+    assert results["b"]["source"] == "bulk"
+    assert flight.coalesced == 1
+
+
+def test_bulk_refresh_yields_none_when_the_leader_failed():
+    flight = profile_service.SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def failing_refresh():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("scrape failed")
+
+    def run_single():
+        try:
+            flight.do("a", failing_refresh)
+        except RuntimeError:
+            pass
+
+    single = threading.Thread(target=run_single)
+    single.start()
+    started.wait(5)
+
+    # "a" is led elsewhere, so the bulk caller only waits for it
+    threading.Timer(0.05, release.set).start()
+    assert flight.do_many(["a"], lambda led: {}) == {"a": None}
+    single.join(5)
+
+
+def test_upsert_only_updates_rows_still_at_the_version_read():
+    db = RecordingSession()
+    profile_service._upsert_profiles(db, [_row("jane-doe")])
+
+    (stmt, _), = db.calls
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "WHERE profiles.version = excluded.version - " in sql
+
+
+class ScriptedSession:
+    """
+    Session stand-in whose `scalars()` calls return scripted results in order.
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+        self.scalar_calls = []
+
+    def execute(self, stmt):
+        self.executed.append(stmt)
+
+    def scalars(self, stmt, execution_options=None):
+        self.scalar_calls.append(stmt)
+        result = self.results.pop(0)
+        return SimpleNamespace(all=lambda: list(result))
+
+
+def test_a_refresh_that_lost_the_version_race_returns_the_newer_row():
+    from database.models import Profile
+
+    stale = Profile(
+        profile_id=7, linkedin_url="https://www.linkedin.com/in/jane-doe", linkedin_id="jane-doe",
+        version=3, content_hash="old", headline="Engineer",
+    )
+    newdata = {"name": "Jane Doe", "headline": "Senior Engineer"}
+    row = profile_service._profile_row("jane-doe", newdata, stale)
+    assert row["version"] == 4
+
+    # The upsert returns nothing (version check failed); the re-read returns the winner's row
+    winner = Profile(profile_id=7, linkedin_url=stale.linkedin_url, linkedin_id="jane-doe", version=4)
+    db = ScriptedSession([], [winner])
+
+    before = profile_service.get_write_stats()
+    saved = profile_service._save_profiles(db, [(row, stale)])
+    after = profile_service.get_write_stats()
+
+    assert saved == [winner]
+    assert after["conflicts"] == before["conflicts"] + 1
+    assert after["updated"] == before["updated"]
+
+
+def test_unchanged_content_with_a_missing_hash_is_rewritten_not_a_conflict():
+    from database.models import Profile
+
+    newdata = {"name": "Jane Doe", "headline": "Engineer"}
+    content = {f: v for f, v in profile_service._profile_row("jane-doe", newdata).items()
+               if f in profile_service.PROFILE_FIELDS}
+    legacy = Profile(
+        profile_id=7, linkedin_url="https://www.linkedin.com/in/jane-doe", linkedin_id="jane-doe",
+        version=1, content_hash=None, **content,
+    )
+    row = profile_service._profile_row("jane-doe", newdata, legacy)
+    assert row["changed_fields"] == []
+    # One above the live version, so the upsert's version check passes
+    assert row["version"] == 2
+
+    rewritten = Profile(profile_id=7, linkedin_url=legacy.linkedin_url, linkedin_id="jane-doe", version=2)
+    db = ScriptedSession([rewritten])
+
+    before = profile_service.get_write_stats()
+    saved = profile_service._save_profiles(db, [(row, legacy)])
+    after = profile_service.get_write_stats()
+
+    assert saved == [rewritten]
+    assert after["conflicts"] == before["conflicts"]
+    assert after["updated"] == before["updated"] + 1
+    # No history row: the bumped version has the same content as the one before
+    assert db.executed == []
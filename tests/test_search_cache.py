@@ -0,0 +1,43 @@
+import pytest
+
+from services import search_cache
+
+
+class RecordingSession:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, stmt):
+        self.log.append(stmt)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    log = []
+    monkeypatch.setattr(search_cache, "SessionLocal", lambda: RecordingSession(log))
+    return log
+
+
+@pytest.mark.parametrize("response", [{}, {"elements": []}, {"error": "quota exceeded"}, None])
+def test_empty_or_error_responses_are_not_cached(executed, response):
+    search_cache.store_search({"search": "Jane Doe", "page": 1}, response)
+    assert executed == []
+
+
+def test_responses_with_results_are_cached(executed):
+    search_cache.store_search({"search": "Jane Doe", "page": 1}, {"elements": [{"linkedinUrl": "x"}]})
+    assert len(executed) == 1
+
+
+def test_equivalent_searches_share_a_key():
+    assert search_cache.search_cache_key({"search": "  Jane   DOE ", "page": 1, "school": ""}) == \
+        search_cache.search_cache_key({"search": "jane doe", "page": 1})
@@ -0,0 +1,97 @@
+import threading
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from services.staff_spy import StaffSpyAccount, StaffSpyService, _is_throttle_error
+
+
+class FakeLinkedInAccount:
+    def __init__(self):
+        self.calls = []
+
+    def scrape_users(self, user_ids):
+        self.calls.append(list(user_ids))
+        return pd.DataFrame({"profile_id": user_ids, "name": [f"Name {i}" for i in user_ids]})
+
+
+@pytest.fixture(autouse=True)
+def no_pacing(monkeypatch):
+    monkeypatch.setenv("STAFFSPY_RATE_PER_SEC", "0")
+
+
+def _service(*accounts):
+    # Skip __init__: it loads real session files through staffspy
+    service = object.__new__(StaffSpyService)
+    service.accounts = list(accounts)
+    service._next = 0
+    service._lock = threading.Lock()
+    return service
+
+
+def test_batches_are_split_to_each_accounts_remaining_quota():
+    first, second = FakeLinkedInAccount(), FakeLinkedInAccount()
+    service = _service(StaffSpyAccount("a", first, quota=3), StaffSpyAccount("b", second, quota=10))
+
+    fetched = service.fetch_profiles([f"id{i}" for i in range(5)], chunk_size=5)
+
+    assert all(fetched.values())
+    assert sorted(len(call) for call in first.calls + second.calls) == [2, 3]
+    assert max(len(call) for call in first.calls) <= 3
+    assert service.accounts[0].stats()["quota_used"] <= 3
+
+
+def test_quota_is_never_exceeded_and_leftover_ids_are_skipped():
+    linkedin = FakeLinkedInAccount()
+    service = _service(StaffSpyAccount("a", linkedin, quota=4))
+
+    fetched = service.fetch_profiles([f"id{i}" for i in range(6)], chunk_size=6)
+
+    assert linkedin.calls == [["id0", "id1", "id2", "id3"]]
+    assert [i for i, profile in fetched.items() if profile is None] == ["id4", "id5"]
+    assert service.is_paused()
+
+
+def test_unlimited_accounts_take_the_whole_batch():
+    linkedin = FakeLinkedInAccount()
+    service = _service(StaffSpyAccount("a", linkedin))
+
+    service.fetch_profiles([f"id{i}" for i in range(7)], chunk_size=7)
+
+    assert linkedin.calls == [[f"id{i}" for i in range(7)]]
+
+
+class FailingLinkedInAccount(FakeLinkedInAccount):
+    def scrape_users(self, user_ids):
+        self.calls.append(list(user_ids))
+        raise RuntimeError("connection reset")
+
+
+def test_a_failing_later_part_keeps_the_rows_already_scraped():
+    first, second = FakeLinkedInAccount(), FailingLinkedInAccount()
+    service = _service(StaffSpyAccount("a", first, quota=3), StaffSpyAccount("b", second, quota=10))
+
+    fetched = service.fetch_profiles([f"id{i}" for i in range(5)], chunk_size=5)
+
+    assert first.calls == [["id0", "id1", "id2"]] and second.calls == [["id3", "id4"]]
+    assert [i for i, profile in fetched.items() if profile] == ["id0", "id1", "id2"]
+    assert fetched["id3"] is None and fetched["id4"] is None
+
+
+class HTTPError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.response = SimpleNamespace(status_code=status_code)
+
+
+@pytest.mark.parametrize("error, throttled", [
+    (HTTPError("Request failed", status_code=429), True),
+    (HTTPError("Request failed", status_code=999), True),
+    (RuntimeError("Too Many Requests"), True),
+    (RuntimeError("LinkedIn served a CAPTCHA challenge"), True),
+    (RuntimeError("No profile for ACoAA4299912 (read 1429 bytes)"), False),
+    (HTTPError("Not found: id 999", status_code=404), False),
+])
+def test_throttling_is_read_from_statuses_and_text_markers_only(error, throttled):
+    assert _is_throttle_error(error) is throttled
@@ -0,0 +1,86 @@
+import pytest
+
+from services import summarizer
+
+PROFILE = {
+    "linkedin_id": "jane-doe",
+    "name": "Jane Doe",
+    "headline": "Data Engineer",
+    "company": "Acme",
+    "skills": [{"name": "Python", "endorsements": 12, "passed_assessment": True}],
+}
+
+
+class FakeChat:
+    """
+    Chat backend with the `ollama.chat` signature that streams canned tokens.
+    """
+
+    def __init__(self, tokens, fail_after=None):
+        self.tokens = tokens
+        self.fail_after = fail_after
+        self.calls = []
+
+    def __call__(self, model, messages, stream=False):
+        self.calls.append({"model": model, "messages": messages, "stream": stream})
+        if not stream:
+            return {"message": {"content": "".join(self.tokens)}}
+        return self._stream()
+
+    def _stream(self):
+        for i, token in enumerate(self.tokens):
+            if self.fail_after is not None and i == self.fail_after:
+                raise ConnectionError("model went away")
+            yield {"message": {"content": token}}
+
+
+@pytest.fixture
+def summary_cache(monkeypatch):
+    stored = {}
+    monkeypatch.setattr(summarizer, "get_cached_summary", lambda content_hash: stored.get(content_hash))
+    monkeypatch.setattr(summarizer, "store_summary", lambda content_hash, summary: stored.update({content_hash: summary}))
+    return stored
+
+
+def test_streams_tokens_in_order_and_caches_the_summary(summary_cache):
+    chat = FakeChat(["Jane ", "is a ", "", "data engineer."])
+
+    chunks = list(summarizer.stream_profile_summary(PROFILE, chat=chat))
+
+    assert chunks == ["Jane ", "is a ", "data engineer."]
+    assert chat.calls[0]["stream"] is True
+    assert "Jane Doe" in chat.calls[0]["messages"][-1]["content"]
+    assert summary_cache == {summarizer.summary_content_hash(PROFILE): "Jane is a data engineer."}
+
+
+def test_cached_summary_is_yielded_without_calling_the_model(summary_cache):
+    summary_cache[summarizer.summary_content_hash(PROFILE)] = "Cached summary."
+    chat = FakeChat(["unused"])
+
+    assert list(summarizer.stream_profile_summary(PROFILE, chat=chat)) == ["Cached summary."]
+    assert chat.calls == []
+
+
+def test_stream_failure_yields_an_error_and_caches_nothing(summary_cache):
+    chat = FakeChat(["Jane ", "is ", "a"], fail_after=2)
+
+    chunks = list(summarizer.stream_profile_summary(PROFILE, chat=chat))
+
+    assert chunks[:2] == ["Jane ", "is "]
+    assert "Summarization failed" in chunks[-1]
+    assert summary_cache == {}
+
+
+def test_empty_profile_is_not_sent_to_the_model(summary_cache):
+    chat = FakeChat(["unused"])
+    assert list(summarizer.stream_profile_summary({}, chat=chat)) == ["No profile data available to summarize."]
+    assert chat.calls == []
+
+
+def test_token_budget_is_part_of_the_cache_key():
+    default = summarizer.summary_content_hash(PROFILE)
+    assert summarizer.CACHE_PROMPT_VERSION.endswith(f"budget{summarizer.DEFAULT_TOKEN_BUDGET}")
+    assert default == summarizer.summary_content_hash(PROFILE, prompt_version=summarizer.CACHE_PROMPT_VERSION)
+    assert default != summarizer.summary_content_hash(
+        PROFILE, prompt_version=f"{summarizer.PROMPT_VERSION}-budget{summarizer.DEFAULT_TOKEN_BUDGET + 1}"
+    )
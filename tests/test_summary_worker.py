@@ -0,0 +1,48 @@
+from sqlalchemy.dialects import postgresql
+
+from database.models import Profile
+from services import summary_worker
+
+
+class RecordingQuery:
+    def __init__(self, log, rows):
+        self.log = log
+        self.rows = rows
+
+    def join(self, *args):
+        return self
+
+    def filter(self, *criteria):
+        self.log.extend(criteria)
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class RecordingSession:
+    def __init__(self, log, rows):
+        self.log = log
+        self.rows = rows
+
+    def query(self, *entities):
+        return RecordingQuery(self.log, self.rows)
+
+    def close(self):
+        pass
+
+
+def test_requeue_only_takes_failed_or_stale_jobs_with_conformed_profiles(monkeypatch):
+    log, queued = [], []
+    legacy = Profile(linkedin_id="jane-doe", name="Jane Doe", skills="[{'name': 'SQL'}]")
+    monkeypatch.setattr(summary_worker, "SessionLocal", lambda: RecordingSession(log, [legacy]))
+    pool = summary_worker.SummaryWorkerPool(max_workers=1)
+    monkeypatch.setattr(pool, "enqueue_many", lambda profiles: queued.extend(profiles) or ["hash"] * len(profiles))
+
+    assert pool.requeue_unfinished() == 1
+
+    sql = str(log[0].compile(dialect=postgresql.dialect()))
+    assert "summary_jobs.status = " in sql
+    assert "summary_jobs.updated_at < now() - " in sql
+    assert queued[0]["linkedin_id"] == "jane-doe"
+    assert queued[0]["skills"][0]["name"] == "SQL"
@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a call is rejected because the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    rejects calls for `reset_seconds`. It then goes half-open and lets a
+    single trial call through: success closes it again, failure re-opens it.
+
+    Every state transition is logged and counted in `transitions`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 300):
+        self.name = name
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.transitions = Counter()
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str, reason: str):
+        # Caller holds the lock
+        if state == self.state:
+            return
+        self.transitions[f"{self.state}->{state}"] += 1
+        logger.warning(f"Circuit '{self.name}' {self.state} -> {state}: {reason}")
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+
+    def is_open(self) -> bool:
+        """
+        Check whether calls are currently being rejected, without claiming a trial call.
+        """
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self.opened_at < self.reset_seconds
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed right now.
+
+        Returns:
+            bool: False while open, or while half-open with a trial call running.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    return False
+                self._transition(HALF_OPEN, "reset timeout elapsed")
+
+            if self.state == HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            self._transition(CLOSED, "trial call succeeded")
+
+    def record_failure(self, trip: bool = False):
+        """
+        Record a failed call.
+
+        Args:
+            trip (bool): Open the breaker immediately, regardless of the threshold.
+        """
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN:
+                self._transition(OPEN, "trial call failed")
+            elif self.state == CLOSED and (trip or self.failures >= self.failure_threshold):
+                self._transition(OPEN, f"{self.failures} consecutive failures")
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Current state, consecutive failures and transition counts.
+        """
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "retry_in_seconds": retry_in,
+                "transitions": dict(self.transitions),
+            }
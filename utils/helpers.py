@@ -1,20 +1,220 @@
 import ast
+import json
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlsplit, unquote, quote
+
+# Canonical form every stored profile URL is rewritten to
+LINKEDIN_PROFILE_URL = "https://www.linkedin.com/in/{}"
+
+# Path prefixes that introduce a profile identifier
+_PROFILE_PATH_PREFIXES = ("in", "pub")
+
+_SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://")
+
+# Member-URN profile IDs ("ACoAA...", "AEMAA..."), which are case-sensitive
+# unlike vanity slugs
+_MEMBER_ID_RE = re.compile(r"^(?:ACo|AEM)[A-Za-z0-9_-]{20,}$")
+
+# Distinct JSON-ish strings whose parsed value is memoized
+_JSONISH_CACHE_SIZE = 2048
+
+# Python-literal fallback is skipped above this size (ast is memory-hungry)
+_MAX_LITERAL_CHARS = 1_000_000
+
+# Constructor calls allowed in the Python-literal fallback (StaffSpy dates)
+_DATE_CALLS = {"date": date, "datetime": datetime}
+
+# Tokens that differ between Python reprs and JSON: quoted strings (unrolled
+# so long strings are matched in one pass), None/True/False, date/datetime
+# calls with integer arguments (StaffSpy experience dates) and other parentheses
+_PY_TOKEN_RE = re.compile(
+    r"""'([^'\\]*(?:\\.[^'\\]*)*)'|"([^"\\]*(?:\\.[^"\\]*)*)"|\b(None|True|False)\b"""
+    r"""|\b(?:datetime\.)?(date|datetime)\(\s*(\d+(?:\s*,\s*\d+)*)\s*\)|[()]""",
+    re.S,
+)
+_PY_CONSTANTS = {"None": "null", "True": "true", "False": "false"}
 
 
 def extract_linkedin_id(url: str) -> str:
     """
-    Extracts the LinkedIn profile ID from a full LinkedIn URL.
+    Extracts the canonical LinkedIn profile ID from a LinkedIn URL.
+
+    Handles scheme/host variants (http, no "www", country subdomains),
+    trailing slashes, query strings and fragments, locale or section
+    subpaths after the ID (e.g. "/in/x/en", "/in/x/details/skills"),
+    and percent-encoding. Vanity slugs are case-insensitive on LinkedIn,
+    so they are lowercased; member-URN IDs ("ACoAA...") are case-sensitive
+    and kept as-is. Bare IDs are returned normalized the same way.
 
     Example:
         "https://www.linkedin.com/in/sonupatel-a-l/" -> "sonupatel-a-l"
+        "linkedin.com/in/Sonupatel-A-L?utm_source=x" -> "sonupatel-a-l"
+        "https://www.linkedin.com/in/ACoAABcDeFgHiJkLmNoPqRsTuV" -> "ACoAABcDeFgHiJkLmNoPqRsTuV"
 
     Args:
-        url (str): Full LinkedIn profile URL
+        url (str): LinkedIn profile URL (or a bare profile ID)
 
     Returns:
         str: Extracted LinkedIn ID
     """
-    return url.rstrip("/").split("/")[-1]
+    s = str(url).strip()
+    if not _SCHEME_RE.match(s) and "/" in s:
+        s = "https://" + s.lstrip("/")
+
+    parts = urlsplit(s) if _SCHEME_RE.match(s) else None
+    path = parts.path if parts else s
+    segments = [seg for seg in path.split("/") if seg]
+
+    linkedin_id = None
+    for i, seg in enumerate(segments[:-1]):
+        if seg.lower() in _PROFILE_PATH_PREFIXES:
+            linkedin_id = segments[i + 1]
+            break
+
+    if linkedin_id is None:
+        # Not a recognizable profile path; fall back to the last segment
+        linkedin_id = segments[-1] if segments else s
+
+    linkedin_id = unquote(linkedin_id).strip()
+    return linkedin_id if _MEMBER_ID_RE.match(linkedin_id) else linkedin_id.lower()
+
+
+def canonicalize_linkedin_url(url: str) -> str:
+    """
+    Rewrites any LinkedIn profile URL (or bare ID) into its canonical form.
+
+    Example:
+        "http://linkedin.com/in/Sonupatel-A-L/?locale=en_US" ->
+        "https://www.linkedin.com/in/sonupatel-a-l"
+
+    Args:
+        url (str): LinkedIn profile URL (or a bare profile ID)
+
+    Returns:
+        str: Canonical profile URL
+    """
+    return LINKEDIN_PROFILE_URL.format(quote(extract_linkedin_id(url), safe="-_.~"))
+
+
+def extract_profile_link(element: dict):
+    """
+    Builds the canonical profile URL for a HarvestAPI search result element.
+
+    The vanity `publicIdentifier` is preferred over `url`/`linkedinUrl`,
+    which often carry the member-URN form of the same profile; using one
+    form consistently keeps a person to a single stored row.
+
+    Args:
+        element (dict): One entry from the Harvest API `elements` list
+
+    Returns:
+        str or None: Canonical LinkedIn profile URL, or None if none is present
+    """
+    link = (
+        element.get("publicIdentifier")
+        or element.get("url")
+        or element.get("linkedinUrl")
+    )
+    return canonicalize_linkedin_url(link) if link else None
+
+
+def _literal_node(node):
+    """
+    Evaluate an AST node made only of literals.
+
+    Like `ast.literal_eval`, but also accepts `datetime.date(...)` /
+    `datetime.datetime(...)` calls with constant arguments (as found in
+    StaffSpy's experience reprs) and turns them into ISO strings.
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.List):
+        return [_literal_node(e) for e in node.elts]
+    if isinstance(node, ast.Tuple):
+        return [_literal_node(e) for e in node.elts]
+    if isinstance(node, ast.Set):
+        return [_literal_node(e) for e in node.elts]
+    if isinstance(node, ast.Dict):
+        return {_literal_node(k): _literal_node(v) for k, v in zip(node.keys, node.values)}
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _literal_node(node.operand)
+        if isinstance(operand, (int, float)):
+            return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.Call) and not node.keywords:
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        if name in _DATE_CALLS:
+            args = [_literal_node(a) for a in node.args]
+            if all(isinstance(a, int) for a in args):
+                return _DATE_CALLS[name](*args).isoformat()
+    raise ValueError(f"Unsupported literal: {ast.dump(node)[:80]}")
+
+
+def _py_token_to_json(match) -> str:
+    single, double, constant, date_call, date_args = match.groups()
+    if constant:
+        return _PY_CONSTANTS[constant]
+    if date_call:
+        # Same ISO string the AST fallback produces
+        args = [int(a) for a in date_args.split(",")]
+        return '"' + _DATE_CALLS[date_call](*args).isoformat() + '"'
+    if single is None and double is None:
+        # Tuples and other calls need the AST fallback
+        raise ValueError("Not a plain list/dict literal")
+
+    body = single if single is not None else double
+    if "\\" in body:
+        # Python escapes (\x.., \') aren't all valid JSON; decode this one string
+        return json.dumps(ast.literal_eval(match.group(0)))
+    if double is not None or '"' not in body:
+        return '"' + body + '"'
+    return json.dumps(body)
+
+
+def _python_repr_to_json(s: str) -> str:
+    """
+    Rewrite a Python list/dict repr as JSON text.
+
+    Raises:
+        ValueError: If the text contains anything beyond strings, numbers,
+            None/True/False, lists and dicts.
+    """
+    return _PY_TOKEN_RE.sub(_py_token_to_json, s)
+
+
+@lru_cache(maxsize=_JSONISH_CACHE_SIZE)
+def _parse_jsonish_text(s: str):
+    """
+    Parse a stripped list/dict string in tiers, cheapest first:
+
+    1. `json.loads` (StaffSpy reprs fail here within a few characters).
+    2. Rewrite a plain Python repr (including `datetime.date(y, m, d)` calls)
+       as JSON with one regex pass, then `json.loads`.
+    3. Restricted AST evaluation for anything else (tuples, sets, ...).
+
+    Raises:
+        ValueError: If no tier accepts the text.
+    """
+    try:
+        return json.loads(s)
+    except ValueError:
+        pass
+
+    try:
+        return json.loads(_python_repr_to_json(s))
+    except (ValueError, SyntaxError):
+        pass
+
+    if len(s) > _MAX_LITERAL_CHARS:
+        raise ValueError("Literal too large to parse")
+
+    try:
+        return _literal_node(ast.parse(s, mode="eval").body)
+    except (SyntaxError, RecursionError, TypeError, MemoryError) as e:
+        raise ValueError(str(e)) from e
 
 
 def safe_parse_jsonish(value):
@@ -24,7 +224,12 @@ def safe_parse_jsonish(value):
     StaffSpy sometimes returns strings that look like Python literals
     (e.g., "[{'name': 'Python'}, {'name': 'SQL'}]") instead of valid JSON.
 
-    This function uses `ast.literal_eval` to parse it safely.
+    Parsing is tiered: `json.loads` first, then a one-pass rewrite of plain
+    Python reprs into JSON, then a restricted Python-literal evaluator
+    (literals plus `datetime.date(...)` calls, never arbitrary code).
+    Results are memoized per string, so the same payload rendered or
+    normalized repeatedly is parsed once; treat returned lists/dicts as
+    read-only, since they are shared between callers.
     If parsing fails, it returns the original string or a sensible fallback.
 
     Args:
@@ -46,8 +251,8 @@ def safe_parse_jsonish(value):
     # Looks like a list or dict? Try to parse it
     if s.startswith(("[", "{")) and s.endswith(("]", "}")):
         try:
-            return ast.literal_eval(s)
-        except Exception:
+            return _parse_jsonish_text(s)
+        except ValueError:
             return s  # Return raw string if parsing fails
 
     return value
@@ -69,3 +274,41 @@ def coalesce(*vals):
         if v is not None and str(v).strip() != "":
             return v
     return None
+
+
+def chunked(iterable, size: int):
+    """
+    Splits any iterable into lists of up to `size` items, consuming it lazily.
+
+    Args:
+        iterable: Any iterable (list, generator, file stream...)
+        size (int): Maximum items per chunk
+
+    Returns:
+        generator: Lists of items, in input order
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ilike_contains(column, value: str):
+    """
+    Case-insensitive substring filter with LIKE wildcards in `value` escaped.
+
+    Example:
+        ilike_contains(Profile.company, "100%_Remote") matches the literal
+        text, not "100<anything>Remote".
+
+    Args:
+        column: SQLAlchemy column (or expression) to filter on
+        value (str): Substring to look for
+
+    Returns:
+        A SQLAlchemy boolean expression (`column ILIKE '%...%' ESCAPE '!'`)
+    """
+    escaped = value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return column.ilike(f"%{escaped}%", escape="!")
@@ -0,0 +1,128 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def _host_key(url_or_host: str) -> str:
+    """
+    Normalize a URL or host name to the host it is rate limited on.
+
+    Lowercased, without port or a leading "www.", so `https://www.linkedin.com/in/x`
+    and `linkedin.com` share one slot.
+    """
+    parts = urlsplit(url_or_host if "//" in url_or_host else f"//{url_or_host}")
+    host = (parts.hostname or url_or_host).lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostRateLimiter:
+    """
+    Simple per-host rate limiter shared between worker threads.
+
+    Each host gets its own "next allowed slot"; callers block in `wait()`
+    until their slot comes up, so at most `rate_per_sec` calls are started
+    per second against any single host.
+    """
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url_or_host: str):
+        """
+        Block until a call to the given host is allowed.
+
+        Args:
+            url_or_host (str): Full URL or bare host name to rate limit on.
+        """
+        if not self.interval:
+            return
+
+        host = _host_key(url_or_host)
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AdaptiveTokenBucket:
+    """
+    Thread-safe token bucket whose refill rate adapts to throttling.
+
+    Tokens refill at `rate` per second up to `burst`. On a throttling signal
+    the rate is cut multiplicatively (down to `min_rate`); each success
+    raises it additively back towards the configured base rate.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: float = 1, min_rate: float = None,
+                 backoff_factor: float = 0.5, recovery_step: float = None):
+        """
+        Args:
+            rate_per_sec (float): Base refill rate; 0 or less disables limiting.
+            burst (float): Bucket capacity (max calls started back to back).
+            min_rate (float, optional): Floor for the adapted rate. Defaults to a tenth of the base rate.
+            backoff_factor (float): Rate multiplier applied on each throttling signal.
+            recovery_step (float, optional): Rate added back per success. Defaults to a tenth of the base rate.
+        """
+        self.base_rate = rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self.rate = self.base_rate
+        self.capacity = max(float(burst), 1.0)
+        self.min_rate = min_rate if min_rate is not None else self.base_rate / 10
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step if recovery_step is not None else self.base_rate / 10
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttles = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1):
+        """
+        Block until `tokens` tokens are available and take them.
+
+        Requests larger than the bucket are capped at its capacity.
+        """
+        if not self.base_rate:
+            return
+
+        tokens = min(float(tokens), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def throttled(self):
+        """
+        Record a throttling signal: cut the rate and drain the bucket.
+        """
+        if not self.base_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self._tokens = 0.0
+            self.throttles += 1
+
+    def succeeded(self):
+        """
+        Record a successful call: move the rate back towards the base rate.
+        """
+        if not self.base_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.base_rate, self.rate + self.recovery_step)
@@ -0,0 +1,48 @@
+import argparse
+import logging
+import os
+from database.db import init_db
+from services.job_queue import run_worker
+from services.summary_worker import get_summary_pool
+
+# === Setup logging to file and console ===
+os.makedirs("logs", exist_ok=True)
+
+logging.basicConfig(
+    filename="logs/app.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+console = logging.StreamHandler()
+console.setLevel(logging.INFO)
+logging.getLogger("").addHandler(console)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    Standalone worker for bulk CSV refresh jobs.
+
+    Claims pending items from `bulk_job_items`, refreshes their profiles and
+    records the results. Safe to run several copies; interrupted work is
+    picked up again once its lease expires. Summary jobs left unfinished by
+    a previous process are re-queued at startup.
+    """
+    parser = argparse.ArgumentParser(description="Process bulk profile refresh jobs.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Items claimed per batch")
+    parser.add_argument("--poll-seconds", type=float, default=None, help="Sleep when the queue is empty")
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    args = parser.parse_args()
+
+    init_db()
+    get_summary_pool().requeue_unfinished()
+    try:
+        run_worker(batch_size=args.batch_size, poll_seconds=args.poll_seconds, once=args.once)
+    except KeyboardInterrupt:
+        logger.info("Bulk job worker stopped.")
+
+
+if __name__ == "__main__":
+    main()